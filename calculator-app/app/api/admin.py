@@ -0,0 +1,145 @@
+"""
+Admin API endpoints (profiling and event-loop stalls of the worker that
+serves the request).
+
+The two groups have separate routers, each mounted only when its feature
+is enabled (PROFILING_ENABLED, LOOP_MONITOR_ENABLED).
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+from fastapi.security import HTTPBearer
+from starlette.concurrency import run_in_threadpool
+import logging
+import os
+
+from app.config import settings
+from app.loop_monitor import loop_monitor
+from app.profiling import ProfilerBusyError, profile_cpu, profile_memory
+from app.services.auth_service import AuthService
+from app.tracing import TracedRoute
+
+logger = logging.getLogger(__name__)
+
+profiling_router = APIRouter(prefix="/admin", tags=["admin"], route_class=TracedRoute)
+loop_router = APIRouter(prefix="/admin", tags=["admin"], route_class=TracedRoute)
+http_bearer = HTTPBearer(description="Access token using Bearer scheme")
+
+
+def get_admin_username(credentials = Depends(http_bearer)) -> str:
+    """
+    Dependency allowing only users listed in ADMIN_USERNAMES.
+    
+    Args:
+        credentials: HTTPAuthorizationCredentials from HTTPBearer
+        
+    Returns:
+        str: Username of the admin
+        
+    Raises:
+        HTTPException: If the token is invalid or the user is not an admin
+    """
+    token_data = AuthService.verify_token(credentials.credentials)
+    if not token_data:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials"
+        )
+    
+    if token_data.username not in settings.admin_usernames:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    
+    return token_data.username
+
+
+def _profile_response(folded: str, stats: dict) -> PlainTextResponse:
+    headers = {f"X-Profile-{name.replace('_', '-').title()}": str(value) for name, value in stats.items()}
+    headers["X-Profile-Pid"] = str(os.getpid())
+    return PlainTextResponse(folded, headers=headers)
+
+
+@profiling_router.post("/profile/cpu", response_class=PlainTextResponse)
+async def profile_worker_cpu(
+    seconds: float = Query(10, gt=0),
+    interval_ms: float = Query(10, ge=1, le=1000),
+    include_idle: bool = Query(False),
+    admin: str = Depends(get_admin_username)
+) -> PlainTextResponse:
+    """
+    Sample where this worker spends CPU time.
+    
+    Args:
+        seconds (float): Sampling duration (capped by PROFILE_MAX_SECONDS)
+        interval_ms (float): Milliseconds between samples
+        include_idle (bool): Include threads that are only waiting
+        admin (str): Admin username
+        
+    Returns:
+        PlainTextResponse: Collapsed stacks weighted by sample count
+        
+    Raises:
+        HTTPException: If a profile is already running in this worker
+    """
+    seconds = min(seconds, settings.PROFILE_MAX_SECONDS)
+    logger.warning("CPU profile started by %s for %ss", admin, seconds,
+                   extra={"event": "admin.profile_started"})
+    try:
+        folded, stats = await run_in_threadpool(profile_cpu, seconds, interval_ms / 1000, include_idle)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    
+    return _profile_response(folded, stats)
+
+
+@profiling_router.post("/profile/memory", response_class=PlainTextResponse)
+async def profile_worker_memory(
+    seconds: float = Query(10, gt=0),
+    frames: int = Query(25, ge=1, le=100),
+    admin: str = Depends(get_admin_username)
+) -> PlainTextResponse:
+    """
+    Record memory allocated by this worker with tracemalloc.
+    
+    Args:
+        seconds (float): Recording duration (capped by PROFILE_MAX_SECONDS)
+        frames (int): Stack depth recorded per allocation
+        admin (str): Admin username
+        
+    Returns:
+        PlainTextResponse: Collapsed stacks weighted by bytes still allocated
+        
+    Raises:
+        HTTPException: If a profile is already running in this worker
+    """
+    seconds = min(seconds, settings.PROFILE_MAX_SECONDS)
+    logger.warning("Memory profile started by %s for %ss", admin, seconds,
+                   extra={"event": "admin.profile_started"})
+    try:
+        folded, stats = await run_in_threadpool(profile_memory, seconds, frames)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    
+    return _profile_response(folded, stats)
+
+
+@loop_router.get("/loop/blocked")
+async def get_loop_stalls(admin: str = Depends(get_admin_username)) -> dict:
+    """
+    Recent event-loop stalls of this worker, with the blocking stacks.
+    
+    Args:
+        admin (str): Admin username
+        
+    Returns:
+        dict: Detector settings, stall counts per location and recent stalls
+    """
+    return {
+        "pid": os.getpid(),
+        "enabled": settings.LOOP_MONITOR_ENABLED,
+        "threshold_ms": settings.LOOP_BLOCK_THRESHOLD_MS,
+        "blocked_count": dict(loop_monitor.blocked_count),
+        "events": list(loop_monitor.events)
+    }
@@ -11,8 +11,9 @@ from app.database import get_db
 from app.schemas.user import UserCreate, UserResponse, Token, UserLogin
 from app.repositories.user_repository import UserRepository
 from app.services.auth_service import AuthService
+from app.tracing import TracedRoute
 
-router = APIRouter(prefix="/auth", tags=["authentication"])
+router = APIRouter(prefix="/auth", tags=["authentication"], route_class=TracedRoute)
 http_bearer = HTTPBearer(description="Access token using Bearer scheme")
 
 
@@ -39,13 +40,13 @@ async def register(
         auth_service = AuthService(user_repo)
         
         # Check if user already exists
-        if user_repo.get_user_by_username(user_data.username):
+        if user_repo.get_profile_by_username(user_data.username):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Username already registered"
             )
         
-        if user_repo.get_user_by_email(user_data.email):
+        if user_repo.get_profile_by_email(user_data.email):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
@@ -96,7 +97,7 @@ async def login(
             )
         else:
             # Find username from email
-            user = user_repo.get_user_by_email(form_data.email)
+            user = user_repo.get_profile_by_email(form_data.email)
             if not user:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
@@ -159,8 +160,8 @@ async def get_current_user(
                 headers={"WWW-Authenticate": "Bearer"}
             )
         
-        # Get user
-        user = user_repo.get_user_by_id(token_data.user_id)
+        # Get user (cached profile, no query on repeated polling)
+        user = user_repo.get_profile_by_id(token_data.user_id)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -2,27 +2,101 @@
 Calculator API endpoints.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response, UploadFile, File, Form, Query
 from fastapi.security import HTTPBearer
 from sqlalchemy.orm import Session
-from typing import Dict, Any
+from starlette.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+from typing import Dict, Any, List, Optional
+import io
+import json
 
+from app.config import settings
 from app.database import get_db
+from app.http_cache import make_etag, cache_headers, is_not_modified, not_modified
+from app.responses import FastJSONResponse
 from app.schemas.calculator import (
     BasicOperation, AdvancedOperation, ConversionRequest, 
-    FinanceRequest, CalculatorResponse
+    FinanceRequest, CalculatorResponse, MatrixOperation, ComplexOperation,
+    OperationType, StatisticsOptions, StatisticsRequest
 )
 from app.schemas.history import HistoryResponse
 from app.services.calculator_service import CalculatorService
 from app.services.history_service import HistoryService
+from app.services.result_values import numeric_value
 from app.services.auth_service import AuthService
 from app.repositories.user_repository import UserRepository
 from app.repositories.history_repository import HistoryRepository
+from app.tracing import TracedRoute, traced
 
-router = APIRouter(prefix="/calculator", tags=["calculator"])
+router = APIRouter(prefix="/calculator", tags=["calculator"], route_class=TracedRoute)
 http_bearer = HTTPBearer(description="Access token using Bearer scheme")
 
+# Static catalogue of operations served by /calculator/operations
+OPERATIONS_CATALOGUE: Dict[str, Any] = {
+    "basic_operations": [
+        {"id": "addition", "name": "Addition", "symbol": "+", "inputs": 2},
+        {"id": "subtraction", "name": "Subtraction", "symbol": "-", "inputs": 2},
+        {"id": "multiplication", "name": "Multiplication", "symbol": "×", "inputs": 2},
+        {"id": "division", "name": "Division", "symbol": "÷", "inputs": 2},
+        {"id": "power", "name": "Power", "symbol": "^", "inputs": 2},
+        {"id": "percentage", "name": "Percentage", "symbol": "%", "inputs": 2}
+    ],
+    "advanced_operations": [
+        {"id": "square_root", "name": "Square Root", "symbol": "√", "inputs": 1},
+        {"id": "sin", "name": "Sine", "symbol": "sin", "inputs": 1},
+        {"id": "cos", "name": "Cosine", "symbol": "cos", "inputs": 1},
+        {"id": "tan", "name": "Tangent", "symbol": "tan", "inputs": 1},
+        {"id": "log", "name": "Logarithm (base 10)", "symbol": "log", "inputs": 1},
+        {"id": "ln", "name": "Natural Logarithm", "symbol": "ln", "inputs": 1}
+    ],
+    "conversions": {
+        "length": ["meter", "kilometer", "centimeter", "millimeter", "mile", "yard", "foot", "inch"],
+        "weight": ["kilogram", "gram", "pound", "ounce", "ton"],
+        "temperature": ["celsius", "fahrenheit", "kelvin"]
+    },
+    "finance_operations": [
+        {"id": "simple_interest", "name": "Simple Interest", "inputs": 3},
+        {"id": "compound_interest", "name": "Compound Interest", "inputs": 3},
+        {"id": "loan_payment", "name": "Loan Monthly Payment", "inputs": 3}
+    ],
+    "matrix_operations": [
+        {"id": "multiply", "name": "Matrix Multiplication", "symbol": "A×B", "inputs": 2},
+        {"id": "inverse", "name": "Inverse", "symbol": "A⁻¹", "inputs": 1},
+        {"id": "determinant", "name": "Determinant", "symbol": "det", "inputs": 1},
+        {"id": "solve", "name": "Solve Linear System", "symbol": "Ax=B", "inputs": 2},
+        {"id": "eigenvalues", "name": "Eigenvalues", "symbol": "eig", "inputs": 1}
+    ],
+    "complex_operations": [
+        {"id": "add", "name": "Addition", "symbol": "+", "inputs": 2},
+        {"id": "subtract", "name": "Subtraction", "symbol": "-", "inputs": 2},
+        {"id": "multiply", "name": "Multiplication", "symbol": "×", "inputs": 2},
+        {"id": "divide", "name": "Division", "symbol": "÷", "inputs": 2},
+        {"id": "power", "name": "Power", "symbol": "^", "inputs": 2},
+        {"id": "modulus", "name": "Modulus", "symbol": "|z|", "inputs": 1},
+        {"id": "argument", "name": "Argument", "symbol": "arg", "inputs": 1},
+        {"id": "conjugate", "name": "Conjugate", "symbol": "z̄", "inputs": 1},
+        {"id": "sqrt", "name": "Square Root", "symbol": "√", "inputs": 1},
+        {"id": "exp", "name": "Exponential", "symbol": "exp", "inputs": 1},
+        {"id": "ln", "name": "Natural Logarithm", "symbol": "ln", "inputs": 1}
+    ],
+    "statistics_operations": [
+        {"id": "summary", "name": "Summary"},
+        {"id": "mean", "name": "Mean"},
+        {"id": "median", "name": "Median"},
+        {"id": "stdev", "name": "Standard Deviation"},
+        {"id": "variance", "name": "Variance"},
+        {"id": "percentiles", "name": "Percentiles"},
+        {"id": "histogram", "name": "Histogram"},
+        {"id": "regression", "name": "Linear Regression"}
+    ]
+}
+OPERATIONS_ETAG = make_etag(json.dumps(OPERATIONS_CATALOGUE, sort_keys=True), settings.VERSION)
+OPERATIONS_CACHE_CONTROL = "public, max-age=86400"
 
+
+@traced("auth.get_current_user_id", "auth")
 def get_current_user_id(credentials = Depends(http_bearer), db: Session = Depends(get_db)) -> int:
     """
     Dependency to get current user ID from JWT token (Bearer scheme).
@@ -95,7 +169,9 @@ async def calculate_basic(
             user_id=user_id,
             operation_type=result.operation_type.value,
             expression=result.expression,
-            result=str(result.result)
+            result=str(result.result),
+            result_value=numeric_value(result.result),
+            inputs=operation.model_dump(mode="json")
         )
         
         return {
@@ -150,15 +226,20 @@ async def calculate_advanced(
             user_id=user_id,
             operation_type=result.operation_type.value,
             expression=result.expression,
-            result=str(result.result)
+            result=str(result.result),
+            result_value=numeric_value(result.result),
+            inputs=operation.model_dump(mode="json")
         )
         
-        return {
+        response = {
             "result": result.result,
             "expression": result.expression,
             "operation": result.operation_type.value,
             "history_id": history_record.id
         }
+        if result.error_bound is not None:
+            response["error_bound"] = result.error_bound
+        return response
         
     except ValueError as e:
         raise HTTPException(
@@ -205,7 +286,10 @@ async def convert_units(
             user_id=user_id,
             operation_type=result.operation_type.value,
             expression=result.expression,
-            result=f"{result.result:.4f} {conversion.to_unit}"
+            result=f"{result.result:.4f} {conversion.to_unit}",
+            result_value=numeric_value(result.result),
+            result_unit=conversion.to_unit,
+            inputs=conversion.model_dump(mode="json")
         )
         
         return {
@@ -261,7 +345,9 @@ async def calculate_finance(
             user_id=user_id,
             operation_type=result.operation_type.value,
             expression=result.expression,
-            result=f"{result.result:.2f}"
+            result=f"{result.result:.2f}",
+            result_value=numeric_value(result.result),
+            inputs=finance.model_dump(mode="json")
         )
         
         return {
@@ -283,39 +369,467 @@ async def calculate_finance(
         )
 
 
+def _save_array_calculation(db: Session, user_id: int, operation_type: str, operation: str,
+                            expression: str, value, operands: Dict[str, Any]):
+    """
+    Save a matrix or complex calculation to history.
+    
+    The result column gets the (elided) display text of the result; the
+    operands go to inputs in the compact array encoding.
+    
+    Args:
+        db (Session): Database session
+        user_id (int): Current user ID
+        operation_type (str): "matrix" or "complex"
+        operation (str): Matrix or complex operation name
+        expression (str): Calculation expression
+        value: Kernel result (array or scalar)
+        operands (Dict[str, Any]): Operand arrays by name (None = absent)
+        
+    Returns:
+        CalculationHistory: Created history record
+    """
+    from app.services import array_kernels
+    
+    inputs = {"operation": operation}
+    for name, operand in operands.items():
+        if operand is not None:
+            inputs[name] = array_kernels.encode_array(operand)
+    
+    history_service = HistoryService(HistoryRepository(db))
+    return history_service.add_to_history(
+        user_id=user_id,
+        operation_type=operation_type,
+        expression=expression,
+        result=array_kernels.summarize(value),
+        result_value=numeric_value(value.item() if getattr(value, "ndim", None) == 0 else value),
+        inputs=inputs
+    )
+
+
+@router.post("/matrix", response_model=Dict[str, Any])
+async def calculate_matrix(
+    operation: MatrixOperation,
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Perform a matrix operation on JSON operands.
+    
+    Args:
+        operation (MatrixOperation): Matrix operation data
+        user_id (int): Current user ID
+        db (Session): Database session
+        
+    Returns:
+        Dict[str, Any]: Calculation result and history record
+        
+    Raises:
+        HTTPException: If calculation fails
+    """
+    from app.services import array_kernels
+    
+    try:
+        calculator_service = CalculatorService()
+        a, b = calculator_service.matrix_operands(operation)
+        # Inverses and eigenvalues of large matrices take a while; keep the
+        # NumPy work off the event loop
+        value, expression = await run_in_threadpool(
+            calculator_service.calculate_matrix, operation.operation, a, b
+        )
+        
+        history_record = _save_array_calculation(
+            db, user_id, OperationType.MATRIX.value, operation.operation,
+            expression, value, {"a": a, "b": b}
+        )
+        
+        return {
+            "result": array_kernels.to_json(value),
+            "shape": list(value.shape),
+            "expression": expression,
+            "operation": operation.operation,
+            "history_id": history_record.id
+        }
+    
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Matrix calculation failed: {str(e)}"
+        )
+
+
+async def _read_npy_operand(upload: Optional[UploadFile], name: str):
+    """Read and validate one uploaded .npy operand (None if not uploaded)."""
+    from app.services import array_kernels
+    
+    if upload is None:
+        return None
+    
+    data = await upload.read(settings.MATRIX_MAX_UPLOAD_BYTES + 1)
+    if len(data) > settings.MATRIX_MAX_UPLOAD_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Operand {name} exceeds {settings.MATRIX_MAX_UPLOAD_BYTES} bytes"
+        )
+    return array_kernels.check_array(array_kernels.load_npy(data, name), name)
+
+
+@router.post("/matrix/npy")
+async def calculate_matrix_npy(
+    operation: str = Form(..., pattern="^(multiply|inverse|determinant|solve|eigenvalues)$"),
+    a: UploadFile = File(..., description="Matrix A as a .npy file"),
+    b: Optional[UploadFile] = File(None, description="Matrix or vector B as a .npy file"),
+    response_format: str = Query("json", alias="format", pattern="^(json|npy)$"),
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+):
+    """
+    Perform a matrix operation on operands uploaded as .npy files.
+    
+    The arrays are loaded from their binary form (no JSON float parsing) and
+    may be real or complex, up to MATRIX_MAX_DIMENSION rows and columns.
+    With format=npy the result is returned as a .npy file as well, and the
+    history record ID in the X-History-Id header.
+    
+    Args:
+        operation (str): multiply, inverse, determinant, solve or eigenvalues
+        a (UploadFile): Matrix A (.npy)
+        b (Optional[UploadFile]): Matrix or vector B (.npy) for multiply and solve
+        response_format (str): "json" or "npy"
+        user_id (int): Current user ID
+        db (Session): Database session
+        
+    Returns:
+        Dict[str, Any] | Response: Calculation result and history record
+        
+    Raises:
+        HTTPException: If an upload is too large or the calculation fails
+    """
+    from app.services import array_kernels
+    
+    try:
+        matrix_a = await _read_npy_operand(a, "a")
+        matrix_b = await _read_npy_operand(b, "b")
+        
+        calculator_service = CalculatorService()
+        value, expression = await run_in_threadpool(
+            calculator_service.calculate_matrix, operation, matrix_a, matrix_b
+        )
+        
+        history_record = _save_array_calculation(
+            db, user_id, OperationType.MATRIX.value, operation,
+            expression, value, {"a": matrix_a, "b": matrix_b}
+        )
+        
+        if response_format == "npy":
+            return Response(
+                content=array_kernels.dump_npy(value),
+                media_type="application/x-npy",
+                headers={
+                    "Content-Disposition": f"attachment; filename={operation}.npy",
+                    "X-History-Id": str(history_record.id)
+                }
+            )
+        
+        return {
+            "result": array_kernels.to_json(value),
+            "shape": list(value.shape),
+            "expression": expression,
+            "operation": operation,
+            "history_id": history_record.id
+        }
+    
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Matrix calculation failed: {str(e)}"
+        )
+
+
+@router.post("/complex", response_model=Dict[str, Any])
+async def calculate_complex(
+    operation: ComplexOperation,
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Perform complex-number arithmetic.
+    
+    Args:
+        operation (ComplexOperation): Complex operation data
+        user_id (int): Current user ID
+        db (Session): Database session
+        
+    Returns:
+        Dict[str, Any]: Calculation result (a number, or a list when an
+        operand is a list) and history record
+        
+    Raises:
+        HTTPException: If calculation fails
+    """
+    from app.services import array_kernels
+    
+    try:
+        calculator_service = CalculatorService()
+        z1, z2 = calculator_service.complex_operands(operation)
+        value, expression = calculator_service.calculate_complex(operation.operation, z1, z2)
+        if not isinstance(operation.z1, list) and not isinstance(operation.z2, list):
+            value = value[0]
+        
+        history_record = _save_array_calculation(
+            db, user_id, OperationType.COMPLEX.value, operation.operation,
+            expression, value, {"z1": z1, "z2": z2}
+        )
+        
+        return {
+            "result": array_kernels.to_json(value),
+            "expression": expression,
+            "operation": operation.operation,
+            "history_id": history_record.id
+        }
+    
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Complex calculation failed: {str(e)}"
+        )
+
+
+def _save_statistics(db: Session, user_id: int, options: StatisticsOptions, source: str,
+                     result: Any, expression: str, summary: Dict[str, Any]):
+    """
+    Save a summary row of a statistics calculation to history.
+    
+    Only the options and a summary of the dataset are stored, never the
+    data itself.
+    
+    Args:
+        db (Session): Database session
+        user_id (int): Current user ID
+        options (StatisticsOptions): Operation and options
+        source (str): "json", "csv" or "npy"
+        result (Any): Calculation result
+        expression (str): Calculation expression
+        summary (Dict[str, Any]): Dataset summary
+        
+    Returns:
+        CalculationHistory: Created history record
+    """
+    from app.services import streaming_stats
+    
+    history_service = HistoryService(HistoryRepository(db))
+    return history_service.add_to_history(
+        user_id=user_id,
+        operation_type=OperationType.STATISTICS.value,
+        expression=expression,
+        result=streaming_stats.result_text(result),
+        result_value=numeric_value(result),
+        inputs=dict(
+            # options may be a StatisticsRequest: leave out its dataset fields
+            options.model_dump(mode="json", include=set(StatisticsOptions.model_fields), exclude_defaults=True),
+            source=source,
+            summary=summary
+        )
+    )
+
+
+def _statistics_response(options: StatisticsOptions, result: Any, expression: str,
+                         summary: Dict[str, Any], history_id: int) -> Dict[str, Any]:
+    return {
+        "result": result,
+        "expression": expression,
+        "operation": options.operation,
+        "count": summary["count"],
+        "exact": summary["exact"],
+        "history_id": history_id
+    }
+
+
+@router.post("/statistics", response_model=Dict[str, Any])
+async def calculate_statistics(
+    request: StatisticsRequest,
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Compute descriptive statistics of a dataset sent as a JSON array.
+    
+    Args:
+        request (StatisticsRequest): Dataset, operation and options
+        user_id (int): Current user ID
+        db (Session): Database session
+        
+    Returns:
+        Dict[str, Any]: Result, dataset size, whether quantiles are exact,
+        and history record
+        
+    Raises:
+        HTTPException: If calculation fails
+    """
+    from app.services import streaming_stats
+    
+    try:
+        calculator_service = CalculatorService()
+        chunks = streaming_stats.iter_array_chunks(
+            request.values, request.x, paired=request.operation == "regression"
+        )
+        result, expression, summary = await run_in_threadpool(
+            calculator_service.calculate_statistics, request, chunks
+        )
+        
+        history_record = _save_statistics(db, user_id, request, "json", result, expression, summary)
+        return _statistics_response(request, result, expression, summary, history_record.id)
+    
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Statistics calculation failed: {str(e)}"
+        )
+
+
+@router.post("/statistics/upload", response_model=Dict[str, Any])
+async def calculate_statistics_upload(
+    operation: str = Query(...),
+    file: UploadFile = File(..., description="Dataset as .csv or .npy"),
+    source_format: Optional[str] = Query(None, alias="format", pattern="^(csv|npy)$"),
+    column: Optional[str] = Query(None, description="CSV value (y) column: name or 0-based index"),
+    x_column: Optional[str] = Query(None, description="CSV x column for regression"),
+    percentiles: List[float] = Query([25, 50, 75]),
+    bins: int = Query(10),
+    histogram_min: Optional[float] = Query(None),
+    histogram_max: Optional[float] = Query(None),
+    population: bool = Query(False),
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Compute descriptive statistics of an uploaded CSV or .npy dataset.
+    
+    The file is streamed in chunks (CSV rows are parsed as they are read,
+    .npy data is read straight into arrays), so memory use does not grow
+    with the dataset. For regression, a CSV gives x and y columns (by
+    default the first two) and a .npy file an (n, 2) array; a single
+    column is regressed against the row number.
+    
+    Args:
+        operation (str): Statistics operation
+        file (UploadFile): CSV or .npy file
+        source_format (Optional[str]): "csv" or "npy"; detected from the
+            file name when omitted
+        column (Optional[str]): CSV value column
+        x_column (Optional[str]): CSV x column for regression
+        percentiles (List[float]): Percentiles (0-100)
+        bins (int): Histogram bins
+        histogram_min (Optional[float]): Fixed histogram lower edge
+        histogram_max (Optional[float]): Fixed histogram upper edge
+        population (bool): Population instead of sample stdev/variance
+        user_id (int): Current user ID
+        db (Session): Database session
+        
+    Returns:
+        Dict[str, Any]: Result, dataset size, whether quantiles are exact,
+        and history record
+        
+    Raises:
+        HTTPException: If the file is too large or the calculation fails
+    """
+    from app.services import streaming_stats
+    
+    try:
+        options = StatisticsOptions(
+            operation=operation, percentiles=percentiles, bins=bins,
+            histogram_min=histogram_min, histogram_max=histogram_max, population=population
+        )
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+    
+    try:
+        source_format = source_format or streaming_stats.detect_format(file.filename, file.content_type)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    size = file.file.seek(0, io.SEEK_END)
+    file.file.seek(0)
+    if size > settings.STATISTICS_MAX_UPLOAD_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Dataset exceeds {settings.STATISTICS_MAX_UPLOAD_BYTES} bytes"
+        )
+    
+    paired = options.operation == "regression"
+    
+    def run_statistics():
+        calculator_service = CalculatorService()
+        if source_format == "npy":
+            return calculator_service.calculate_statistics(
+                options, streaming_stats.iter_npy_chunks(file.file, paired=paired)
+            )
+        stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+        try:
+            return calculator_service.calculate_statistics(
+                options, streaming_stats.iter_csv_chunks(stream, column, x_column, paired=paired)
+            )
+        finally:
+            stream.detach()
+    
+    try:
+        # Parsing a large file is blocking work; keep it off the event loop
+        result, expression, summary = await run_in_threadpool(run_statistics)
+        
+        history_record = _save_statistics(db, user_id, options, source_format, result, expression, summary)
+        return _statistics_response(options, result, expression, summary, history_record.id)
+    
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Statistics calculation failed: {str(e)}"
+        )
+
+
 @router.get("/operations")
-async def get_available_operations() -> Dict[str, Any]:
+async def get_available_operations(request: Request):
     """
     Get list of available calculator operations.
     
+    The catalogue is static, so it is served with a long-lived public
+    Cache-Control and an ETag; revalidations get a 304.
+    
+    Args:
+        request (Request): Incoming request
+        
     Returns:
-        Dict[str, Any]: Available operations categorized
+        Response: Available operations categorized
     """
-    return {
-        "basic_operations": [
-            {"id": "addition", "name": "Addition", "symbol": "+", "inputs": 2},
-            {"id": "subtraction", "name": "Subtraction", "symbol": "-", "inputs": 2},
-            {"id": "multiplication", "name": "Multiplication", "symbol": "×", "inputs": 2},
-            {"id": "division", "name": "Division", "symbol": "÷", "inputs": 2},
-            {"id": "power", "name": "Power", "symbol": "^", "inputs": 2},
-            {"id": "percentage", "name": "Percentage", "symbol": "%", "inputs": 2}
-        ],
-        "advanced_operations": [
-            {"id": "square_root", "name": "Square Root", "symbol": "√", "inputs": 1},
-            {"id": "sin", "name": "Sine", "symbol": "sin", "inputs": 1},
-            {"id": "cos", "name": "Cosine", "symbol": "cos", "inputs": 1},
-            {"id": "tan", "name": "Tangent", "symbol": "tan", "inputs": 1},
-            {"id": "log", "name": "Logarithm (base 10)", "symbol": "log", "inputs": 1},
-            {"id": "ln", "name": "Natural Logarithm", "symbol": "ln", "inputs": 1}
-        ],
-        "conversions": {
-            "length": ["meter", "kilometer", "centimeter", "millimeter", "mile", "yard", "foot", "inch"],
-            "weight": ["kilogram", "gram", "pound", "ounce", "ton"],
-            "temperature": ["celsius", "fahrenheit", "kelvin"]
-        },
-        "finance_operations": [
-            {"id": "simple_interest", "name": "Simple Interest", "inputs": 3},
-            {"id": "compound_interest", "name": "Compound Interest", "inputs": 3},
-            {"id": "loan_payment", "name": "Loan Monthly Payment", "inputs": 3}
-        ]
-    }
\ No newline at end of file
+    headers = cache_headers(OPERATIONS_ETAG, cache_control=OPERATIONS_CACHE_CONTROL)
+    
+    if is_not_modified(request, OPERATIONS_ETAG):
+        return not_modified(headers)
+    
+    return FastJSONResponse(content=OPERATIONS_CATALOGUE, headers=headers)
\ No newline at end of file
@@ -2,22 +2,38 @@
 Calculation history API endpoints.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Response
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response, UploadFile, File, Query
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional
+import io
+import logging
 
-from app.database import get_db
-from app.schemas.history import HistoryResponse, HistoryFilter, HistoryDelete
+from app.config import settings
+from app.database import get_db, SessionLocal
+from app.http_cache import make_etag, cache_headers, is_not_modified, not_modified
+from app.responses import FastJSONResponse
+from app.schemas.history import (
+    HistoryResponse, HistoryFilter, HistoryDelete, HistoryExportFilter,
+    HistoryAggregateFilter, HistoryAggregateResponse, HistorySync
+)
+from app.services import history_export
 from app.services.history_service import HistoryService
+from app.services.history_import import detect_format, iter_source_rows
 from app.services.auth_service import AuthService
 from app.repositories.user_repository import UserRepository
 from app.repositories.history_repository import HistoryRepository
+from app.tracing import TracedRoute, traced
 
-router = APIRouter(prefix="/history", tags=["history"])
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/history", tags=["history"], route_class=TracedRoute)
 http_bearer = HTTPBearer(description="Access token using Bearer scheme")
 
 
+@traced("auth.get_current_user_id", "auth")
 def get_current_user_id(credentials = Depends(http_bearer), db: Session = Depends(get_db)) -> int:
     """
     Dependency to get current user ID from JWT token (Bearer scheme).
@@ -59,26 +75,41 @@ def get_current_user_id(credentials = Depends(http_bearer), db: Session = Depend
 
 @router.get("/", response_model=List[HistoryResponse])
 async def get_history(
+    request: Request,
     filters: HistoryFilter = Depends(),
     user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db)
-) -> List[HistoryResponse]:
+) -> Response:
     """
     Get user's calculation history with optional filters.
     
+    Supports conditional requests: if the user's history has not changed
+    since the client's ETag, a 304 is returned without running the query.
+    Rows are projected columns encoded straight to JSON, without building
+    ORM entities or HistoryResponse models.
+    
     Args:
+        request (Request): Incoming request
         filters (HistoryFilter): Filter criteria
         user_id (int): Current user ID
         db (Session): Database session
         
     Returns:
-        List[HistoryResponse]: List of history records
+        Response: JSON list of history records (HistoryResponse fields)
     """
     try:
         history_repo = HistoryRepository(db)
         history_service = HistoryService(history_repo)
         
-        return history_service.get_user_history(user_id, filters)
+        version, last_modified = history_service.get_history_version(user_id)
+        etag = make_etag("history", user_id, version, filters.model_dump_json())
+        headers = cache_headers(etag, last_modified)
+        
+        if is_not_modified(request, etag, last_modified):
+            return not_modified(headers)
+        
+        rows = history_service.get_user_history(user_id, filters)
+        return FastJSONResponse(content=history_export.response_rows(rows), headers=headers)
         
     except Exception as e:
         raise HTTPException(
@@ -89,13 +120,19 @@ async def get_history(
 
 @router.get("/stats")
 async def get_history_stats(
+    request: Request,
+    response: Response,
     user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db)
 ) -> Dict[str, Any]:
     """
     Get statistics about user's calculation history.
     
+    Answers 304 when the user's history version matches the client's ETag.
+    
     Args:
+        request (Request): Incoming request
+        response (Response): Outgoing response (for cache headers)
         user_id (int): Current user ID
         db (Session): Database session
         
@@ -106,6 +143,14 @@ async def get_history_stats(
         history_repo = HistoryRepository(db)
         history_service = HistoryService(history_repo)
         
+        version, last_modified = history_service.get_history_version(user_id)
+        etag = make_etag("stats", user_id, version)
+        headers = cache_headers(etag, last_modified)
+        
+        if is_not_modified(request, etag, last_modified):
+            return not_modified(headers)
+        
+        response.headers.update(headers)
         return history_service.get_history_stats(user_id)
         
     except Exception as e:
@@ -115,6 +160,51 @@ async def get_history_stats(
         )
 
 
+@router.get("/aggregate", response_model=HistoryAggregateResponse)
+async def aggregate_history(
+    request: Request,
+    response: Response,
+    filters: HistoryAggregateFilter = Depends(),
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+) -> HistoryAggregateResponse:
+    """
+    Get counts, sums and averages of results per operation type and
+    hour/day/week bucket.
+    
+    Answers 304 when the user's history version matches the client's ETag.
+    
+    Args:
+        request (Request): Incoming request
+        response (Response): Outgoing response (for cache headers)
+        filters (HistoryAggregateFilter): Bucket size and filter criteria
+        user_id (int): Current user ID
+        db (Session): Database session
+        
+    Returns:
+        HistoryAggregateResponse: Aggregated history
+    """
+    try:
+        history_repo = HistoryRepository(db)
+        history_service = HistoryService(history_repo)
+        
+        version, last_modified = history_service.get_history_version(user_id)
+        etag = make_etag("aggregate", user_id, version, filters.model_dump_json())
+        headers = cache_headers(etag, last_modified)
+        
+        if is_not_modified(request, etag, last_modified):
+            return not_modified(headers)
+        
+        response.headers.update(headers)
+        return history_service.aggregate_history(user_id, filters)
+    
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to aggregate history: {str(e)}"
+        )
+
+
 @router.delete("/", response_model=Dict[str, Any])
 async def delete_history(
     delete_data: HistoryDelete,
@@ -183,6 +273,197 @@ async def export_history_csv(
         )
 
 
+def _stream_export(export_method: str, user_id: int,
+                   filters: HistoryExportFilter) -> Iterator[bytes]:
+    """
+    Run a streaming export on its own database session.
+    
+    The session must outlive the request's dependency-scoped session,
+    because the body is generated while the response is being sent.
+    
+    Args:
+        export_method (str): HistoryService export method name
+        user_id (int): Current user ID
+        filters (HistoryExportFilter): Filter criteria
+        
+    Yields:
+        bytes: Encoded export chunks
+    """
+    db = SessionLocal()
+    try:
+        history_service = HistoryService(HistoryRepository(db))
+        yield from getattr(history_service, export_method)(user_id, filters)
+    except Exception as e:
+        logger.error(f"Export {export_method} failed for user {user_id}: {str(e)}")
+        raise
+    finally:
+        db.close()
+
+
+def _require_pyarrow() -> None:
+    """Raise 501 if the optional pyarrow dependency is missing."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Parquet/Arrow export requires pyarrow"
+        )
+
+
+@router.get("/export/ndjson")
+async def export_history_ndjson(
+    filters: HistoryExportFilter = Depends(),
+    user_id: int = Depends(get_current_user_id)
+) -> StreamingResponse:
+    """
+    Stream user's history as NDJSON (one typed JSON object per line).
+    
+    Args:
+        filters (HistoryExportFilter): Filter criteria
+        user_id (int): Current user ID
+        
+    Returns:
+        StreamingResponse: NDJSON stream
+    """
+    return StreamingResponse(
+        _stream_export("export_to_ndjson", user_id, filters),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": "attachment; filename=calculation_history.ndjson"}
+    )
+
+
+@router.get("/export/parquet")
+async def export_history_parquet(
+    filters: HistoryExportFilter = Depends(),
+    user_id: int = Depends(get_current_user_id)
+) -> StreamingResponse:
+    """
+    Stream user's history as a Parquet file with typed columns.
+    
+    Args:
+        filters (HistoryExportFilter): Filter criteria
+        user_id (int): Current user ID
+        
+    Returns:
+        StreamingResponse: Parquet file stream
+    """
+    _require_pyarrow()
+    return StreamingResponse(
+        _stream_export("export_to_parquet", user_id, filters),
+        media_type="application/vnd.apache.parquet",
+        headers={"Content-Disposition": "attachment; filename=calculation_history.parquet"}
+    )
+
+
+@router.get("/export/arrow")
+async def export_history_arrow(
+    filters: HistoryExportFilter = Depends(),
+    user_id: int = Depends(get_current_user_id)
+) -> StreamingResponse:
+    """
+    Stream user's history in the Arrow IPC streaming format.
+    
+    Args:
+        filters (HistoryExportFilter): Filter criteria
+        user_id (int): Current user ID
+        
+    Returns:
+        StreamingResponse: Arrow IPC stream
+    """
+    _require_pyarrow()
+    return StreamingResponse(
+        _stream_export("export_to_arrow", user_id, filters),
+        media_type="application/vnd.apache.arrow.stream",
+        headers={"Content-Disposition": "attachment; filename=calculation_history.arrows"}
+    )
+
+
+@router.post("/import", response_model=Dict[str, Any])
+async def import_history(
+    file: UploadFile = File(...),
+    source_format: Optional[str] = Query(None, alias="format", pattern="^(csv|ndjson)$"),
+    resume_from_line: int = Query(0, ge=0),
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Bulk import history from a CSV or NDJSON file.
+    
+    Rows are validated one by one and committed in chunks; invalid rows
+    are skipped and reported. If the import stops part-way, send the file
+    again with resume_from_line set to the reported last_committed_line.
+    
+    Args:
+        file (UploadFile): CSV or NDJSON file (e.g. a previous export)
+        source_format (Optional[str]): "csv" or "ndjson"; detected from
+            the file name when omitted
+        resume_from_line (int): Skip source lines up to this one
+        user_id (int): Current user ID
+        db (Session): Database session
+        
+    Returns:
+        Dict[str, Any]: Import summary
+    """
+    try:
+        source_format = source_format or detect_format(file.filename, file.content_type)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    def run_import() -> Dict[str, Any]:
+        stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+        try:
+            history_service = HistoryService(HistoryRepository(db))
+            return history_service.import_history(
+                user_id,
+                iter_source_rows(stream, source_format),
+                resume_from_line=resume_from_line,
+                chunk_size=settings.IMPORT_CHUNK_SIZE
+            )
+        finally:
+            stream.detach()
+    
+    try:
+        # Parsing and inserting is blocking work; keep it off the event loop
+        return await run_in_threadpool(run_import)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to import history: {str(e)}"
+        )
+
+
+@router.post("/bulk", response_model=Dict[str, Any])
+async def sync_history(
+    batch: HistorySync,
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Add a batch of calculations evaluated on the client.
+    
+    Used by the offline frontend's sync queue. Items are recomputed on the
+    server and inserted in one transaction; invalid items are skipped and
+    reported. Send an Idempotency-Key so a retried batch is not stored twice.
+    
+    Args:
+        batch (HistorySync): Client calculations
+        user_id (int): Current user ID
+        db (Session): Database session
+        
+    Returns:
+        Dict[str, Any]: Number of rows created and per-item errors
+    """
+    try:
+        history_service = HistoryService(HistoryRepository(db))
+        return history_service.sync_calculations(user_id, batch.items)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to sync history: {str(e)}"
+        )
+
+
 @router.get("/{history_id}", response_model=HistoryResponse)
 async def get_history_by_id(
     history_id: int,
@@ -0,0 +1,184 @@
+"""
+Key-value cache backends.
+
+``MemoryCache`` is a bounded, per-process LRU cache with TTL. ``RedisCache``
+shares entries between workers; it takes an optional client so a local
+stand-in (e.g. fakeredis) can be injected in tests.
+"""
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Optional
+import json
+import logging
+import time
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(ABC):
+    """
+    Interface for cache backends.
+    
+    Values must be JSON-serializable so that every backend behaves the same.
+    
+    Methods:
+        get: Get value by key
+        set: Store value with TTL
+        add: Store value with TTL only if the key is missing
+        delete: Remove keys
+    """
+    
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """Return the value stored under ``key``, or None if missing or expired."""
+    
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store ``value`` under ``key`` for ``ttl`` seconds."""
+    
+    @abstractmethod
+    def add(self, key: str, value: Any, ttl: float) -> bool:
+        """Store ``value`` only if ``key`` is missing; return whether it was stored."""
+    
+    @abstractmethod
+    def delete(self, *keys: str) -> None:
+        """Remove ``keys``; missing keys are ignored."""
+
+
+class MemoryCache(CacheBackend):
+    """
+    In-process LRU cache with per-entry TTL.
+    
+    Attributes:
+        max_size (int): Maximum number of entries before LRU eviction
+    """
+    
+    def __init__(self, max_size: int = 10000):
+        """
+        Initialize MemoryCache.
+        
+        Args:
+            max_size (int): Maximum number of entries
+        """
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = Lock()
+    
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def add(self, key: str, value: Any, ttl: float) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                return False
+            
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            return True
+    
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisCache(CacheBackend):
+    """
+    Cache shared between workers, stored in Redis as JSON.
+    
+    Errors from Redis are logged and treated as cache misses so that an
+    unavailable cache never breaks a request.
+    """
+    
+    def __init__(self, url: str = "", client=None, prefix: str = "mathhub:"):
+        """
+        Initialize RedisCache.
+        
+        Args:
+            url (str): Redis URL, used when no client is given
+            client: Redis-compatible client (e.g. a fakeredis stand-in)
+            prefix (str): Key prefix
+        """
+        if client is None:
+            import redis
+            
+            client = redis.Redis.from_url(url)
+        
+        self.client = client
+        self.prefix = prefix
+    
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            raw = self.client.get(self.prefix + key)
+        except Exception as e:
+            logger.warning("Cache get failed for %s: %s", key, e, extra={"event": "cache.error"})
+            return None
+        return json.loads(raw) if raw is not None else None
+    
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        try:
+            self.client.set(self.prefix + key, json.dumps(value), px=int(ttl * 1000))
+        except Exception as e:
+            logger.warning("Cache set failed for %s: %s", key, e, extra={"event": "cache.error"})
+    
+    def add(self, key: str, value: Any, ttl: float) -> bool:
+        try:
+            return bool(self.client.set(
+                self.prefix + key, json.dumps(value), px=int(ttl * 1000), nx=True
+            ))
+        except Exception as e:
+            logger.warning("Cache add failed for %s: %s", key, e, extra={"event": "cache.error"})
+            return True
+    
+    def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+        try:
+            self.client.delete(*(self.prefix + key for key in keys))
+        except Exception as e:
+            logger.warning("Cache delete failed for %s: %s", keys, e, extra={"event": "cache.error"})
+
+
+def create_cache_backend(max_size: int = 10000) -> CacheBackend:
+    """
+    Create the configured cache backend.
+    
+    Args:
+        max_size (int): Entry limit for the in-process backend
+        
+    Returns:
+        CacheBackend: RedisCache when CACHE_URL is set, else MemoryCache
+    """
+    if settings.CACHE_URL:
+        return RedisCache(settings.CACHE_URL)
+    return MemoryCache(max_size=max_size)
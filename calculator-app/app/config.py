@@ -4,7 +4,7 @@ Handles environment variables and application settings.
 """
 
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Optional, List
 
 
 class Settings(BaseSettings):
@@ -13,6 +13,15 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "sqlite:///./calculator.db"
     DATABASE_TEST_URL: str = "sqlite:///./test.db"
+    # Comma-separated read-only replica URLs (empty = read from primary)
+    DATABASE_REPLICA_URLS: str = ""
+    # Create missing tables on app startup (disable when migrations run separately)
+    AUTO_CREATE_TABLES: bool = True
+    
+    # Cache (empty CACHE_URL = in-process cache; redis://... = shared)
+    CACHE_URL: str = ""
+    USER_CACHE_TTL: int = 60
+    USER_CACHE_MAX_SIZE: int = 10000
     
     # JWT
     SECRET_KEY: str = "your-secret-key-change-in-production"
@@ -24,6 +33,119 @@ class Settings(BaseSettings):
     DEBUG: bool = True
     VERSION: str = "1.0.0"
     
+    # Logging: JSON lines (or "text") written by a background thread.
+    # Empty LOG_LEVEL = INFO in DEBUG mode, else WARNING. LOG_SAMPLE_RATES
+    # keeps a fraction of high-volume DEBUG/INFO events, e.g.
+    # "history.created=0.1"; records beyond LOG_QUEUE_SIZE are dropped.
+    LOG_LEVEL: str = ""
+    LOG_FORMAT: str = "json"
+    LOG_SAMPLE_RATES: str = ""
+    LOG_QUEUE_SIZE: int = 10000
+    
+    # Tracing: spans for requests, auth, services, repositories and SQL
+    # statements. TRACE_EXPORTER "file" appends finished traces to
+    # TRACE_FILE from a background thread (traces beyond TRACE_QUEUE_SIZE
+    # waiting to be written are dropped; view with show_traces.py);
+    # "memory" keeps the last TRACE_BUFFER_SIZE traces in process.
+    # TRACE_SAMPLE_RATE is the fraction of requests traced.
+    TRACING_ENABLED: bool = False
+    TRACE_EXPORTER: str = "file"
+    TRACE_FILE: str = "traces.jsonl"
+    TRACE_SAMPLE_RATE: float = 1.0
+    TRACE_BUFFER_SIZE: int = 100
+    TRACE_QUEUE_SIZE: int = 1000
+    
+    # Rate limiting: token buckets per user and per client IP.
+    # RATE_LIMITS lists prefix=requests/seconds per route group; the per-IP
+    # bucket allows RATE_LIMIT_IP_FACTOR times more (several users may share
+    # an address). Empty RATE_LIMIT_URL = in-process buckets; redis://... =
+    # shared between workers.
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMITS: str = "/api/calculator=30/10,/api/history=60/10,/api/auth=10/60"
+    RATE_LIMIT_IP_FACTOR: int = 4
+    RATE_LIMIT_URL: str = ""
+    
+    # Idempotency-Key: responses to POSTs under these prefixes are stored
+    # for IDEMPOTENCY_TTL seconds and replayed for the same key (stored in
+    # the CACHE_URL backend; in-process it keeps IDEMPOTENCY_MAX_KEYS).
+    # Responses over IDEMPOTENCY_MAX_BODY bytes are sent but not stored, so
+    # the in-process store stays under MAX_KEYS * MAX_BODY * 4/3 (base64),
+    # about 870 MB at the defaults and far less for typical results.
+    IDEMPOTENCY_PREFIXES: str = "/api/calculator,/api/history"
+    IDEMPOTENCY_TTL: int = 86400
+    IDEMPOTENCY_MAX_KEYS: int = 10000
+    IDEMPOTENCY_MAX_BODY: int = 64 * 1024
+    
+    # Admin profiling endpoints (/api/admin/profile/*), off unless enabled.
+    # Only the comma-separated ADMIN_USERNAMES may call them; a profile
+    # covers the worker that serves the request, for at most
+    # PROFILE_MAX_SECONDS.
+    PROFILING_ENABLED: bool = False
+    ADMIN_USERNAMES: str = ""
+    PROFILE_MAX_SECONDS: int = 60
+    
+    # Event-loop blocking detector: stalls longer than the threshold are
+    # logged with the blocking stack, exported on GET /metrics and listed
+    # for admins on GET /api/admin/loop/blocked
+    LOOP_MONITOR_ENABLED: bool = False
+    LOOP_BLOCK_THRESHOLD_MS: int = 100
+    LOOP_MONITOR_INTERVAL_MS: int = 50
+    
+    # Matrix and complex operations (NumPy). Matrices have at most
+    # MATRIX_MAX_DIMENSION rows and columns; JSON bodies carry at most
+    # MATRIX_MAX_JSON_ELEMENTS numbers, larger operands are uploaded as .npy
+    # (up to MATRIX_MAX_UPLOAD_BYTES each). History stores operands up to
+    # MATRIX_HISTORY_MAX_BYTES as base64 bytes, larger ones as a digest.
+    MATRIX_MAX_DIMENSION: int = 500
+    MATRIX_MAX_JSON_ELEMENTS: int = 10000
+    MATRIX_MAX_UPLOAD_BYTES: int = 8 * 1024 * 1024
+    MATRIX_HISTORY_MAX_BYTES: int = 65536
+    
+    # Statistics over datasets: JSON arrays of up to STATISTICS_MAX_JSON_VALUES
+    # values, CSV/.npy uploads up to STATISTICS_MAX_UPLOAD_BYTES, streamed
+    # in chunks. Quantiles are exact up to STATISTICS_EXACT_LIMIT values and
+    # estimated with a t-digest (STATISTICS_TDIGEST_COMPRESSION) beyond.
+    STATISTICS_MAX_JSON_VALUES: int = 200000
+    STATISTICS_MAX_UPLOAD_BYTES: int = 512 * 1024 * 1024
+    STATISTICS_EXACT_LIMIT: int = 100000
+    STATISTICS_TDIGEST_COMPRESSION: int = 500
+    
+    # Responses smaller than this (bytes) are sent uncompressed
+    COMPRESSION_MIN_SIZE: int = 1024
+    
+    # Bulk history import: rows committed per transaction
+    IMPORT_CHUNK_SIZE: int = 5000
+    
+    # innodb_ft_min_token_size of the MySQL server: shorter search terms are
+    # not in the FULLTEXT index and are matched with LIKE instead
+    SEARCH_MIN_TOKEN_SIZE: int = 3
+    
+    # Monthly range partitioning of calculation_history (MySQL; see
+    # manage_partitions.py). Partitioned tables cannot have FULLTEXT indexes,
+    # so history search falls back to LIKE when this is enabled.
+    HISTORY_PARTITIONING: bool = False
+    HISTORY_PARTITION_MONTHS_AHEAD: int = 3
+    # Drop history older than this many months (0 = keep forever)
+    HISTORY_RETENTION_MONTHS: int = 0
+    
+    # Production server (python -m app.server)
+    HOST: str = "0.0.0.0"
+    PORT: int = 8000
+    WORKERS: int = 0  # 0 = size from CPU count
+    WORKER_MAX_REQUESTS: int = 10000
+    WORKER_MAX_REQUESTS_JITTER: int = 1000
+    GRACEFUL_TIMEOUT: int = 30
+    
+    @property
+    def replica_urls(self) -> List[str]:
+        """Parsed list of read replica database URLs."""
+        return [url.strip() for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+    
+    @property
+    def admin_usernames(self) -> List[str]:
+        """Parsed list of usernames allowed to use the admin endpoints."""
+        return [name.strip() for name in self.ADMIN_USERNAMES.split(",") if name.strip()]
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
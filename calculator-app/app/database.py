@@ -2,27 +2,153 @@
 Database configuration and session management.
 """
 
+from contextlib import contextmanager
+from itertools import cycle
+import json
+
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.config import settings
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib decoder
+    orjson = None
+
+
+def load_json_column(value: str):
+    """
+    Decode a JSON column value (history inputs), once per row read.
+    
+    Uses orjson when installed; values it rejects (e.g. NaN written by the
+    stdlib encoder) are decoded by the json module as before.
+    
+    Args:
+        value (str): Stored JSON text
+        
+    Returns:
+        Decoded value
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(value)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(value)
+
+
 # Create database engine
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
     pool_recycle=300,
-    echo=settings.DEBUG
+    echo=settings.DEBUG,
+    json_deserializer=load_json_column
 )
 
+# Create read replica engines (round-robin)
+replica_engines = [
+    create_engine(
+        url,
+        pool_pre_ping=True,
+        pool_recycle=300,
+        echo=settings.DEBUG,
+        json_deserializer=load_json_column
+    )
+    for url in settings.replica_urls
+]
+_replica_cycle = cycle(replica_engines) if replica_engines else None
+
+
+class RoutingSession(Session):
+    """
+    Session that routes opted-in reads to a read replica.
+    
+    Everything runs against the primary engine unless wrapped in
+    ``with db.use_replica():``. Flushes always go to the primary, so
+    writes and read-your-own-write cases stay consistent.
+    
+    A session picks its replica once (round-robin across sessions) and
+    keeps it, so the reads of one request, such as a history version and
+    the rows it validates, see the same replica.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._replica_bind = None
+        self._replica_engine = None
+    
+    def get_bind(self, mapper=None, **kw):
+        """Return the replica engine inside a replica block, else the primary."""
+        if self._replica_bind is not None and not self._flushing:
+            return self._replica_bind
+        return super().get_bind(mapper, **kw)
+    
+    @contextmanager
+    def use_replica(self):
+        """
+        Route reads in this block to this session's read replica.
+        
+        Falls back to the primary engine when no replicas are configured.
+        
+        Usage:
+            with self.db.use_replica():
+                return self.db.query(CalculationHistory).all()
+        """
+        if _replica_cycle is None or self._replica_bind is not None:
+            yield self
+            return
+        
+        if self._replica_engine is None:
+            self._replica_engine = next(_replica_cycle)
+        self._replica_bind = self._replica_engine
+        try:
+            yield self
+        finally:
+            self._replica_bind = None
+
+
 # Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, bind=engine, class_=RoutingSession
+)
 
 # Base class for models
 Base = declarative_base()
 
 
+def init_db():
+    """
+    Create all database tables that do not exist yet and add columns or
+    indexes missing from existing ones.
+    
+    This is an explicit startup/migration step; importing the application
+    no longer touches the database. Run it via ``python create_tables.py``
+    or let the app do it on startup when AUTO_CREATE_TABLES is enabled.
+    """
+    # Import models so they are registered on Base.metadata
+    from app.models import calculation, history_version, user  # noqa: F401
+    from app.migrations import upgrade_schema
+    
+    Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
+
+
+def dispose_engines(close: bool = True):
+    """
+    Dispose connection pools of the primary and replica engines.
+    
+    Args:
+        close (bool): Close pooled connections. Pass False in a freshly
+            forked worker so it drops the parent's connections without
+            closing sockets that the parent still owns.
+    """
+    for db_engine in [engine, *replica_engines]:
+        db_engine.dispose(close=close)
+
+
 def get_db():
     """
     Dependency function to get database session.
@@ -39,4 +165,4 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
@@ -0,0 +1,115 @@
+"""
+HTTP conditional request helpers (ETag / Last-Modified / Cache-Control).
+"""
+
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from hashlib import blake2b
+from typing import Optional
+
+from fastapi import Request, Response, status
+
+# Per-user data: cacheable by the browser only, always revalidated
+PRIVATE_REVALIDATE = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """
+    Build a weak ETag from the given parts.
+    
+    Weak because the same representation may be sent with different
+    content encodings.
+    
+    Returns:
+        str: ETag header value
+    """
+    digest = blake2b("|".join(str(part) for part in parts).encode(), digest_size=12)
+    return f'W/"{digest.hexdigest()}"'
+
+
+def http_date(moment: datetime) -> str:
+    """
+    Format a datetime as an HTTP date. Naive datetimes are treated as UTC.
+    
+    Args:
+        moment (datetime): Timestamp
+        
+    Returns:
+        str: HTTP-date string
+    """
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return format_datetime(moment.astimezone(timezone.utc).replace(microsecond=0), usegmt=True)
+
+
+def cache_headers(etag: str, last_modified: Optional[datetime] = None,
+                  cache_control: str = PRIVATE_REVALIDATE) -> dict:
+    """
+    Build validator and Cache-Control headers.
+    
+    Args:
+        etag (str): ETag value
+        last_modified (Optional[datetime]): Last modification time
+        cache_control (str): Cache-Control value
+        
+    Returns:
+        dict: Response headers
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def is_not_modified(request: Request, etag: str,
+                    last_modified: Optional[datetime] = None) -> bool:
+    """
+    Check the request's conditional headers against the current validators.
+    
+    If-None-Match takes precedence over If-Modified-Since (RFC 9110).
+    
+    Args:
+        request (Request): Incoming request
+        etag (str): Current ETag
+        last_modified (Optional[datetime]): Current modification time
+        
+    Returns:
+        bool: True if the client's copy is still fresh
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        opaque = etag[2:] if etag.startswith("W/") else etag
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        return any(
+            (tag[2:] if tag.startswith("W/") else tag) == opaque
+            for tag in candidates
+        )
+    
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        return last_modified.replace(microsecond=0) <= since
+    
+    return False
+
+
+def not_modified(headers: dict) -> Response:
+    """
+    Build an empty 304 Not Modified response.
+    
+    Args:
+        headers (dict): Validator and Cache-Control headers
+        
+    Returns:
+        Response: 304 response
+    """
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
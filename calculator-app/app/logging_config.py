@@ -0,0 +1,239 @@
+"""
+Structured, non-blocking logging.
+
+Application code logs through the standard ``logging`` API. Records are
+handed to a bounded in-memory queue by a ``QueueHandler`` and formatted
+(as JSON lines by default) and written by a background ``QueueListener``
+thread, so a request never waits for string formatting or stream I/O.
+
+- Lazy formatting: records keep their ``msg``/``args`` until the listener
+  formats them; use ``logger.debug("... %s", value)`` rather than f-strings
+  on hot paths so disabled levels cost nothing.
+- Sampling: LOG_SAMPLE_RATES keeps only a fraction of high-volume
+  DEBUG/INFO events (keyed by ``extra={"event": ...}`` or logger name).
+- Correlation: the request ID set by RequestIdMiddleware is attached to
+  every record logged while handling that request.
+"""
+
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+
+from app.config import settings
+from app.tracing import current_span_var
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+# Request ID of the request being handled in the current task/thread
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# Attributes every LogRecord has; anything else came from ``extra=``
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {
+    "message", "asctime", "request_id", "trace_id", "event"
+}
+
+_listener: Optional[QueueListener] = None
+_handler: Optional[QueueHandler] = None
+_output: Optional[logging.Handler] = None
+
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    """
+    Parse sampling rates such as ``"history.created=0.1,app.cache=0.5"``.
+    
+    Args:
+        spec (str): Comma-separated key=rate pairs, rates between 0 and 1
+        
+    Returns:
+        Dict[str, float]: Rate per event name or logger name
+        
+    Raises:
+        ValueError: If an entry is malformed
+    """
+    rates = {}
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        try:
+            key, rate = item.split("=", 1)
+            rates[key.strip()] = float(rate)
+        except ValueError:
+            raise ValueError(f"Invalid log sample rate: {item!r} (expected name=rate)")
+        if not 0 <= rates[key.strip()] <= 1:
+            raise ValueError(f"Invalid log sample rate: {item!r} (rate must be between 0 and 1)")
+    return rates
+
+
+class ContextFilter(logging.Filter):
+    """Attach the current request ID and trace ID to each record."""
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        span = current_span_var.get()
+        record.trace_id = span.trace.trace_id if span is not None else None
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of DEBUG/INFO records of high-volume events.
+    
+    Warnings and errors are never dropped.
+    
+    Attributes:
+        rates (Dict[str, float]): Kept fraction per event or logger name
+    """
+    
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        rate = self.rates.get(getattr(record, "event", None) or record.name)
+        return rate is None or random.random() < rate
+
+
+class JSONFormatter(logging.Formatter):
+    """Format records as one JSON object per line."""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "event", None):
+            entry["event"] = record.event
+        if getattr(record, "request_id", None):
+            entry["request_id"] = record.request_id
+        if getattr(record, "trace_id", None):
+            entry["trace_id"] = record.trace_id
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        
+        if orjson is not None:
+            return orjson.dumps(entry, default=str).decode()
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """Classic text format, with the request ID when there is one."""
+    
+    def __init__(self):
+        super().__init__("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        request_id = getattr(record, "request_id", None)
+        return f"{text} [request_id={request_id}]" if request_id else text
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Queue handler that never blocks or formats in the logging thread.
+    
+    The standard QueueHandler formats the message before enqueueing; here
+    the record is queued as is and formatted by the listener. When the
+    queue is full the record is dropped and counted instead of blocking.
+    
+    While the listener is stopped (``direct`` is set) records are written
+    synchronously to the output handler instead of an unread queue.
+    """
+    
+    dropped = 0
+    direct: Optional[logging.Handler] = None
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.direct is not None:
+            self.direct.handle(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            NonBlockingQueueHandler.dropped += 1
+
+
+def _start_listener() -> None:
+    global _listener
+    _handler.queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    _listener = QueueListener(_handler.queue, _output, respect_handler_level=True)
+    _listener.start()
+    _handler.direct = None
+
+
+def _restart_in_child() -> None:
+    # Threads do not survive fork (gunicorn preloads the app in the master)
+    if _listener is not None:
+        _start_listener()
+
+
+def configure_logging() -> None:
+    """
+    Route the root logger through the background queue.
+    
+    Safe to call more than once; later calls replace the handlers. The
+    listener thread is restarted in forked worker processes.
+    """
+    global _handler, _output
+    level = settings.LOG_LEVEL or ("INFO" if settings.DEBUG else "WARNING")
+    
+    stop_logging()
+    _output = logging.StreamHandler(sys.stderr)
+    _output.setFormatter(JSONFormatter() if settings.LOG_FORMAT == "json" else TextFormatter())
+    
+    _handler = NonBlockingQueueHandler(queue.Queue())
+    _handler.addFilter(ContextFilter())
+    _handler.addFilter(SamplingFilter(parse_sample_rates(settings.LOG_SAMPLE_RATES)))
+    _start_listener()
+    
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+    root.addHandler(_handler)
+    root.setLevel(level)
+
+
+def start_logging() -> None:
+    """Restart the background listener after ``stop_logging``."""
+    if _handler is not None and _listener is None:
+        _start_listener()
+
+
+def stop_logging() -> None:
+    """
+    Flush queued records and stop the background listener.
+    
+    Later records (server shutdown logs) are written synchronously until
+    ``start_logging`` or ``configure_logging`` runs again.
+    """
+    global _listener
+    if _listener is not None:
+        _handler.direct = _output
+        _listener.stop()
+        _listener = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_in_child)
+atexit.register(stop_logging)
@@ -0,0 +1,176 @@
+"""
+Event-loop blocking detector.
+
+A heartbeat task sleeps for a short interval on the event loop and measures
+how late it wakes up (the loop lag). A watchdog thread checks the heartbeat
+and, when the loop has not come back within the threshold, captures the
+stack of the event-loop thread: that stack is the coroutine blocking the
+loop, down to the blocking call (sync DB query, bcrypt, PDF build...).
+
+Each stall is logged once with its stack and counted per code location, and
+the lag distribution is kept as a histogram; both are served in the
+Prometheus text format by ``GET /metrics`` and the recent stalls by
+``GET /api/admin/loop/blocked``.
+"""
+
+from collections import Counter, deque
+from typing import List
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def blocking_location(stack: List[traceback.FrameSummary]) -> str:
+    """
+    Name the innermost application frame of a stack.
+    
+    Args:
+        stack (List[traceback.FrameSummary]): Stack, outermost frame first
+        
+    Returns:
+        str: ``app/api/history.py:export_pdf``, or the innermost frame when
+        no application code is on the stack
+    """
+    for frame in reversed(stack):
+        if frame.filename.startswith(APP_DIR + os.sep):
+            path = os.path.relpath(frame.filename, os.path.dirname(APP_DIR))
+            return f"{path}:{frame.name}"
+    if stack:
+        return f"{os.path.basename(stack[-1].filename)}:{stack[-1].name}"
+    return "unknown"
+
+
+class LoopMonitor:
+    """
+    Measure event-loop lag and capture what blocked the loop.
+    
+    Attributes:
+        threshold (float): Seconds the loop may be blocked before a stall
+            is recorded
+        interval (float): Heartbeat interval in seconds
+    """
+    
+    def __init__(self, threshold: float = 0.1, interval: float = 0.05, max_events: int = 100):
+        self.threshold = threshold
+        self.interval = interval
+        self.lag_buckets = [0] * (len(LAG_BUCKETS) + 1)
+        self.lag_sum = 0.0
+        self.blocked_count = Counter()
+        self.blocked_seconds = Counter()
+        self.events = deque(maxlen=max_events)
+        self._last_beat = time.monotonic()
+        self._captured = None
+        self._loop_thread = None
+        self._heartbeat_task = None
+        self._stopped = threading.Event()
+    
+    async def start(self) -> None:
+        """Start the heartbeat on the running loop and the watchdog thread."""
+        self._loop_thread = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stopped.clear()
+        self._heartbeat_task = asyncio.get_running_loop().create_task(self._heartbeat())
+        threading.Thread(target=self._watch, name="loop-watchdog", daemon=True).start()
+    
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+    
+    async def _heartbeat(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._last_beat = now
+            self._observe(max(0.0, now - expected))
+    
+    def _watch(self) -> None:
+        while not self._stopped.wait(self.interval):
+            if self._captured is not None or time.monotonic() - self._last_beat < self.interval + self.threshold:
+                continue
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is not None:
+                # Read by the heartbeat once the loop runs again
+                self._captured = traceback.extract_stack(frame)
+    
+    def _observe(self, lag: float) -> None:
+        for index, bound in enumerate(LAG_BUCKETS):
+            if lag <= bound:
+                self.lag_buckets[index] += 1
+                break
+        else:
+            self.lag_buckets[-1] += 1
+        self.lag_sum += lag
+        
+        stack, self._captured = self._captured, None
+        if lag < self.threshold:
+            return
+        
+        location = blocking_location(stack) if stack else "unknown"
+        self.blocked_count[location] += 1
+        self.blocked_seconds[location] += lag
+        stack_text = "".join(traceback.format_list(stack)) if stack else None
+        self.events.append({
+            "time": time.time(),
+            "blocked_seconds": round(lag, 4),
+            "location": location,
+            "stack": stack_text,
+        })
+        logger.warning("Event loop blocked for %.3fs in %s", lag, location, extra={
+            "event": "loop.blocked",
+            "blocked_seconds": round(lag, 4),
+            "location": location,
+            "stack": stack_text,
+        })
+    
+    def prometheus_text(self) -> str:
+        """
+        Render the metrics in the Prometheus text exposition format.
+        
+        Returns:
+            str: Lag histogram and blocked-loop counters of this worker
+        """
+        pid = os.getpid()
+        lines = [
+            "# HELP event_loop_lag_seconds Delay of the event-loop heartbeat.",
+            "# TYPE event_loop_lag_seconds histogram",
+        ]
+        cumulative = 0
+        for bound, count in zip(LAG_BUCKETS + ("+Inf",), self.lag_buckets):
+            cumulative += count
+            lines.append(f'event_loop_lag_seconds_bucket{{pid="{pid}",le="{bound}"}} {cumulative}')
+        lines.append(f'event_loop_lag_seconds_sum{{pid="{pid}"}} {self.lag_sum}')
+        lines.append(f'event_loop_lag_seconds_count{{pid="{pid}"}} {cumulative}')
+        
+        lines += [
+            "# HELP event_loop_blocked_total Times the event loop was blocked beyond the threshold.",
+            "# TYPE event_loop_blocked_total counter",
+        ]
+        for location, count in sorted(self.blocked_count.items()):
+            lines.append(f'event_loop_blocked_total{{pid="{pid}",location="{location}"}} {count}')
+        lines += [
+            "# HELP event_loop_blocked_seconds_total Time the event loop spent blocked.",
+            "# TYPE event_loop_blocked_seconds_total counter",
+        ]
+        for location, seconds in sorted(self.blocked_seconds.items()):
+            lines.append(f'event_loop_blocked_seconds_total{{pid="{pid}",location="{location}"}} {seconds}')
+        return "\n".join(lines) + "\n"
+
+
+loop_monitor = LoopMonitor(
+    threshold=settings.LOOP_BLOCK_THRESHOLD_MS / 1000,
+    interval=settings.LOOP_MONITOR_INTERVAL_MS / 1000
+)
@@ -2,26 +2,63 @@
 Main FastAPI application module.
 """
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request, status
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 import logging
-import uvicorn
 
-from app.database import engine, Base
-from app.api import auth, calculator, history
+from app.database import init_db, dispose_engines
+from app.api import admin, auth, calculator, history
+from app.cache import create_cache_backend
 from app.config import settings
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO if settings.DEBUG else logging.WARNING,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+from app.logging_config import configure_logging, start_logging, stop_logging
+from app.loop_monitor import loop_monitor
+from app.middleware import (
+    CompressionMiddleware, IdempotencyMiddleware, RateLimitMiddleware, RequestIdMiddleware,
+    TracingMiddleware
 )
+from app.rate_limit import create_token_bucket_store, parse_rate_limits
+from app.responses import FastJSONResponse
+from app.tracing import instrument_sqlalchemy, start_exporter, stop_exporter
+
+# Configure logging (JSON lines written by a background thread)
+configure_logging()
 logger = logging.getLogger(__name__)
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+if settings.TRACING_ENABLED:
+    instrument_sqlalchemy()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application startup/shutdown hook.
+    
+    Tables are created on startup only when AUTO_CREATE_TABLES is enabled.
+    Production deployments should disable it and run ``python create_tables.py``
+    once per release instead of on every worker boot.
+    
+    Shutdown runs after the server has stopped accepting connections and
+    in-flight requests (and their history commits) have completed; pooled
+    database connections are then closed cleanly.
+    """
+    start_logging()
+    start_exporter()
+    if settings.AUTO_CREATE_TABLES:
+        init_db()
+    if settings.LOOP_MONITOR_ENABLED:
+        await loop_monitor.start()
+    yield
+    if settings.LOOP_MONITOR_ENABLED:
+        await loop_monitor.stop()
+    dispose_engines()
+    logger.info("Database connections closed")
+    stop_exporter()
+    stop_logging()
+
 
 # Create FastAPI application
 app = FastAPI(
@@ -30,9 +67,33 @@ app = FastAPI(
     description="MathHub Calculator API - Advanced calculator with history tracking",
     docs_url="/api/docs",
     redoc_url="/api/redoc",
-    openapi_url="/api/openapi.json"
+    openapi_url="/api/openapi.json",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan
+)
+
+# Replay stored responses to retried POSTs carrying an Idempotency-Key
+app.add_middleware(
+    IdempotencyMiddleware,
+    store=create_cache_backend(max_size=settings.IDEMPOTENCY_MAX_KEYS),
+    prefixes=[prefix.strip() for prefix in settings.IDEMPOTENCY_PREFIXES.split(",") if prefix.strip()],
+    ttl=settings.IDEMPOTENCY_TTL,
+    max_body=settings.IDEMPOTENCY_MAX_BODY
 )
 
+# Rate limit per user and per IP (innermost, so 429s still get CORS headers)
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(
+        RateLimitMiddleware,
+        rules=parse_rate_limits(settings.RATE_LIMITS),
+        store=create_token_bucket_store(),
+        ip_factor=settings.RATE_LIMIT_IP_FACTOR
+    )
+
+# Compress large responses (history listings, exports); small calculator
+# replies stay uncompressed
+app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -40,12 +101,26 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Last-Modified", "Retry-After", "Idempotent-Replayed", "X-Request-ID",
+                    "traceparent", "X-History-Id"],
 )
 
+# One trace per request (root span around everything below)
+if settings.TRACING_ENABLED:
+    app.add_middleware(TracingMiddleware)
+
+# Tag every request (and its log records) with an ID; outermost so that
+# logs from all other middleware are correlated too
+app.add_middleware(RequestIdMiddleware)
+
 # Register routers
 app.include_router(auth.router, prefix="/api")
 app.include_router(calculator.router, prefix="/api")
 app.include_router(history.router, prefix="/api")
+if settings.PROFILING_ENABLED:
+    app.include_router(admin.profiling_router, prefix="/api")
+if settings.LOOP_MONITOR_ENABLED:
+    app.include_router(admin.loop_router, prefix="/api")
 
 
 @app.exception_handler(RequestValidationError)
@@ -58,7 +133,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         exc (RequestValidationError): Validation exception
         
     Returns:
-        JSONResponse: Error response
+        FastJSONResponse: Error response
     """
     errors = []
     for error in exc.errors():
@@ -69,7 +144,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
             "type": error["type"]
         })
     
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={
             "detail": "Validation failed",
@@ -88,11 +163,11 @@ async def general_exception_handler(request: Request, exc: Exception):
         exc (Exception): Exception
         
     Returns:
-        JSONResponse: Error response
+        FastJSONResponse: Error response
     """
     logger.error(f"Unhandled exception: {str(exc)}", exc_info=True)
     
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "detail": "Internal server error",
@@ -121,6 +196,18 @@ async def root():
     }
 
 
+if settings.LOOP_MONITOR_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """
+        Event-loop metrics of this worker in the Prometheus text format.
+        
+        Returns:
+            PlainTextResponse: Lag histogram and blocked-loop counters
+        """
+        return PlainTextResponse(loop_monitor.prometheus_text(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/health")
 async def health_check():
     """
@@ -133,6 +220,8 @@ async def health_check():
 
 
 if __name__ == "__main__":
+    import uvicorn
+    
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
@@ -0,0 +1,14 @@
+"""
+ASGI middleware for MathHub Calculator.
+"""
+
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.idempotency import IdempotencyMiddleware
+from app.middleware.rate_limit import RateLimitMiddleware
+from app.middleware.request_id import RequestIdMiddleware
+from app.middleware.tracing import TracingMiddleware
+
+__all__ = [
+    "CompressionMiddleware", "IdempotencyMiddleware", "RateLimitMiddleware", "RequestIdMiddleware",
+    "TracingMiddleware"
+]
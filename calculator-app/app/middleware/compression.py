@@ -0,0 +1,144 @@
+"""
+Negotiated response compression middleware (brotli or gzip).
+"""
+
+from typing import Set
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.middleware.gzip import GZipResponder
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; fall back to gzip only
+    brotli = None
+
+
+def accepted_encodings(accept_encoding: str) -> Set[str]:
+    """
+    Parse an Accept-Encoding header into the set of acceptable encodings.
+    
+    Args:
+        accept_encoding (str): Raw Accept-Encoding header value
+        
+    Returns:
+        Set[str]: Encodings with a non-zero quality value
+    """
+    encodings = set()
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name and quality > 0:
+            encodings.add(name.strip().lower())
+    return encodings
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with brotli when the client accepts it, else gzip.
+    
+    Responses smaller than ``minimum_size`` (such as calculator replies) are
+    sent uncompressed because the CPU cost outweighs the bandwidth saved.
+    """
+    
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024,
+                 gzip_level: int = 6, brotli_quality: int = 4) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            encodings = accepted_encodings(Headers(scope=scope).get("Accept-Encoding", ""))
+            
+            if brotli is not None and "br" in encodings:
+                responder = BrotliResponder(self.app, self.minimum_size, self.brotli_quality)
+                await responder(scope, receive, send)
+                return
+            
+            if "gzip" in encodings:
+                responder = GZipResponder(self.app, self.minimum_size, compresslevel=self.gzip_level)
+                await responder(scope, receive, send)
+                return
+        
+        await self.app(scope, receive, send)
+
+
+class BrotliResponder:
+    """ASGI send wrapper that brotli-compresses the response body."""
+    
+    def __init__(self, app: ASGIApp, minimum_size: int, quality: int = 4) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.send: Send = None
+        self.initial_message: Message = {}
+        self.started = False
+        self.content_encoding_set = False
+        self.compressor = brotli.Compressor(quality=quality)
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_with_brotli)
+    
+    def _set_headers(self, content_length: int = None) -> None:
+        headers = MutableHeaders(raw=self.initial_message["headers"])
+        headers["Content-Encoding"] = "br"
+        headers.add_vary_header("Accept-Encoding")
+        if content_length is None:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(content_length)
+    
+    async def send_with_brotli(self, message: Message) -> None:
+        message_type = message["type"]
+        
+        if message_type == "http.response.start":
+            # Hold the start message until we know whether to compress
+            self.initial_message = message
+            headers = Headers(raw=self.initial_message["headers"])
+            self.content_encoding_set = "content-encoding" in headers
+        
+        elif message_type == "http.response.body" and self.content_encoding_set:
+            if not self.started:
+                self.started = True
+                await self.send(self.initial_message)
+            await self.send(message)
+        
+        elif message_type == "http.response.body" and not self.started:
+            self.started = True
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            
+            if len(body) < self.minimum_size and not more_body:
+                # Small response: not worth compressing
+                await self.send(self.initial_message)
+                await self.send(message)
+            elif not more_body:
+                body = self.compressor.process(body) + self.compressor.finish()
+                self._set_headers(len(body))
+                message["body"] = body
+                await self.send(self.initial_message)
+                await self.send(message)
+            else:
+                # First chunk of a streaming response
+                self._set_headers()
+                message["body"] = self.compressor.process(body) + self.compressor.flush()
+                await self.send(self.initial_message)
+                await self.send(message)
+        
+        elif message_type == "http.response.body":
+            # Remaining chunks of a streaming response
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            
+            chunk = self.compressor.process(body)
+            chunk += self.compressor.flush() if more_body else self.compressor.finish()
+            message["body"] = chunk
+            await self.send(message)
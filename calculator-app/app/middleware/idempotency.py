@@ -0,0 +1,162 @@
+"""
+Idempotency-Key middleware: replay stored responses to retried POSTs.
+"""
+
+from typing import List
+import base64
+import hashlib
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.cache import CacheBackend
+from app.middleware.rate_limit import token_user_id
+from app.responses import FastJSONResponse
+
+IDEMPOTENCY_HEADER = "idempotency-key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+# How long an unfinished request holds its key
+PENDING_TTL = 60
+
+
+class IdempotencyMiddleware:
+    """
+    Store the response to a POST that carries an ``Idempotency-Key`` header
+    and return it again, without running the endpoint, when the same client
+    retries with the same key.
+    
+    Keys are scoped to the user (or the client IP when unauthenticated) and
+    the path. A retry whose body differs from the original gets 422, and a
+    retry that arrives while the original is still running gets 409. Server
+    errors are not stored, so those requests can be retried for real. The
+    key store is a ``CacheBackend``, which bounds it by TTL and LRU eviction;
+    responses over ``max_body`` bytes are sent but not stored, which bounds
+    the size of each entry.
+    """
+    
+    def __init__(self, app: ASGIApp, store: CacheBackend, prefixes: List[str],
+                 ttl: float = 86400, max_body: int = 64 * 1024) -> None:
+        self.app = app
+        self.store = store
+        self.prefixes = tuple(prefixes)
+        self.ttl = ttl
+        self.max_body = max_body
+    
+    def _store_key(self, scope: Scope, headers: Headers, key: str) -> str:
+        user_id = token_user_id(headers.get("authorization"))
+        if user_id is not None:
+            owner = f"user:{user_id}"
+        else:
+            client = scope.get("client")
+            owner = f"ip:{client[0] if client else 'unknown'}"
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return f"idempotency:{owner}:{scope['path']}:{digest}"
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (scope["type"] != "http" or scope["method"] != "POST"
+                or not scope["path"].startswith(self.prefixes)):
+            await self.app(scope, receive, send)
+            return
+        
+        headers = Headers(scope=scope)
+        key = headers.get(IDEMPOTENCY_HEADER)
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+        
+        if not key or len(key) > MAX_KEY_LENGTH:
+            await self._error(scope, receive, send, 400,
+                              f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters")
+            return
+        
+        store_key = self._store_key(scope, headers, key)
+        stored = self.store.get(store_key)
+        if stored is None and self.store.add(store_key, {"pending": True}, PENDING_TTL):
+            await self._run_and_store(scope, receive, send, store_key)
+            return
+        
+        if stored is None or stored.get("pending"):
+            await self._error(scope, receive, send, 409,
+                              "A request with this Idempotency-Key is still in progress")
+            return
+        
+        fingerprint = hashlib.sha256()
+        while True:
+            message = await receive()
+            fingerprint.update(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        
+        if fingerprint.hexdigest() != stored["fingerprint"]:
+            await self._error(scope, receive, send, 422,
+                              "Idempotency-Key was already used with a different request body")
+            return
+        
+        await self._replay(send, stored)
+    
+    async def _run_and_store(self, scope: Scope, receive: Receive, send: Send,
+                             store_key: str) -> None:
+        """Run the request, fingerprinting its body, and store the response."""
+        fingerprint = hashlib.sha256()
+        response = {"status": None, "headers": None}
+        chunks = []
+        size = 0
+        
+        async def receive_body() -> Message:
+            message = await receive()
+            if message["type"] == "http.request":
+                fingerprint.update(message.get("body", b""))
+            return message
+        
+        async def send_response(message: Message) -> None:
+            nonlocal size
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = [
+                    [name.decode("latin-1"), value.decode("latin-1")]
+                    for name, value in message.get("headers", [])
+                ]
+            elif message["type"] == "http.response.body" and size <= self.max_body:
+                body = message.get("body", b"")
+                chunks.append(body)
+                size += len(body)
+            await send(message)
+        
+        try:
+            await self.app(scope, receive_body, send_response)
+        except Exception:
+            self.store.delete(store_key)
+            raise
+        
+        if response["status"] is None or response["status"] >= 500 or size > self.max_body:
+            self.store.delete(store_key)
+            return
+        
+        self.store.set(store_key, {
+            "fingerprint": fingerprint.hexdigest(),
+            "status": response["status"],
+            "headers": response["headers"],
+            "body": base64.b64encode(b"".join(chunks)).decode("ascii")
+        }, self.ttl)
+    
+    async def _replay(self, send: Send, stored: dict) -> None:
+        headers = [
+            (name.encode("latin-1"), value.encode("latin-1"))
+            for name, value in stored["headers"]
+        ]
+        headers.append((REPLAYED_HEADER.lower().encode("latin-1"), b"true"))
+        await send({
+            "type": "http.response.start",
+            "status": stored["status"],
+            "headers": headers
+        })
+        await send({
+            "type": "http.response.body",
+            "body": base64.b64decode(stored["body"])
+        })
+    
+    async def _error(self, scope: Scope, receive: Receive, send: Send,
+                     status_code: int, detail: str) -> None:
+        response = FastJSONResponse(status_code=status_code, content={"detail": detail})
+        await response(scope, receive, send)
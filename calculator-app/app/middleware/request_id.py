@@ -0,0 +1,48 @@
+"""
+Request ID middleware for log correlation.
+"""
+
+import re
+import uuid
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.logging_config import request_id_var
+
+REQUEST_ID_HEADER = "X-Request-ID"
+# Accept IDs from a proxy/client only if they are short and log-safe
+VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+
+class RequestIdMiddleware:
+    """
+    Give every request an ID, available to all log records it produces.
+    
+    An incoming ``X-Request-ID`` (e.g. from a load balancer) is reused when
+    valid, otherwise a new one is generated. The ID is returned in the
+    response header so clients can quote it.
+    """
+    
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        request_id = Headers(scope=scope).get(REQUEST_ID_HEADER)
+        if not request_id or not VALID_REQUEST_ID.match(request_id):
+            request_id = uuid.uuid4().hex
+        
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[REQUEST_ID_HEADER] = request_id
+            await send(message)
+        
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_var.reset(token)
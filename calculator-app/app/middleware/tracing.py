@@ -0,0 +1,55 @@
+"""
+Tracing middleware: one trace per HTTP request.
+"""
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.logging_config import request_id_var
+from app.tracing import start_trace
+
+
+class TracingMiddleware:
+    """
+    Open the root span of each request and return its ``traceparent``.
+    
+    The span is named after the matched route template once routing has
+    run (``POST /api/calculator/finance``), so traces of the same endpoint
+    group together. Spans opened further down become its children.
+    """
+    
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        method = scope["method"]
+        with start_trace(f"{method} {scope['path']}",
+                         traceparent=Headers(scope=scope).get("traceparent"),
+                         attributes={
+                             "http.method": method,
+                             "http.target": scope["path"],
+                             "request_id": request_id_var.get()
+                         }) as span:
+            if span is None:
+                await self.app(scope, receive, send)
+                return
+            
+            async def send_with_traceparent(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.status = "error"
+                    MutableHeaders(scope=message)["traceparent"] = span.traceparent
+                await send(message)
+            
+            try:
+                await self.app(scope, receive, send_with_traceparent)
+            finally:
+                route = scope.get("route")
+                if route is not None and hasattr(route, "path"):
+                    span.name = f"{method} {route.path}"
+                    span.set_attribute("http.route", route.path)
@@ -0,0 +1,218 @@
+"""
+Lightweight schema migrations for existing databases.
+
+``create_all`` only creates missing tables, so columns and indexes added
+to existing tables are applied here. Every step is idempotent.
+"""
+
+from sqlalchemy import inspect, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+import logging
+import weakref
+
+from app.config import settings
+from app.models.calculation import CalculationHistory
+from app.services.result_values import split_result
+
+logger = logging.getLogger(__name__)
+
+# Typed history columns added after the initial schema
+HISTORY_TYPED_COLUMNS = ("result_value", "result_unit", "inputs")
+
+# Full-text search over history expressions/results
+HISTORY_FTS_TABLE = "calculation_history_fts"
+HISTORY_FULLTEXT_INDEX = "ft_history_search"
+
+# Engines whose search index was found (absent ones are checked again)
+_search_index_engines = weakref.WeakSet()
+
+# SQLite: external-content FTS5 table kept in sync by triggers, so ORM
+# inserts, bulk inserts and bulk/cascade deletes are all covered
+SQLITE_FTS_DDL = (
+    f"""CREATE VIRTUAL TABLE {HISTORY_FTS_TABLE} USING fts5(
+        expression, result,
+        content='calculation_history', content_rowid='id',
+        prefix='2 3'
+    )""",
+    f"""CREATE TRIGGER calculation_history_fts_insert AFTER INSERT ON calculation_history BEGIN
+        INSERT INTO {HISTORY_FTS_TABLE}(rowid, expression, result)
+        VALUES (new.id, new.expression, new.result);
+    END""",
+    f"""CREATE TRIGGER calculation_history_fts_delete AFTER DELETE ON calculation_history BEGIN
+        INSERT INTO {HISTORY_FTS_TABLE}({HISTORY_FTS_TABLE}, rowid, expression, result)
+        VALUES ('delete', old.id, old.expression, old.result);
+    END""",
+    f"""CREATE TRIGGER calculation_history_fts_update AFTER UPDATE OF expression, result ON calculation_history BEGIN
+        INSERT INTO {HISTORY_FTS_TABLE}({HISTORY_FTS_TABLE}, rowid, expression, result)
+        VALUES ('delete', old.id, old.expression, old.result);
+        INSERT INTO {HISTORY_FTS_TABLE}(rowid, expression, result)
+        VALUES (new.id, new.expression, new.result);
+    END""",
+    # Index rows that existed before the FTS table
+    f"INSERT INTO {HISTORY_FTS_TABLE}({HISTORY_FTS_TABLE}) VALUES ('rebuild')",
+)
+
+
+def upgrade_schema(bind: Engine) -> None:
+    """
+    Add missing history columns and indexes to an existing database.
+    
+    Args:
+        bind (Engine): Database engine
+    """
+    table = CalculationHistory.__table__
+    inspector = inspect(bind)
+    if not inspector.has_table(table.name):
+        return
+    
+    existing = {column["name"] for column in inspector.get_columns(table.name)}
+    with bind.begin() as connection:
+        for name in HISTORY_TYPED_COLUMNS:
+            if name in existing:
+                continue
+            column = table.c[name]
+            column_type = column.type.compile(dialect=bind.dialect)
+            connection.exec_driver_sql(
+                f"ALTER TABLE {table.name} ADD COLUMN {name} {column_type} NULL"
+            )
+            logger.info("Added column %s.%s", table.name, name, extra={"event": "migration.column_added"})
+    
+    for index in table.indexes:
+        index.create(bind, checkfirst=True)
+    
+    upgrade_search_index(bind)
+
+    # Keep partitions for upcoming months on a partitioned table
+    from app.partitioning import ensure_future_partitions
+    ensure_future_partitions(bind, settings.HISTORY_PARTITION_MONTHS_AHEAD)
+
+
+def upgrade_search_index(bind: Engine) -> None:
+    """
+    Create the full-text search index over history if it is missing.
+    
+    SQLite gets an FTS5 table, MySQL a FULLTEXT index (unless the table
+    is partitioned). Other databases have no search index and fall back
+    to LIKE matching.
+    
+    Args:
+        bind (Engine): Database engine
+    """
+    dialect = bind.dialect.name
+    inspector = inspect(bind)
+    
+    if dialect == "sqlite":
+        if inspector.has_table(HISTORY_FTS_TABLE):
+            return
+        try:
+            with bind.begin() as connection:
+                for statement in SQLITE_FTS_DDL:
+                    connection.exec_driver_sql(statement)
+            logger.info("Created full-text table %s", HISTORY_FTS_TABLE,
+                        extra={"event": "migration.search_index_created"})
+        except Exception as e:
+            logger.warning("History search index unavailable (SQLite without FTS5?), "
+                           "search falls back to LIKE: %s", e,
+                           extra={"event": "migration.search_index_unavailable"})
+    
+    elif dialect in ("mysql", "mariadb") and not settings.HISTORY_PARTITIONING:
+        # Partitioned InnoDB tables do not support FULLTEXT indexes
+        table_name = CalculationHistory.__table__.name
+        existing = {index["name"] for index in inspector.get_indexes(table_name)}
+        if HISTORY_FULLTEXT_INDEX in existing:
+            return
+        with bind.begin() as connection:
+            connection.exec_driver_sql(
+                f"ALTER TABLE {table_name} "
+                f"ADD FULLTEXT INDEX {HISTORY_FULLTEXT_INDEX} (expression, result)"
+            )
+        logger.info("Created FULLTEXT index %s", HISTORY_FULLTEXT_INDEX,
+                    extra={"event": "migration.search_index_created"})
+
+
+def has_search_index(bind: Engine) -> bool:
+    """
+    Check whether the full-text search index over history exists.
+    
+    Args:
+        bind (Engine): Database engine
+        
+    Returns:
+        bool: True if searches can use the FTS5 table or FULLTEXT index
+    """
+    if bind in _search_index_engines:
+        return True
+    
+    dialect = bind.dialect.name
+    inspector = inspect(bind)
+    if dialect == "sqlite":
+        available = inspector.has_table(HISTORY_FTS_TABLE)
+    elif dialect in ("mysql", "mariadb") and not settings.HISTORY_PARTITIONING:
+        table_name = CalculationHistory.__table__.name
+        available = HISTORY_FULLTEXT_INDEX in {index["name"] for index in inspector.get_indexes(table_name)}
+    else:
+        available = False
+    
+    if available:
+        _search_index_engines.add(bind)
+    return available
+
+
+def backfill_history_values(db: Session, batch_size: int = 1000) -> int:
+    """
+    Fill result_value/result_unit of old history rows from their result text.
+    
+    Walks the table once by primary key and commits per batch, so it can
+    run on a live database and be interrupted and restarted safely.
+    Structured inputs cannot be recovered from old rows and stay NULL.
+    
+    Args:
+        db (Session): Database session
+        batch_size (int): Rows per batch
+        
+    Returns:
+        int: Number of rows updated
+    """
+    updated = 0
+    last_id = 0
+    
+    while True:
+        rows = db.execute(
+            select(CalculationHistory.id, CalculationHistory.result)
+            .where(
+                CalculationHistory.id > last_id,
+                CalculationHistory.result_value.is_(None)
+            )
+            .order_by(CalculationHistory.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        
+        values = []
+        for row in rows:
+            result_value, result_unit = split_result(row.result)
+            if result_value is not None:
+                values.append({
+                    "id": row.id,
+                    "result_value": result_value,
+                    "result_unit": result_unit
+                })
+        
+        try:
+            if values:
+                # Bulk UPDATE by primary key (executemany)
+                db.execute(update(CalculationHistory), values)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error backfilling history values after id {last_id}: {str(e)}")
+            raise
+        
+        updated += len(values)
+        logger.info("Backfilled %d history rows (up to id %s)", updated, last_id,
+                    extra={"event": "migration.values_backfilled"})
+    
+    return updated
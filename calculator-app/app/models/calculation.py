@@ -2,12 +2,23 @@
 Calculation history model.
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Double, JSON, Index
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
 from app.database import Base
 
+# On SQLite, store timestamps in the same second-precision format that
+# CURRENT_TIMESTAMP (and MySQL DATETIME) uses. Timestamps are compared as
+# strings there, so mixed formats would break range and keyset filters.
+HistoryTimestamp = DateTime(timezone=True).with_variant(
+    sqlite.DATETIME(
+        storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"
+    ),
+    "sqlite"
+)
+
 
 class CalculationHistory(Base):
     """
@@ -18,19 +29,34 @@ class CalculationHistory(Base):
         user_id (int): Foreign key to users table
         operation_type (str): Type of operation (basic, advanced, conversion, finance)
         expression (str): Mathematical expression/input
-        result (str): Calculation result
+        result (str): Calculation result (display text)
+        result_value (float): Numeric value of the result, if numeric
+        result_unit (str): Unit of the result (e.g. conversion target unit)
+        inputs (dict): Structured calculation inputs
         created_at (datetime): Calculation timestamp
         user (relationship): Many-to-one relationship with User
     """
     
     __tablename__ = "calculation_history"
+    __table_args__ = (
+        # History listing/export: user_id [+ operation_type] with a
+        # created_at range, newest first. The primary key is implicitly the
+        # last index column, so ORDER BY created_at DESC, id DESC is free too.
+        Index("idx_user_created", "user_id", "created_at"),
+        Index("idx_user_operation_created", "user_id", "operation_type", "created_at"),
+        # Per-user numeric range queries ("results above X")
+        Index("idx_user_result_value", "user_id", "result_value"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     operation_type = Column(String(50), nullable=False)
     expression = Column(Text, nullable=False)
     result = Column(String(255), nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    result_value = Column(Double, nullable=True)
+    result_unit = Column(String(50), nullable=True)
+    inputs = Column(JSON, nullable=True)
+    created_at = Column(HistoryTimestamp, server_default=func.now())
     
     # Relationship with user
     user = relationship("User", back_populates="calculations")
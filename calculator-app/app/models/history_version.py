@@ -0,0 +1,30 @@
+"""
+Per-user history version model.
+"""
+
+from sqlalchemy import Column, Integer, DateTime, ForeignKey
+
+from app.database import Base
+
+
+class HistoryVersion(Base):
+    """
+    Version counter bumped on every write to a user's calculation history.
+    
+    Used to build ETag/Last-Modified validators for history endpoints, so
+    unchanged data can be answered with 304 without querying the history.
+    
+    Attributes:
+        user_id (int): Primary key, foreign key to users table
+        version (int): Incremented on each insert/delete
+        updated_at (datetime): Time of the last change (UTC)
+    """
+    
+    __tablename__ = "history_versions"
+    
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    version = Column(Integer, nullable=False, default=1)
+    updated_at = Column(DateTime, nullable=False)
+    
+    def __repr__(self):
+        return f"<HistoryVersion(user_id={self.user_id}, version={self.version})>"
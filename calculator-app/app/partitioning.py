@@ -0,0 +1,328 @@
+"""
+Monthly partitioning and retention for calculation_history.
+
+On MySQL the table can be converted to ``PARTITION BY RANGE`` on
+``TO_DAYS(created_at)`` with one partition per month, a catch-all ``p_start``
+for older rows and a ``pmax`` for anything beyond the newest month. Future
+months are split off ``pmax`` ahead of time, and retention drops whole
+partitions instead of deleting rows.
+
+Other databases (SQLite) are not partitioned; retention there deletes old
+rows in small primary-key batches.
+"""
+
+from datetime import date, datetime
+from typing import List, Optional, Set
+import logging
+
+from sqlalchemy import inspect, select, text, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.migrations import HISTORY_FULLTEXT_INDEX
+from app.models.calculation import CalculationHistory
+from app.models.history_version import HistoryVersion
+
+logger = logging.getLogger(__name__)
+
+TABLE = CalculationHistory.__table__.name
+START_PARTITION = "p_start"
+MAX_PARTITION = "pmax"
+
+
+def month_start(moment) -> date:
+    """
+    Get the first day of the month of a date/datetime.
+    
+    Args:
+        moment: Date or datetime
+        
+    Returns:
+        date: First day of that month
+    """
+    return date(moment.year, moment.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    """
+    Shift a month start by a number of months.
+    
+    Args:
+        month (date): First day of a month
+        months (int): Months to add (may be negative)
+        
+    Returns:
+        date: First day of the resulting month
+    """
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Name of the partition holding the given month, e.g. ``p202401``."""
+    return f"p{month.year:04d}{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    """Month held by a monthly partition, or None for p_start/pmax."""
+    if len(name) != 7 or not name.startswith("p") or not name[1:].isdigit():
+        return None
+    return date(int(name[1:5]), int(name[5:7]), 1)
+
+
+def _partition_clause(month: date) -> str:
+    upper = add_months(month, 1).isoformat()
+    return f"PARTITION {partition_name(month)} VALUES LESS THAN (TO_DAYS('{upper}'))"
+
+
+def _require_mysql(bind: Engine) -> None:
+    if bind.dialect.name not in ("mysql", "mariadb"):
+        raise ValueError(f"Table partitioning is only supported on MySQL, not {bind.dialect.name}")
+
+
+def list_partitions(bind: Engine) -> List[str]:
+    """
+    List the partitions of calculation_history in range order.
+    
+    Args:
+        bind (Engine): Database engine
+        
+    Returns:
+        List[str]: Partition names (empty if not partitioned or not MySQL)
+    """
+    if bind.dialect.name not in ("mysql", "mariadb"):
+        return []
+    
+    with bind.connect() as connection:
+        rows = connection.execute(text(
+            "SELECT PARTITION_NAME FROM information_schema.PARTITIONS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table "
+            "AND PARTITION_NAME IS NOT NULL "
+            "ORDER BY PARTITION_ORDINAL_POSITION"
+        ), {"table": TABLE}).all()
+    return [row[0] for row in rows]
+
+
+def partition_table(bind: Engine, months_ahead: int = 3) -> None:
+    """
+    Convert calculation_history into a monthly range-partitioned table.
+    
+    MySQL requires the partition column in every unique key and does not
+    support foreign keys or FULLTEXT indexes on partitioned tables, so this
+    drops the user foreign key (user deletion still cascades through the
+    ORM relationship) and the search index, makes created_at NOT NULL and
+    extends the primary key to (id, created_at). The table is rebuilt, so
+    run it in a maintenance window.
+    
+    Args:
+        bind (Engine): MySQL engine
+        months_ahead (int): Future months to create partitions for
+    """
+    _require_mysql(bind)
+    if list_partitions(bind):
+        logger.info("%s is already partitioned", TABLE, extra={"event": "partition.exists"})
+        return
+    
+    inspector = inspect(bind)
+    with bind.connect() as connection:
+        oldest = connection.execute(select(CalculationHistory.created_at).order_by(
+            CalculationHistory.created_at
+        ).limit(1)).scalar()
+    
+    first = month_start(oldest or datetime.utcnow())
+    last = add_months(month_start(datetime.utcnow()), months_ahead)
+    months = [first]
+    while months[-1] < last:
+        months.append(add_months(months[-1], 1))
+    
+    partitions = [f"PARTITION {START_PARTITION} VALUES LESS THAN (TO_DAYS('{first.isoformat()}'))"]
+    partitions += [_partition_clause(month) for month in months]
+    partitions.append(f"PARTITION {MAX_PARTITION} VALUES LESS THAN MAXVALUE")
+    
+    with bind.begin() as connection:
+        for foreign_key in inspector.get_foreign_keys(TABLE):
+            connection.exec_driver_sql(f"ALTER TABLE {TABLE} DROP FOREIGN KEY {foreign_key['name']}")
+        
+        if HISTORY_FULLTEXT_INDEX in {index["name"] for index in inspector.get_indexes(TABLE)}:
+            connection.exec_driver_sql(f"ALTER TABLE {TABLE} DROP INDEX {HISTORY_FULLTEXT_INDEX}")
+        
+        connection.exec_driver_sql(
+            f"ALTER TABLE {TABLE} "
+            f"MODIFY created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP, "
+            f"DROP PRIMARY KEY, ADD PRIMARY KEY (id, created_at)"
+        )
+        connection.exec_driver_sql(
+            f"ALTER TABLE {TABLE} PARTITION BY RANGE (TO_DAYS(created_at)) "
+            f"({', '.join(partitions)})"
+        )
+    
+    logger.info("Partitioned %s into %d partitions", TABLE, len(partitions),
+                extra={"event": "partition.created"})
+
+
+def ensure_future_partitions(bind: Engine, months_ahead: int = 3) -> List[str]:
+    """
+    Split monthly partitions off pmax up to ``months_ahead`` months ahead.
+    
+    Only pmax is reorganized; it is empty as long as this runs regularly,
+    which makes the split a metadata-only operation.
+    
+    Args:
+        bind (Engine): Database engine
+        months_ahead (int): Future months that must have a partition
+        
+    Returns:
+        List[str]: Names of the partitions created
+    """
+    partitions = list_partitions(bind)
+    if MAX_PARTITION not in partitions:
+        return []
+    
+    months = [month for month in map(partition_month, partitions) if month is not None]
+    if not months:
+        return []
+    
+    target = add_months(month_start(datetime.utcnow()), months_ahead)
+    missing = []
+    month = add_months(max(months), 1)
+    while month <= target:
+        missing.append(month)
+        month = add_months(month, 1)
+    if not missing:
+        return []
+    
+    clauses = [_partition_clause(month) for month in missing]
+    clauses.append(f"PARTITION {MAX_PARTITION} VALUES LESS THAN MAXVALUE")
+    with bind.begin() as connection:
+        connection.exec_driver_sql(
+            f"ALTER TABLE {TABLE} REORGANIZE PARTITION {MAX_PARTITION} INTO ({', '.join(clauses)})"
+        )
+    
+    created = [partition_name(month) for month in missing]
+    logger.info("Created history partitions: %s", ", ".join(created),
+                extra={"event": "partition.added"})
+    return created
+
+
+def _invalidate_all_history_versions(connection) -> None:
+    """Bump every user's history version so cached ETags are revalidated."""
+    connection.execute(update(HistoryVersion).values(
+        version=HistoryVersion.version + 1,
+        updated_at=datetime.utcnow()
+    ))
+
+
+def _invalidate_history_versions(connection, user_ids: Set[int]) -> None:
+    """Bump the history version of ``user_ids`` only."""
+    connection.execute(
+        update(HistoryVersion)
+        .where(HistoryVersion.user_id.in_(user_ids))
+        .values(version=HistoryVersion.version + 1, updated_at=datetime.utcnow())
+    )
+
+
+def drop_partitions_before(bind: Engine, cutoff: date) -> List[str]:
+    """
+    Drop partitions that only hold history older than ``cutoff``.
+    
+    p_start holds every row before the first monthly partition, including
+    rows inserted later with old client timestamps (imports, offline sync),
+    so it is only dropped once the cutoff reaches that first month.
+    
+    Args:
+        bind (Engine): Database engine
+        cutoff (date): First day of the oldest month to keep
+        
+    Returns:
+        List[str]: Names of the dropped partitions
+    """
+    partitions = list_partitions(bind)
+    months = [month for month in map(partition_month, partitions) if month is not None]
+    
+    expired = []
+    for name in partitions:
+        month = partition_month(name)
+        if name == START_PARTITION:
+            # Upper bound of p_start is the first monthly partition's month
+            if months and months[0] <= cutoff:
+                expired.append(name)
+        elif month is not None and month < cutoff:
+            expired.append(name)
+    if not expired:
+        return []
+    
+    with bind.begin() as connection:
+        connection.exec_driver_sql(f"ALTER TABLE {TABLE} DROP PARTITION {', '.join(expired)}")
+        _invalidate_all_history_versions(connection)
+    
+    logger.info("Dropped history partitions: %s", ", ".join(expired),
+                extra={"event": "partition.dropped"})
+    return expired
+
+
+def delete_history_before(db: Session, cutoff: date, batch_size: int = 1000) -> int:
+    """
+    Delete history older than ``cutoff`` in primary-key batches.
+    
+    Used where the table is not partitioned. Old rows have the lowest IDs,
+    so every batch reads from the start of the primary key.
+    
+    Args:
+        db (Session): Database session
+        cutoff (date): First day of the oldest month to keep
+        batch_size (int): Rows deleted per transaction
+        
+    Returns:
+        int: Number of rows deleted
+    """
+    cutoff_moment = datetime(cutoff.year, cutoff.month, cutoff.day)
+    deleted = 0
+    
+    while True:
+        rows = db.execute(
+            select(CalculationHistory.id, CalculationHistory.user_id)
+            .where(CalculationHistory.created_at < cutoff_moment)
+            .order_by(CalculationHistory.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        ids = [row.id for row in rows]
+        
+        try:
+            db.execute(CalculationHistory.__table__.delete().where(CalculationHistory.id.in_(ids)))
+            _invalidate_history_versions(db, {row.user_id for row in rows})
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error deleting history before {cutoff}: {str(e)}")
+            raise
+        
+        deleted += len(ids)
+    
+    logger.info("Deleted %d history records older than %s", deleted, cutoff,
+                extra={"event": "history.retention_deleted"})
+    return deleted
+
+
+def apply_retention(bind: Engine, db: Session, retention_months: int) -> int:
+    """
+    Remove history older than ``retention_months`` whole months.
+    
+    Drops partitions when the table is partitioned, otherwise deletes rows.
+    
+    Args:
+        bind (Engine): Database engine
+        db (Session): Database session (for row deletes)
+        retention_months (int): Months to keep, counting the current one
+        
+    Returns:
+        int: Rows deleted, or partitions dropped on a partitioned table
+    """
+    if retention_months <= 0:
+        return 0
+    
+    cutoff = add_months(month_start(datetime.utcnow()), -(retention_months - 1))
+    if list_partitions(bind):
+        return len(drop_partitions_before(bind, cutoff))
+    return delete_history_before(db, cutoff)
@@ -0,0 +1,159 @@
+"""
+On-demand profiling of a live worker process.
+
+Both profiles are returned in the collapsed ("folded") stack format, one
+``frame;frame;frame weight`` line per distinct stack, which flamegraph.pl,
+inferno and speedscope load directly.
+
+- CPU: a background thread samples the stacks of all other threads with
+  ``sys._current_frames()`` at a fixed interval (100 Hz by default). Nothing
+  is instrumented, so the cost is one stack walk per thread per sample.
+- Memory: ``tracemalloc`` records allocations for a time window; the
+  weight of each stack is the number of bytes still allocated at the end.
+
+Only one profile runs at a time per process.
+"""
+
+from collections import Counter
+from typing import Dict, Tuple
+import os
+import sys
+import sysconfig
+import threading
+import time
+import tracemalloc
+
+# Leaf frames of threads that are only waiting (idle pool workers, the
+# event loop in select()); left out unless idle stacks are requested
+IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+}
+
+STDLIB_PATH = sysconfig.get_paths()["stdlib"]
+
+_profile_lock = threading.Lock()
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when another profile is already running in this process."""
+
+
+def _short_path(filename: str) -> str:
+    """Shorten a source path relative to site-packages, the stdlib or the cwd."""
+    _, marker, tail = filename.rpartition("site-packages" + os.sep)
+    if marker:
+        return tail
+    for base in (STDLIB_PATH, os.getcwd()):
+        if filename.startswith(base + os.sep):
+            return os.path.relpath(filename, base)
+    return filename
+
+
+def _frame_label(filename: str, name: str, lineno: int) -> str:
+    return f"{name} ({_short_path(filename)}:{lineno})"
+
+
+def _folded(stacks: Counter) -> str:
+    return "".join(f"{stack} {weight}\n" for stack, weight in stacks.most_common())
+
+
+def profile_cpu(seconds: float, interval: float = 0.01,
+                include_idle: bool = False) -> Tuple[str, Dict[str, int]]:
+    """
+    Sample the stacks of all threads for a number of seconds.
+    
+    Blocks the calling thread for ``seconds``; run it in a worker thread.
+    
+    Args:
+        seconds (float): Sampling duration
+        interval (float): Seconds between samples
+        include_idle (bool): Keep stacks of threads that are only waiting
+        
+    Returns:
+        Tuple[str, Dict[str, int]]: Collapsed stacks weighted by sample
+        count, and counters (``samples``, ``stacks``)
+        
+    Raises:
+        ProfilerBusyError: If another profile is running
+    """
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusyError("A profile is already running in this worker")
+    
+    try:
+        own_thread = threading.get_ident()
+        thread_names = {}
+        stacks = Counter()
+        samples = 0
+        deadline = time.monotonic() + seconds
+        
+        while time.monotonic() < deadline:
+            started = time.monotonic()
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread:
+                    continue
+                code = frame.f_code
+                if not include_idle and (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES:
+                    continue
+                
+                labels = []
+                while frame is not None:
+                    code = frame.f_code
+                    labels.append(_frame_label(code.co_filename, code.co_name, code.co_firstlineno))
+                    frame = frame.f_back
+                
+                if thread_id not in thread_names:
+                    thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+                labels.append(thread_names.get(thread_id, f"thread-{thread_id}"))
+                stacks[";".join(reversed(labels))] += 1
+            samples += 1
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
+        
+        return _folded(stacks), {"samples": samples, "stacks": len(stacks)}
+    finally:
+        _profile_lock.release()
+
+
+def profile_memory(seconds: float, frames: int = 25) -> Tuple[str, Dict[str, int]]:
+    """
+    Record allocations with tracemalloc for a number of seconds.
+    
+    If tracemalloc is already running (e.g. ``PYTHONTRACEMALLOC``), its
+    snapshot is taken without waiting and it is left running.
+    
+    Args:
+        seconds (float): Recording duration
+        frames (int): Stack depth stored per allocation
+        
+    Returns:
+        Tuple[str, Dict[str, int]]: Collapsed stacks weighted by bytes
+        still allocated, and counters (``total_bytes``, ``stacks``)
+        
+    Raises:
+        ProfilerBusyError: If another profile is running
+    """
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusyError("A profile is already running in this worker")
+    
+    started_here = not tracemalloc.is_tracing()
+    try:
+        if started_here:
+            tracemalloc.start(frames)
+            time.sleep(seconds)
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ])
+    finally:
+        if started_here:
+            tracemalloc.stop()
+        _profile_lock.release()
+    
+    stacks = Counter()
+    for statistic in snapshot.statistics("traceback"):
+        # tracemalloc keeps file and line only, no function names
+        stack = ";".join(f"{_short_path(frame.filename)}:{frame.lineno}" for frame in statistic.traceback)
+        stacks[stack] += statistic.size
+    return _folded(stacks), {"total_bytes": sum(stacks.values()), "stacks": len(stacks)}
@@ -0,0 +1,238 @@
+"""
+Token bucket stores for rate limiting.
+
+``MemoryTokenBucketStore`` keeps buckets per process. ``RedisTokenBucketStore``
+shares them between workers using an atomic Lua script; like ``RedisCache``
+it takes an optional client so a local stand-in can be injected in tests.
+
+A take covers several buckets at once (e.g. a user's and their IP's) and
+charges either all of them or none.
+"""
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import List, Sequence, Tuple
+import logging
+import time
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# (key, capacity, refill rate in tokens per second) of one bucket
+Bucket = Tuple[str, int, float]
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """
+    Rate limit of one route group.
+    
+    Attributes:
+        prefix (str): Path prefix the rule applies to
+        capacity (int): Bucket size (maximum burst)
+        period (float): Seconds to refill a full bucket
+    """
+    prefix: str
+    capacity: int
+    period: float
+    
+    @property
+    def refill_rate(self) -> float:
+        """Tokens added per second."""
+        return self.capacity / self.period
+
+
+def parse_rate_limits(spec: str) -> List[RateLimitRule]:
+    """
+    Parse rules such as ``"/api/calculator=30/10,/api/auth=10/60"``.
+    
+    Each entry allows ``capacity`` requests per ``period`` seconds under a
+    path prefix. Longer prefixes are matched first.
+    
+    Args:
+        spec (str): Comma-separated rules
+        
+    Returns:
+        List[RateLimitRule]: Rules, most specific first
+        
+    Raises:
+        ValueError: If a rule is malformed
+    """
+    rules = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        try:
+            prefix, limit = item.split("=", 1)
+            capacity, period = limit.split("/", 1)
+            rule = RateLimitRule(prefix.strip(), int(capacity), float(period))
+        except ValueError:
+            raise ValueError(f"Invalid rate limit rule: {item!r} (expected prefix=count/seconds)")
+        if rule.capacity <= 0 or rule.period <= 0:
+            raise ValueError(f"Invalid rate limit rule: {item!r} (count and seconds must be positive)")
+        rules.append(rule)
+    return sorted(rules, key=lambda rule: len(rule.prefix), reverse=True)
+
+
+class TokenBucketStore(ABC):
+    """
+    Interface for token bucket stores.
+    
+    Methods:
+        take: Take tokens from one or more buckets, all or none
+    """
+    
+    @abstractmethod
+    def take(self, buckets: Sequence[Bucket], cost: float = 1.0) -> Tuple[bool, float]:
+        """
+        Take ``cost`` tokens from every bucket, creating missing ones full.
+        
+        Tokens are taken only when every bucket has enough; otherwise none
+        is charged.
+        
+        Args:
+            buckets (Sequence[Bucket]): (key, capacity, refill rate) of
+                each bucket
+            cost (float): Tokens to take from each bucket
+            
+        Returns:
+            Tuple[bool, float]: Whether the tokens were taken, and the
+                seconds until every bucket would have them if not
+        """
+
+
+class MemoryTokenBucketStore(TokenBucketStore):
+    """
+    In-process token buckets, bounded by LRU eviction.
+    
+    An evicted bucket comes back full, which only ever errs on the side
+    of allowing a request.
+    
+    Attributes:
+        max_size (int): Maximum number of buckets
+    """
+    
+    def __init__(self, max_size: int = 100000):
+        """
+        Initialize MemoryTokenBucketStore.
+        
+        Args:
+            max_size (int): Maximum number of buckets
+        """
+        self.max_size = max_size
+        self._buckets = OrderedDict()
+        self._lock = Lock()
+    
+    def take(self, buckets: Sequence[Bucket], cost: float = 1.0) -> Tuple[bool, float]:
+        now = time.monotonic()
+        with self._lock:
+            levels = []
+            retry_after = 0.0
+            for key, capacity, refill_rate in buckets:
+                tokens, updated_at = self._buckets.get(key, (capacity, now))
+                tokens = min(capacity, tokens + (now - updated_at) * refill_rate)
+                levels.append(tokens)
+                if tokens < cost:
+                    retry_after = max(retry_after, (cost - tokens) / refill_rate)
+            
+            allowed = retry_after == 0.0
+            for (key, _, _), tokens in zip(buckets, levels):
+                self._buckets[key] = (tokens - cost if allowed else tokens, now)
+                self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_size:
+                self._buckets.popitem(last=False)
+        
+        return allowed, retry_after
+
+
+# KEYS = buckets; ARGV = now (seconds), cost, then capacity and refill rate per bucket
+TOKEN_BUCKET_SCRIPT = """
+local now = tonumber(ARGV[1])
+local cost = tonumber(ARGV[2])
+local levels = {}
+local retry_after = 0
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[1 + 2 * i])
+    local rate = tonumber(ARGV[2 + 2 * i])
+    local state = redis.call('HMGET', key, 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+    levels[i] = tokens
+    if tokens < cost then
+        retry_after = math.max(retry_after, (cost - tokens) / rate)
+    end
+end
+local allowed = 0
+if retry_after == 0 then
+    allowed = 1
+end
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[1 + 2 * i])
+    local rate = tonumber(ARGV[2 + 2 * i])
+    local tokens = levels[i]
+    if allowed == 1 then
+        tokens = tokens - cost
+    end
+    redis.call('HSET', key, 'tokens', tostring(tokens), 'ts', tostring(now))
+    redis.call('PEXPIRE', key, math.ceil(capacity / rate * 1000))
+end
+return {allowed, tostring(retry_after)}
+"""
+
+
+class RedisTokenBucketStore(TokenBucketStore):
+    """
+    Token buckets shared between workers, stored in Redis.
+    
+    Each take is one atomic Lua script call covering all its buckets. Errors from Redis are logged
+    and the request is allowed, so an unavailable store never blocks
+    traffic.
+    """
+    
+    def __init__(self, url: str = "", client=None, prefix: str = "mathhub:ratelimit:"):
+        """
+        Initialize RedisTokenBucketStore.
+        
+        Args:
+            url (str): Redis URL, used when no client is given
+            client: Redis-compatible client (e.g. a fakeredis stand-in)
+            prefix (str): Key prefix
+        """
+        if client is None:
+            import redis
+            
+            client = redis.Redis.from_url(url)
+        
+        self.client = client
+        self.prefix = prefix
+    
+    def take(self, buckets: Sequence[Bucket], cost: float = 1.0) -> Tuple[bool, float]:
+        keys = [self.prefix + key for key, _, _ in buckets]
+        limits = [value for _, capacity, refill_rate in buckets for value in (capacity, refill_rate)]
+        try:
+            allowed, retry_after = self.client.eval(
+                TOKEN_BUCKET_SCRIPT, len(keys), *keys, time.time(), cost, *limits
+            )
+        except Exception as e:
+            logger.warning("Rate limit check failed for %s: %s", ", ".join(keys), e,
+                           extra={"event": "rate_limit.error"})
+            return True, 0.0
+        return bool(int(allowed)), float(retry_after)
+
+
+def create_token_bucket_store() -> TokenBucketStore:
+    """
+    Create the configured token bucket store.
+    
+    Returns:
+        TokenBucketStore: RedisTokenBucketStore when RATE_LIMIT_URL is set,
+            else MemoryTokenBucketStore
+    """
+    if settings.RATE_LIMIT_URL:
+        return RedisTokenBucketStore(settings.RATE_LIMIT_URL)
+    return MemoryTokenBucketStore()
@@ -2,29 +2,75 @@
 Repository layer for calculation history database operations.
 """
 
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from typing import Optional, List
+from sqlalchemy import Integer, and_, desc, func, insert, literal, or_, text, tuple_
+from typing import Optional, List, Iterator, Union
 from datetime import datetime
 import logging
+import re
 
+from app.config import settings
 from app.models.calculation import CalculationHistory
-from app.schemas.history import HistoryFilter
+from app.models.history_version import HistoryVersion
+from app.migrations import HISTORY_FTS_TABLE, has_search_index
+from app.schemas.history import HistoryFilter, HistoryExportFilter, HistoryAggregateFilter, TimeBucket
 from app.schemas.calculator import OperationType
+from app.tracing import traced_methods
 
 logger = logging.getLogger(__name__)
 
+# Search terms are runs of letters/digits; at most this many are used
+SEARCH_TERM_PATTERN = re.compile(r"\w+", re.UNICODE)
+MAX_SEARCH_TERMS = 8
 
+# Columns read by list endpoints and exports. They are selected as plain row
+# tuples (attribute access by column name): no ORM entities are built and
+# nothing is added to the session's identity map.
+HISTORY_COLUMNS = (
+    CalculationHistory.id,
+    CalculationHistory.operation_type,
+    CalculationHistory.expression,
+    CalculationHistory.result,
+    CalculationHistory.result_value,
+    CalculationHistory.result_unit,
+    CalculationHistory.inputs,
+    CalculationHistory.created_at,
+)
+
+
+def search_terms(search: str) -> List[str]:
+    """
+    Split a search string into index terms.
+    
+    Args:
+        search (str): User search text, e.g. "P=10000"
+        
+    Returns:
+        List[str]: Lower-cased terms, e.g. ["p", "10000"]
+    """
+    return SEARCH_TERM_PATTERN.findall(search.lower())[:MAX_SEARCH_TERMS]
+
+
+@traced_methods("repository")
 class HistoryRepository:
     """
     Repository class for calculation history database operations.
     
+    Read-only lookups are routed to a read replica when one is configured;
+    writes (including the refresh after create) stay on the primary.
+    
     Methods:
         create_history: Create new history record
+        bulk_create_history: Insert many records in one transaction
         get_history_by_id: Get history record by ID
         get_user_history: Get user's calculation history
+        iter_user_history: Stream user's history in batches
         delete_history: Delete history record(s)
         get_user_history_count: Count user's history records
+        aggregate_user_history: Aggregate user's history per time bucket
+        get_history_version: Get user's history version counter
     """
     
     def __init__(self, db: Session):
@@ -37,7 +83,10 @@ class HistoryRepository:
         self.db = db
     
     def create_history(self, user_id: int, operation_type: OperationType, 
-                      expression: str, result: str) -> CalculationHistory:
+                      expression: str, result: str,
+                      result_value: Optional[float] = None,
+                      result_unit: Optional[str] = None,
+                      inputs: Optional[dict] = None) -> CalculationHistory:
         """
         Create a new calculation history record.
         
@@ -46,6 +95,9 @@ class HistoryRepository:
             operation_type (OperationType): Type of operation
             expression (str): Mathematical expression
             result (str): Calculation result
+            result_value (Optional[float]): Numeric result value
+            result_unit (Optional[str]): Result unit
+            inputs (Optional[dict]): Structured calculation inputs
             
         Returns:
             CalculationHistory: Created history record
@@ -55,18 +107,56 @@ class HistoryRepository:
                 user_id=user_id,
                 operation_type=operation_type,
                 expression=expression,
-                result=result
+                result=result,
+                result_value=result_value,
+                result_unit=result_unit,
+                inputs=inputs
             )
             self.db.add(history)
+            self._bump_history_version(user_id)
             self.db.commit()
             self.db.refresh(history)
-            logger.debug(f"History created for user {user_id}: {operation_type}")
+            logger.debug("History created for user %s: %s", user_id, operation_type,
+                         extra={"event": "history.created"})
             return history
         except Exception as e:
             self.db.rollback()
             logger.error(f"Error creating history for user {user_id}: {str(e)}")
             raise
     
+    def bulk_create_history(self, user_id: int, rows: List[dict]) -> int:
+        """
+        Insert many history records in a single transaction.
+        
+        Uses a bulk INSERT (batched into multi-row VALUES by SQLAlchemy)
+        without creating ORM objects.
+        
+        Args:
+            user_id (int): User ID
+            rows (List[dict]): Values with operation_type, expression,
+                result, result_value, result_unit, inputs and created_at
+                
+        Returns:
+            int: Number of records inserted
+        """
+        if not rows:
+            return 0
+        
+        try:
+            self.db.execute(
+                insert(CalculationHistory),
+                [{**row, "user_id": user_id} for row in rows]
+            )
+            self._bump_history_version(user_id)
+            self.db.commit()
+            logger.debug("Bulk inserted %d history records for user %s", len(rows), user_id,
+                         extra={"event": "history.bulk_created"})
+            return len(rows)
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error bulk inserting history for user {user_id}: {str(e)}")
+            raise
+    
     def get_history_by_id(self, history_id: int) -> Optional[CalculationHistory]:
         """
         Get history record by ID.
@@ -77,11 +167,12 @@ class HistoryRepository:
         Returns:
             Optional[CalculationHistory]: History record or None
         """
-        return self.db.query(CalculationHistory).filter(
-            CalculationHistory.id == history_id
-        ).first()
+        with self.db.use_replica():
+            return self.db.query(CalculationHistory).filter(
+                CalculationHistory.id == history_id
+            ).first()
     
-    def get_user_history(self, user_id: int, filters: HistoryFilter) -> List[CalculationHistory]:
+    def get_user_history(self, user_id: int, filters: HistoryFilter) -> List[Row]:
         """
         Get user's calculation history with optional filters.
         
@@ -90,13 +181,83 @@ class HistoryRepository:
             filters (HistoryFilter): Filter criteria
             
         Returns:
-            List[CalculationHistory]: List of history records
+            List[Row]: History rows of HISTORY_COLUMNS (not ORM entities)
+        """
+        query = self._filtered_query(user_id, filters).with_entities(*HISTORY_COLUMNS)
+        
+        # Order by latest first and apply limit
+        query = query.order_by(desc(CalculationHistory.created_at))
+        
+        if filters.limit:
+            query = query.limit(filters.limit)
+        
+        with self.db.use_replica():
+            return query.all()
+    
+    def iter_user_history(self, user_id: int, filters: HistoryExportFilter,
+                          batch_size: int = 1000) -> Iterator[List[Row]]:
+        """
+        Stream user's calculation history in batches, newest first.
+        
+        Uses keyset pagination on (created_at, id), so each batch is a range
+        scan of the user's created_at index regardless of how deep into the
+        history it is. Rows are projected (HISTORY_COLUMNS), so the session
+        keeps nothing between batches and memory stays flat.
+        
+        Args:
+            user_id (int): User ID
+            filters (HistoryExportFilter): Filter criteria
+            batch_size (int): Rows per batch
+            
+        Yields:
+            List[Row]: Next batch of history rows
+        """
+        remaining = filters.limit
+        last_key = None
+        position = tuple_(CalculationHistory.created_at, CalculationHistory.id)
+        
+        with self.db.use_replica():
+            while remaining is None or remaining > 0:
+                query = self._filtered_query(user_id, filters).with_entities(*HISTORY_COLUMNS)
+                if last_key is not None:
+                    last_created, last_id = last_key
+                    query = query.filter(position < tuple_(
+                        literal(last_created, CalculationHistory.created_at.type), last_id
+                    ))
+                
+                size = batch_size if remaining is None else min(batch_size, remaining)
+                batch = query.order_by(
+                    desc(CalculationHistory.created_at), desc(CalculationHistory.id)
+                ).limit(size).all()
+                if not batch:
+                    break
+                
+                yield batch
+                
+                last_key = (batch[-1].created_at, batch[-1].id)
+                if remaining is not None:
+                    remaining -= len(batch)
+                
+                if len(batch) < size:
+                    break
+    
+    def _filtered_query(self, user_id: int,
+                        filters: Union[HistoryFilter, HistoryExportFilter, HistoryAggregateFilter]):
+        """
+        Build a query for a user's history with operation type/date/value filters.
+        
+        Args:
+            user_id (int): User ID
+            filters (Union[HistoryFilter, HistoryExportFilter, HistoryAggregateFilter]):
+                Filter criteria
+            
+        Returns:
+            Query: Filtered query (unordered, unlimited)
         """
         query = self.db.query(CalculationHistory).filter(
             CalculationHistory.user_id == user_id
         )
         
-        # Apply filters
         if filters.operation_type:
             query = query.filter(
                 CalculationHistory.operation_type == filters.operation_type
@@ -112,13 +273,73 @@ class HistoryRepository:
                 CalculationHistory.created_at <= filters.end_date
             )
         
-        # Order by latest first and apply limit
-        query = query.order_by(desc(CalculationHistory.created_at))
+        if filters.min_result is not None:
+            query = query.filter(
+                CalculationHistory.result_value >= filters.min_result
+            )
         
-        if filters.limit:
-            query = query.limit(filters.limit)
+        if filters.max_result is not None:
+            query = query.filter(
+                CalculationHistory.result_value <= filters.max_result
+            )
         
-        return query.all()
+        if filters.search:
+            query = query.filter(self._search_condition(filters.search))
+        
+        return query
+    
+    def _search_condition(self, search: str):
+        """
+        Build a full-text search condition: every term must match as a
+        prefix of a word in the expression or result.
+        
+        Uses the FTS5 table on SQLite and the FULLTEXT index on MySQL, and
+        LIKE where the index is missing (partitioned MySQL tables, SQLite
+        without FTS5). On MySQL, terms shorter than SEARCH_MIN_TOKEN_SIZE
+        are not indexed and also use LIKE.
+        
+        Args:
+            search (str): User search text
+            
+        Returns:
+            ColumnElement: Filter condition
+        """
+        terms = search_terms(search)
+        if not terms:
+            # Nothing searchable (only punctuation); match nothing
+            return CalculationHistory.id.is_(None)
+        
+        bind = self.db.get_bind()
+        dialect = bind.dialect.name
+        indexed = has_search_index(bind)
+        
+        if dialect == "sqlite" and indexed:
+            match = " ".join(f'"{term}"*' for term in terms)
+            matching_ids = text(
+                f"SELECT rowid FROM {HISTORY_FTS_TABLE} WHERE {HISTORY_FTS_TABLE} MATCH :history_search"
+            ).bindparams(history_search=match).columns(rowid=Integer)
+            return CalculationHistory.id.in_(matching_ids)
+        
+        like_terms = terms
+        conditions = []
+        if dialect in ("mysql", "mariadb") and indexed:
+            like_terms = [term for term in terms if len(term) < settings.SEARCH_MIN_TOKEN_SIZE]
+            full_text_terms = [term for term in terms if len(term) >= settings.SEARCH_MIN_TOKEN_SIZE]
+            if full_text_terms:
+                conditions.append(text(
+                    "MATCH (calculation_history.expression, calculation_history.result) "
+                    "AGAINST (:history_search IN BOOLEAN MODE)"
+                ).bindparams(history_search=" ".join(f"+{term}*" for term in full_text_terms)))
+        
+        # Terms the full-text index cannot match
+        conditions.extend(
+            or_(
+                CalculationHistory.expression.ilike(f"%{term}%"),
+                CalculationHistory.result.ilike(f"%{term}%")
+            )
+            for term in like_terms
+        )
+        return and_(*conditions)
     
     def delete_history(self, history_id: int, user_id: Optional[int] = None) -> bool:
         """
@@ -145,8 +366,9 @@ class HistoryRepository:
                 return False
             
             self.db.delete(history)
+            self._bump_history_version(history.user_id)
             self.db.commit()
-            logger.info(f"History deleted: {history_id}")
+            logger.info("History deleted: %s", history_id, extra={"event": "history.deleted"})
             return True
         except Exception as e:
             self.db.rollback()
@@ -174,9 +396,12 @@ class HistoryRepository:
             
             count = query.count()
             query.delete(synchronize_session=False)
+            if count:
+                self._bump_history_version(user_id)
             self.db.commit()
             
-            logger.info(f"Deleted {count} history records for user {user_id}")
+            logger.info("Deleted %d history records for user %s", count, user_id,
+                        extra={"event": "history.cleared"})
             return count
         except Exception as e:
             self.db.rollback()
@@ -193,6 +418,134 @@ class HistoryRepository:
         Returns:
             int: Number of history records
         """
-        return self.db.query(CalculationHistory).filter(
-            CalculationHistory.user_id == user_id
-        ).count()
\ No newline at end of file
+        with self.db.use_replica():
+            return self.db.query(CalculationHistory).filter(
+                CalculationHistory.user_id == user_id
+            ).count()
+    
+    def aggregate_user_history(self, user_id: int, filters: HistoryAggregateFilter) -> List:
+        """
+        Aggregate user's history per time bucket and operation type in SQL.
+        
+        Args:
+            user_id (int): User ID
+            filters (HistoryAggregateFilter): Bucket size and filter criteria
+            
+        Returns:
+            List: Rows of (bucket_start, operation_type, count, numeric_count,
+                sum, avg, min, max), oldest bucket first. bucket_start is
+                returned as the database produces it (string, date or datetime).
+        """
+        bucket_start = self._bucket_expression(filters.bucket).label("bucket_start")
+        value = CalculationHistory.result_value
+        
+        query = self._filtered_query(user_id, filters).with_entities(
+            bucket_start,
+            CalculationHistory.operation_type,
+            func.count(CalculationHistory.id),
+            func.count(value),
+            func.sum(value),
+            func.avg(value),
+            func.min(value),
+            func.max(value)
+        ).group_by(
+            bucket_start, CalculationHistory.operation_type
+        ).order_by(
+            bucket_start, CalculationHistory.operation_type
+        )
+        
+        with self.db.use_replica():
+            return query.all()
+    
+    def _bucket_expression(self, bucket: TimeBucket):
+        """
+        Build the SQL expression truncating created_at to a bucket start.
+        
+        Args:
+            bucket (TimeBucket): Bucket size (weeks start on Monday)
+            
+        Returns:
+            ColumnElement: Bucket start expression for the current dialect
+            
+        Raises:
+            ValueError: If the database dialect is not supported
+        """
+        created_at = CalculationHistory.created_at
+        dialect = self.db.get_bind().dialect.name
+        
+        if dialect == "sqlite":
+            if bucket == TimeBucket.HOUR:
+                return func.strftime("%Y-%m-%d %H:00:00", created_at)
+            if bucket == TimeBucket.DAY:
+                return func.strftime("%Y-%m-%d 00:00:00", created_at)
+            return func.strftime("%Y-%m-%d 00:00:00", created_at, "weekday 0", "-6 days")
+        
+        if dialect in ("mysql", "mariadb"):
+            if bucket == TimeBucket.HOUR:
+                return func.date_format(created_at, "%Y-%m-%d %H:00:00")
+            if bucket == TimeBucket.DAY:
+                return func.date(created_at)
+            return func.subdate(func.date(created_at), func.weekday(created_at))
+        
+        if dialect == "postgresql":
+            return func.date_trunc(bucket.value, created_at)
+        
+        raise ValueError(f"History aggregation is not supported on {dialect}")
+    
+    def get_history_version(self, user_id: int) -> Optional[HistoryVersion]:
+        """
+        Get the version counter of a user's history.
+        
+        Read from the same replica as the history itself (a session keeps
+        the replica it picked first) and before it, so a lagging replica
+        yields an older validator rather than tagging stale data with a
+        newer one.
+        
+        Args:
+            user_id (int): User ID
+            
+        Returns:
+            Optional[HistoryVersion]: Version record or None if never written
+        """
+        with self.db.use_replica():
+            return self.db.get(HistoryVersion, user_id)
+    
+    def _bump_history_version(self, user_id: int) -> None:
+        """
+        Increment the user's history version in the current transaction.
+        
+        Args:
+            user_id (int): User ID
+        """
+        now = datetime.utcnow()
+        dialect = self.db.get_bind().dialect.name
+        
+        # A single upsert: an UPDATE followed by an INSERT would race on a
+        # user's first write, and the losing transaction would roll back
+        # the history rows with it
+        if dialect in ("sqlite", "postgresql"):
+            insert_version = (sqlite.insert if dialect == "sqlite" else postgresql.insert)(HistoryVersion)
+            self.db.execute(
+                insert_version.values(user_id=user_id, version=1, updated_at=now).on_conflict_do_update(
+                    index_elements=[HistoryVersion.user_id],
+                    set_={"version": HistoryVersion.version + 1, "updated_at": now}
+                )
+            )
+            return
+        
+        if dialect in ("mysql", "mariadb"):
+            self.db.execute(
+                mysql.insert(HistoryVersion).values(user_id=user_id, version=1, updated_at=now)
+                .on_duplicate_key_update(version=HistoryVersion.version + 1, updated_at=now)
+            )
+            return
+        
+        updated = self.db.query(HistoryVersion).filter(
+            HistoryVersion.user_id == user_id
+        ).update(
+            {HistoryVersion.version: HistoryVersion.version + 1, HistoryVersion.updated_at: now},
+            synchronize_session=False
+        )
+        
+        if not updated:
+            self.db.add(HistoryVersion(user_id=user_id, version=1, updated_at=now))
\ No newline at end of file
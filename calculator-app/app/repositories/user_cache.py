@@ -0,0 +1,131 @@
+"""
+Cache of user profiles for UserRepository lookups.
+"""
+
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Optional
+
+from app.cache import CacheBackend, create_cache_backend
+from app.config import settings
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    """
+    User profile as stored in the cache.
+    
+    Deliberately has no password hash: anything that needs the hash
+    (login) must load the user from the database.
+    
+    Attributes:
+        id (int): User ID
+        username (str): Username
+        email (str): Email address
+        created_at (Optional[datetime]): Account creation timestamp
+    """
+    id: int
+    username: str
+    email: str
+    created_at: Optional[datetime]
+    
+    @classmethod
+    def from_user(cls, user) -> "CachedUser":
+        return cls(
+            id=user.id,
+            username=user.username,
+            email=user.email,
+            created_at=user.created_at
+        )
+    
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["created_at"] = self.created_at.isoformat() if self.created_at else None
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "CachedUser":
+        created_at = data.get("created_at")
+        return cls(
+            id=data["id"],
+            username=data["username"],
+            email=data["email"],
+            created_at=datetime.fromisoformat(created_at) if created_at else None
+        )
+
+
+class UserCache:
+    """
+    Profile cache keyed by user ID, username and email.
+    
+    Methods:
+        get_by_id: Get cached profile by ID
+        get_by_username: Get cached profile by username
+        get_by_email: Get cached profile by email
+        store: Cache a user's profile under all keys
+        invalidate: Drop all keys of a user
+    """
+    
+    def __init__(self, backend: CacheBackend, ttl: float):
+        """
+        Initialize UserCache.
+        
+        Args:
+            backend (CacheBackend): Storage backend
+            ttl (float): Entry lifetime in seconds
+        """
+        self.backend = backend
+        self.ttl = ttl
+    
+    @staticmethod
+    def _keys(user_id: int, username: str, email: str):
+        return (
+            f"user:id:{user_id}",
+            f"user:username:{username}",
+            f"user:email:{email}",
+        )
+    
+    def _get(self, key: str) -> Optional[CachedUser]:
+        data = self.backend.get(key)
+        return CachedUser.from_dict(data) if data is not None else None
+    
+    def get_by_id(self, user_id: int) -> Optional[CachedUser]:
+        return self._get(f"user:id:{user_id}")
+    
+    def get_by_username(self, username: str) -> Optional[CachedUser]:
+        return self._get(f"user:username:{username}")
+    
+    def get_by_email(self, email: str) -> Optional[CachedUser]:
+        return self._get(f"user:email:{email}")
+    
+    def store(self, user) -> CachedUser:
+        """
+        Cache a user's profile.
+        
+        Args:
+            user: User model or CachedUser
+            
+        Returns:
+            CachedUser: Cached profile
+        """
+        profile = user if isinstance(user, CachedUser) else CachedUser.from_user(user)
+        data = profile.to_dict()
+        for key in self._keys(profile.id, profile.username, profile.email):
+            self.backend.set(key, data, self.ttl)
+        return profile
+    
+    def invalidate(self, user) -> None:
+        """
+        Drop every cache key of a user.
+        
+        Args:
+            user: User model or CachedUser (with its current username/email)
+        """
+        self.backend.delete(*self._keys(user.id, user.username, user.email))
+
+
+# Process-wide user cache
+user_cache = UserCache(
+    create_cache_backend(max_size=settings.USER_CACHE_MAX_SIZE),
+    ttl=settings.USER_CACHE_TTL
+)
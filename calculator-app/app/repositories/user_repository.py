@@ -9,33 +9,47 @@ import logging
 
 from app.models.user import User
 from app.schemas.user import UserCreate
+from app.repositories.user_cache import CachedUser, UserCache, user_cache
+from app.tracing import traced_methods
 
 logger = logging.getLogger(__name__)
 
 
+@traced_methods("repository")
 class UserRepository:
     """
     Repository class for user-related database operations.
     
+    Lookups used by login/registration stay on the primary so a freshly
+    created account is always visible; only get_all_users reads from a replica.
+    
+    The get_profile_* methods serve password-free profiles from the user
+    cache; use the get_user_by_* methods when the password hash is needed.
+    
     Methods:
         create_user: Create new user
         get_user_by_id: Get user by ID
         get_user_by_username: Get user by username
         get_user_by_email: Get user by email
+        get_profile_by_id: Get cached user profile by ID
+        get_profile_by_username: Get cached user profile by username
+        get_profile_by_email: Get cached user profile by email
         authenticate_user: Authenticate user credentials
         update_user: Update user information
         delete_user: Delete user
         get_all_users: Get all users (admin only)
     """
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, cache: Optional[UserCache] = None):
         """
         Initialize UserRepository.
         
         Args:
             db (Session): Database session
+            cache (Optional[UserCache]): User cache (defaults to the shared one)
         """
         self.db = db
+        self.cache = cache if cache is not None else user_cache
     
     def create_user(self, user_data: UserCreate, hashed_password: str) -> Optional[User]:
         """
@@ -60,7 +74,7 @@ class UserRepository:
             self.db.add(db_user)
             self.db.commit()
             self.db.refresh(db_user)
-            logger.info(f"User created: {user_data.username}")
+            logger.info("User created: %s", user_data.username, extra={"event": "user.created"})
             return db_user
         except IntegrityError as e:
             self.db.rollback()
@@ -107,6 +121,54 @@ class UserRepository:
         """
         return self.db.query(User).filter(User.email == email).first()
     
+    def get_profile_by_id(self, user_id: int) -> Optional[CachedUser]:
+        """
+        Get user profile by ID, served from cache when possible.
+        
+        Args:
+            user_id (int): User ID
+            
+        Returns:
+            Optional[CachedUser]: User profile (without password hash) or None
+        """
+        profile = self.cache.get_by_id(user_id)
+        if profile is None:
+            user = self.get_user_by_id(user_id)
+            profile = self.cache.store(user) if user else None
+        return profile
+    
+    def get_profile_by_username(self, username: str) -> Optional[CachedUser]:
+        """
+        Get user profile by username, served from cache when possible.
+        
+        Args:
+            username (str): Username
+            
+        Returns:
+            Optional[CachedUser]: User profile (without password hash) or None
+        """
+        profile = self.cache.get_by_username(username)
+        if profile is None:
+            user = self.get_user_by_username(username)
+            profile = self.cache.store(user) if user else None
+        return profile
+    
+    def get_profile_by_email(self, email: str) -> Optional[CachedUser]:
+        """
+        Get user profile by email, served from cache when possible.
+        
+        Args:
+            email (str): Email address
+            
+        Returns:
+            Optional[CachedUser]: User profile (without password hash) or None
+        """
+        profile = self.cache.get_by_email(email)
+        if profile is None:
+            user = self.get_user_by_email(email)
+            profile = self.cache.store(user) if user else None
+        return profile
+    
     def authenticate_user(self, username: Optional[str] = None, 
                          email: Optional[str] = None, 
                          password_hash: str = None) -> Optional[User]:
@@ -149,13 +211,17 @@ class UserRepository:
             if not user:
                 return None
             
+            # Drop keys for the old username/email before they change
+            self.cache.invalidate(user)
+            
             for key, value in update_data.items():
                 if hasattr(user, key):
                     setattr(user, key, value)
             
             self.db.commit()
             self.db.refresh(user)
-            logger.info(f"User updated: {user_id}")
+            self.cache.invalidate(user)
+            logger.info("User updated: %s", user_id, extra={"event": "user.updated"})
             return user
         except Exception as e:
             self.db.rollback()
@@ -177,9 +243,11 @@ class UserRepository:
             if not user:
                 return False
             
+            profile = CachedUser.from_user(user)
             self.db.delete(user)
             self.db.commit()
-            logger.info(f"User deleted: {user_id}")
+            self.cache.invalidate(profile)
+            logger.info("User deleted: %s", user_id, extra={"event": "user.deleted"})
             return True
         except Exception as e:
             self.db.rollback()
@@ -197,4 +265,5 @@ class UserRepository:
         Returns:
             List[User]: List of users
         """
-        return self.db.query(User).offset(skip).limit(limit).all()
\ No newline at end of file
+        with self.db.use_replica():
+            return self.db.query(User).offset(skip).limit(limit).all()
\ No newline at end of file
@@ -0,0 +1,17 @@
+"""
+Response classes shared by the API.
+"""
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+if orjson is not None:
+    from fastapi.responses import ORJSONResponse as FastJSONResponse
+else:
+    FastJSONResponse = JSONResponse
+
+__all__ = ["FastJSONResponse"]
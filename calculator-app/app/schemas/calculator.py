@@ -2,10 +2,12 @@
 Pydantic schemas for calculator operations.
 """
 
-from pydantic import BaseModel, Field, field_validator
-from typing import Optional, Literal, Union
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import Any, Dict, List, Optional, Literal, Union
 from enum import Enum
 
+from app.config import settings
+
 
 class OperationType(str, Enum):
     """Enum for operation types."""
@@ -23,6 +25,9 @@ class OperationType(str, Enum):
     LN = "ln"
     CONVERSION = "conversion"
     FINANCE = "finance"
+    MATRIX = "matrix"
+    COMPLEX = "complex"
+    STATISTICS = "statistics"
 
 
 class BasicOperation(BaseModel):
@@ -56,10 +61,14 @@ class AdvancedOperation(BaseModel):
         value (float): Input value
         operation (OperationType): Type of operation
         angle_unit (str): Unit for trigonometric functions (radians/degrees)
+        mode (str): "direct" (math library) or "table" (precomputed tables
+            with exact special angles and an error bound; sin, cos and tan
+            in degrees, log and ln only)
     """
     value: float = Field(..., description="Input value")
     operation: OperationType = Field(..., description="Type of operation")
     angle_unit: Optional[str] = Field("radians", description="Angle unit: radians or degrees")
+    mode: Optional[str] = Field("direct", description="Evaluation mode: direct or table")
     
     @field_validator('angle_unit')
     @classmethod
@@ -69,6 +78,14 @@ class AdvancedOperation(BaseModel):
             raise ValueError('Angle unit must be either "radians" or "degrees"')
         return v
     
+    @field_validator('mode')
+    @classmethod
+    def validate_mode(cls, v: str) -> str:
+        """Validate evaluation mode."""
+        if v not in ["direct", "table"]:
+            raise ValueError('Mode must be either "direct" or "table"')
+        return v
+    
     @field_validator('value')
     @classmethod
     def validate_value_for_functions(cls, v: float, info) -> float:
@@ -121,15 +138,184 @@ class FinanceRequest(BaseModel):
     )
 
 
+class MatrixOperation(BaseModel):
+    """
+    Schema for matrix operations given as JSON.
+    
+    Larger operands can be uploaded as .npy files instead
+    (POST /calculator/matrix/npy), which skips JSON float parsing.
+    
+    Attributes:
+        operation (str): multiply (A × B), inverse, determinant, solve
+            (A x = B) or eigenvalues
+        a (List[List[float]]): Matrix A, as rows
+        b (Optional[Union[List[List[float]], List[float]]]): Matrix or
+            vector B for multiply and solve
+    """
+    operation: Literal["multiply", "inverse", "determinant", "solve", "eigenvalues"] = Field(
+        ..., description="Matrix operation"
+    )
+    a: List[List[float]] = Field(..., min_length=1, description="Matrix A as a list of rows")
+    b: Optional[Union[List[List[float]], List[float]]] = Field(
+        None, min_length=1, description="Matrix or vector B (multiply, solve)"
+    )
+    
+    @field_validator('a', 'b')
+    @classmethod
+    def validate_shape(cls, v: Optional[list]) -> Optional[list]:
+        """Validate that a matrix is rectangular and within the size limits."""
+        if v is None or not isinstance(v[0], list):
+            return v
+        columns = len(v[0])
+        if columns == 0 or any(len(row) != columns for row in v):
+            raise ValueError('Matrix rows must be non-empty and of equal length')
+        return v
+    
+    @model_validator(mode='after')
+    def validate_operands(self) -> 'MatrixOperation':
+        """Validate operand presence and the total JSON element count."""
+        if self.operation in ("multiply", "solve") and self.b is None:
+            raise ValueError(f'Operation {self.operation} requires matrix b')
+        elements = sum(len(row) for row in self.a)
+        if self.b is not None:
+            elements += sum(len(row) if isinstance(row, list) else 1 for row in self.b)
+        if elements > settings.MATRIX_MAX_JSON_ELEMENTS:
+            raise ValueError(
+                f'JSON operands are limited to {settings.MATRIX_MAX_JSON_ELEMENTS} numbers; '
+                'upload larger matrices as .npy'
+            )
+        return self
+
+
+class ComplexNumber(BaseModel):
+    """
+    Complex number.
+    
+    Attributes:
+        real (float): Real part
+        imag (float): Imaginary part
+    """
+    real: float = Field(..., description="Real part")
+    imag: float = Field(0.0, description="Imaginary part")
+
+
+class ComplexOperation(BaseModel):
+    """
+    Schema for complex-number arithmetic.
+    
+    Operands are single numbers or lists of numbers, combined element-wise
+    (a single number is combined with every element of a list).
+    
+    Attributes:
+        operation (str): Binary (add, subtract, multiply, divide, power) or
+            unary (modulus, argument, conjugate, sqrt, exp, ln) operation
+        z1 (Union[ComplexNumber, List[ComplexNumber]]): First operand
+        z2 (Optional[Union[ComplexNumber, List[ComplexNumber]]]): Second
+            operand of binary operations
+    """
+    operation: Literal[
+        "add", "subtract", "multiply", "divide", "power",
+        "modulus", "argument", "conjugate", "sqrt", "exp", "ln"
+    ] = Field(..., description="Complex operation")
+    z1: Union[ComplexNumber, List[ComplexNumber]] = Field(..., description="First operand")
+    z2: Optional[Union[ComplexNumber, List[ComplexNumber]]] = Field(None, description="Second operand")
+    
+    @model_validator(mode='after')
+    def validate_operands(self) -> 'ComplexOperation':
+        """Validate operand presence and sizes."""
+        binary = self.operation in ("add", "subtract", "multiply", "divide", "power")
+        if binary and self.z2 is None:
+            raise ValueError(f'Operation {self.operation} requires z2')
+        for operand in (self.z1, self.z2):
+            if isinstance(operand, list) and not 1 <= len(operand) <= settings.MATRIX_MAX_JSON_ELEMENTS:
+                raise ValueError(f'Operands must have 1 to {settings.MATRIX_MAX_JSON_ELEMENTS} values')
+        return self
+
+
+class StatisticsOptions(BaseModel):
+    """
+    Options of a statistics operation (the dataset is sent separately).
+    
+    Attributes:
+        operation (str): summary, mean, median, stdev, variance,
+            percentiles, histogram or regression
+        percentiles (List[float]): Percentiles (0-100) for "percentiles"
+        bins (int): Number of histogram bins
+        histogram_min (Optional[float]): Fixed lower edge of the histogram
+        histogram_max (Optional[float]): Fixed upper edge of the histogram;
+            with a fixed range, counts are exact for any dataset size and
+            values outside the range are not counted
+        population (bool): Population instead of sample stdev/variance
+    """
+    operation: Literal[
+        "summary", "mean", "median", "stdev", "variance", "percentiles", "histogram", "regression"
+    ] = Field(..., description="Statistics operation")
+    percentiles: List[float] = Field([25, 50, 75], min_length=1, max_length=100, description="Percentiles (0-100)")
+    bins: int = Field(10, ge=1, le=1000, description="Histogram bins")
+    histogram_min: Optional[float] = Field(None, description="Histogram lower edge")
+    histogram_max: Optional[float] = Field(None, description="Histogram upper edge")
+    population: bool = Field(False, description="Population (not sample) stdev/variance")
+    
+    @field_validator('percentiles')
+    @classmethod
+    def validate_percentiles(cls, v: List[float]) -> List[float]:
+        """Validate percentile range."""
+        if any(not 0 <= p <= 100 for p in v):
+            raise ValueError('Percentiles must be between 0 and 100')
+        return v
+    
+    @model_validator(mode='after')
+    def validate_histogram_range(self) -> 'StatisticsOptions':
+        """Validate that a histogram range has both edges in order."""
+        if (self.histogram_min is None) != (self.histogram_max is None):
+            raise ValueError('Set both histogram_min and histogram_max, or neither')
+        if self.histogram_min is not None and not self.histogram_min < self.histogram_max:
+            raise ValueError('histogram_min must be less than histogram_max')
+        return self
+
+
+class StatisticsRequest(StatisticsOptions):
+    """
+    Schema for statistics over a dataset sent as a JSON array.
+    
+    Larger datasets can be uploaded as CSV or .npy
+    (POST /calculator/statistics/upload).
+    
+    Attributes:
+        values (List[float]): Dataset (y values for regression)
+        x (Optional[List[float]]): x values for regression; defaults to
+            0, 1, 2...
+    """
+    values: List[float] = Field(..., min_length=1, description="Dataset")
+    x: Optional[List[float]] = Field(None, description="x values (regression)")
+    
+    @model_validator(mode='after')
+    def validate_dataset(self) -> 'StatisticsRequest':
+        """Validate dataset size and x values."""
+        if len(self.values) > settings.STATISTICS_MAX_JSON_VALUES:
+            raise ValueError(
+                f'JSON datasets are limited to {settings.STATISTICS_MAX_JSON_VALUES} values; '
+                'upload larger datasets as CSV or .npy'
+            )
+        if self.x is not None and len(self.x) != len(self.values):
+            raise ValueError('x and values must have the same length')
+        return self
+
+
 class CalculatorResponse(BaseModel):
     """
     Schema for calculator response.
     
     Attributes:
-        result (Union[float, str]): Calculation result
+        result (Union[float, str, List[Any], Dict[str, Any]]): Calculation
+            result (lists for matrices and vectors, {"real", "imag"} for
+            complex numbers)
         expression (str): Mathematical expression
         operation_type (OperationType): Type of operation performed
+        error_bound (Optional[float]): Absolute error bound of a table-mode
+            result
     """
-    result: Union[float, str]
+    result: Union[float, str, List[Any], Dict[str, Any]]
     expression: str
     operation_type: OperationType
+    error_bound: Optional[float] = None
@@ -4,7 +4,8 @@ Pydantic schemas for calculation history.
 
 from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Dict, Any, Literal
+from enum import Enum
 from app.schemas.calculator import OperationType
 
 
@@ -17,12 +18,18 @@ class HistoryResponse(BaseModel):
         operation_type (OperationType): Type of operation
         expression (str): Mathematical expression
         result (str): Calculation result
+        result_value (Optional[float]): Numeric result value
+        result_unit (Optional[str]): Result unit
+        inputs (Optional[Dict[str, Any]]): Structured calculation inputs
         created_at (datetime): Timestamp
     """
     id: int
     operation_type: OperationType
     expression: str
     result: str
+    result_value: Optional[float] = None
+    result_unit: Optional[str] = None
+    inputs: Optional[Dict[str, Any]] = None
     created_at: datetime
     
     class Config:
@@ -37,14 +44,123 @@ class HistoryFilter(BaseModel):
         operation_type (Optional[OperationType]): Filter by operation type
         start_date (Optional[datetime]): Start date for filtering
         end_date (Optional[datetime]): End date for filtering
+        min_result (Optional[float]): Minimum numeric result value
+        max_result (Optional[float]): Maximum numeric result value
+        search (Optional[str]): Full-text search in expression/result
         limit (int): Maximum number of records to return
     """
     operation_type: Optional[OperationType] = None
     start_date: Optional[datetime] = None
     end_date: Optional[datetime] = None
+    min_result: Optional[float] = None
+    max_result: Optional[float] = None
+    search: Optional[str] = Field(None, min_length=1, max_length=200)
     limit: int = Field(100, ge=1, le=1000)
 
 
+class HistoryExportFilter(BaseModel):
+    """
+    Schema for filtering streamed history exports.
+    
+    Same criteria as HistoryFilter, but the limit is optional and unbounded
+    because exports are streamed in batches.
+    
+    Attributes:
+        operation_type (Optional[OperationType]): Filter by operation type
+        start_date (Optional[datetime]): Start date for filtering
+        end_date (Optional[datetime]): End date for filtering
+        min_result (Optional[float]): Minimum numeric result value
+        max_result (Optional[float]): Maximum numeric result value
+        search (Optional[str]): Full-text search in expression/result
+        limit (Optional[int]): Maximum number of records (None = all)
+    """
+    operation_type: Optional[OperationType] = None
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    min_result: Optional[float] = None
+    max_result: Optional[float] = None
+    search: Optional[str] = Field(None, min_length=1, max_length=200)
+    limit: Optional[int] = Field(None, ge=1)
+
+
+class TimeBucket(str, Enum):
+    """Time bucket sizes for history aggregation."""
+    HOUR = "hour"
+    DAY = "day"
+    WEEK = "week"
+
+
+class HistoryAggregateFilter(BaseModel):
+    """
+    Schema for history aggregation queries.
+    
+    Attributes:
+        bucket (TimeBucket): Bucket size (weeks start on Monday)
+        operation_type (Optional[OperationType]): Filter by operation type
+        start_date (Optional[datetime]): Start date for filtering
+        end_date (Optional[datetime]): End date for filtering
+        min_result (Optional[float]): Minimum numeric result value
+        max_result (Optional[float]): Maximum numeric result value
+        search (Optional[str]): Full-text search in expression/result
+    """
+    bucket: TimeBucket = TimeBucket.DAY
+    operation_type: Optional[OperationType] = None
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    min_result: Optional[float] = None
+    max_result: Optional[float] = None
+    search: Optional[str] = Field(None, min_length=1, max_length=200)
+
+
+class HistoryAggregate(BaseModel):
+    """
+    Schema for aggregated history values of one operation type.
+    
+    Attributes:
+        operation_type (OperationType): Type of operation
+        count (int): Number of calculations
+        numeric_count (int): Number of calculations with a numeric result
+        sum (Optional[float]): Sum of numeric results
+        avg (Optional[float]): Average of numeric results
+        min (Optional[float]): Smallest numeric result
+        max (Optional[float]): Largest numeric result
+    """
+    operation_type: OperationType
+    count: int
+    numeric_count: int
+    sum: Optional[float] = None
+    avg: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+
+
+class HistoryBucketAggregate(HistoryAggregate):
+    """
+    Schema for aggregated history values of one operation type in a time bucket.
+    
+    Attributes:
+        bucket_start (datetime): Start of the time bucket (UTC)
+    """
+    bucket_start: datetime
+
+
+class HistoryAggregateResponse(BaseModel):
+    """
+    Schema for history aggregation response.
+    
+    Attributes:
+        bucket (TimeBucket): Bucket size
+        total_calculations (int): Number of calculations in range
+        by_operation (List[HistoryAggregate]): Totals per operation type
+        buckets (List[HistoryBucketAggregate]): Values per bucket and
+            operation type, oldest bucket first
+    """
+    bucket: TimeBucket
+    total_calculations: int
+    by_operation: List[HistoryAggregate]
+    buckets: List[HistoryBucketAggregate]
+
+
 class HistoryDelete(BaseModel):
     """
     Schema for deleting history records.
@@ -64,3 +180,27 @@ class HistoryDelete(BaseModel):
         if v is None and not values.get('delete_all'):
             raise ValueError('Either provide ids or set delete_all to true')
         return v
+
+
+class HistorySyncItem(BaseModel):
+    """
+    Schema for one calculation done on the client.
+    
+    Attributes:
+        kind (str): Calculator endpoint the inputs are for
+        inputs (Dict[str, Any]): Request body that endpoint would take
+        created_at (Optional[datetime]): When the calculation was done
+    """
+    kind: Literal["basic", "advanced", "conversion", "finance"]
+    inputs: Dict[str, Any]
+    created_at: Optional[datetime] = None
+
+
+class HistorySync(BaseModel):
+    """
+    Schema for a batch of client calculations to add to history.
+    
+    Attributes:
+        items (List[HistorySyncItem]): Calculations, oldest first
+    """
+    items: List[HistorySyncItem] = Field(..., min_length=1, max_length=500)
@@ -0,0 +1,156 @@
+"""
+Production server entry point.
+
+Runs the FastAPI app under gunicorn with uvicorn workers:
+
+    python -m app.server
+
+- Worker count defaults to the CPUs available to the process (``WORKERS=0``).
+- The app is imported once in the master (``preload_app``) before forking,
+  so workers share its memory copy-on-write.
+- Workers are recycled after ``WORKER_MAX_REQUESTS`` (+ jitter) requests.
+- Tables are created once in the master when ``AUTO_CREATE_TABLES`` is on.
+- SIGTERM/SIGINT drain gracefully: workers stop accepting connections, finish
+  in-flight requests (including their history commits) within
+  ``GRACEFUL_TIMEOUT`` seconds, then close their DB pools. Send SIGHUP to
+  replace workers one by one; with preloading, new code needs a full restart.
+
+On platforms without gunicorn (Windows) it falls back to uvicorn's own
+multi-process supervisor, without preloading.
+"""
+
+import logging
+import os
+
+from app.config import settings
+from app.database import dispose_engines, init_db
+
+logger = logging.getLogger(__name__)
+
+APP_URI = "app.main:app"
+
+
+def default_worker_count() -> int:
+    """
+    Get the number of worker processes to run.
+    
+    One async worker per CPU: each serves many requests concurrently, and
+    extra workers would only compete for cores on CPU-bound work (bcrypt,
+    NumPy) and open more database pools.
+    
+    Returns:
+        int: ``WORKERS`` if set, otherwise the number of CPUs available
+    """
+    if settings.WORKERS > 0:
+        return settings.WORKERS
+    
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    
+    return cpus
+
+
+def post_fork(server, worker):
+    """
+    Gunicorn hook run in each worker right after fork.
+    
+    Connection pools created in the master must not be shared across
+    processes, so the worker drops them without closing the parent's sockets.
+    """
+    dispose_engines(close=False)
+
+
+def gunicorn_options() -> dict:
+    """
+    Build gunicorn settings from application settings.
+    
+    Returns:
+        dict: Gunicorn configuration options
+    """
+    options = {
+        "bind": f"{settings.HOST}:{settings.PORT}",
+        "workers": default_worker_count(),
+        "worker_class": "uvicorn.workers.UvicornWorker",
+        "preload_app": True,
+        "max_requests": settings.WORKER_MAX_REQUESTS,
+        "max_requests_jitter": settings.WORKER_MAX_REQUESTS_JITTER,
+        "graceful_timeout": settings.GRACEFUL_TIMEOUT,
+        "timeout": settings.GRACEFUL_TIMEOUT * 2,
+        "loglevel": "info" if settings.DEBUG else "warning",
+        "post_fork": post_fork,
+    }
+    
+    # Heartbeat files on tmpfs avoid worker stalls on slow disks
+    if os.path.isdir("/dev/shm"):
+        options["worker_tmp_dir"] = "/dev/shm"
+    
+    return options
+
+
+def run_gunicorn():
+    """Run the app under gunicorn with preloading and worker recycling."""
+    from gunicorn.app.base import BaseApplication
+    
+    class StandaloneApplication(BaseApplication):
+        """Gunicorn application configured in code instead of a config file."""
+        
+        def __init__(self, options: dict):
+            self.options = options
+            super().__init__()
+        
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+        
+        def load(self):
+            from app.main import app
+            
+            return app
+    
+    StandaloneApplication(gunicorn_options()).run()
+
+
+def run_uvicorn():
+    """Fallback for platforms without gunicorn: uvicorn multi-process mode."""
+    import uvicorn
+    
+    uvicorn.run(
+        APP_URI,
+        host=settings.HOST,
+        port=settings.PORT,
+        workers=default_worker_count(),
+        timeout_graceful_shutdown=settings.GRACEFUL_TIMEOUT,
+        log_level="info" if settings.DEBUG else "warning"
+    )
+
+
+def create_tables_once():
+    """
+    Create tables in the master process instead of in every worker.
+    
+    Workers booting concurrently would otherwise race on CREATE TABLE.
+    """
+    if settings.AUTO_CREATE_TABLES:
+        init_db()
+        dispose_engines()
+        settings.AUTO_CREATE_TABLES = False
+        os.environ["AUTO_CREATE_TABLES"] = "False"
+
+
+def main():
+    """Start the production server."""
+    create_tables_once()
+    
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        logger.warning("gunicorn not available, falling back to uvicorn workers")
+        run_uvicorn()
+    else:
+        run_gunicorn()
+
+
+if __name__ == "__main__":
+    main()
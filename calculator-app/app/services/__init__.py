@@ -2,8 +2,20 @@
 Services package for MathHub Calculator.
 """
 
-from app.services.auth_service import AuthService
-from app.services.calculator_service import CalculatorService
-from app.services.history_service import HistoryService
+from importlib import import_module
 
-__all__ = ["AuthService", "CalculatorService", "HistoryService"]
\ No newline at end of file
+__all__ = ["AuthService", "CalculatorService", "HistoryService"]
+
+# Services are imported on first attribute access so that importing the
+# package does not pull in jose/passlib and friends.
+_SERVICE_MODULES = {
+    "AuthService": "app.services.auth_service",
+    "CalculatorService": "app.services.calculator_service",
+    "HistoryService": "app.services.history_service",
+}
+
+
+def __getattr__(name):
+    if name in _SERVICE_MODULES:
+        return getattr(import_module(_SERVICE_MODULES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -0,0 +1,358 @@
+"""
+NumPy kernels for matrix and complex-number operations.
+
+Operands arrive either as JSON (nested lists, parsed by pydantic) or as
+``.npy`` uploads, which are loaded straight into arrays without any float
+parsing. Every operand is checked against the configured size limits and
+converted to float64 or complex128 before a kernel runs.
+
+History stores operands in a compact form: the raw little-endian array
+bytes, base64-encoded, with shape and dtype (about 11 characters per
+float64 instead of up to 24 in JSON). Operands larger than
+``MATRIX_HISTORY_MAX_BYTES`` are stored as a SHA-256 digest instead.
+
+NumPy is imported with this module, which the calculator service loads on
+first use only.
+"""
+
+from typing import Any, Dict, Optional, Tuple, Union
+import base64
+import hashlib
+import io
+
+import numpy as np
+
+from app.config import settings
+
+MATRIX_OPERATIONS = ("multiply", "inverse", "determinant", "solve", "eigenvalues")
+BINARY_MATRIX_OPERATIONS = ("multiply", "solve")
+
+COMPLEX_BINARY = {
+    "add": (np.add, "+"),
+    "subtract": (np.subtract, "-"),
+    "multiply": (np.multiply, "×"),
+    "divide": (np.divide, "÷"),
+    "power": (np.power, "^"),
+}
+COMPLEX_UNARY = {
+    "modulus": (np.abs, "|{}|"),
+    "argument": (np.angle, "arg{}"),
+    "conjugate": (np.conjugate, "conj{}"),
+    "sqrt": (np.sqrt, "√{}"),
+    "exp": (np.exp, "exp{}"),
+    "ln": (np.log, "ln{}"),
+}
+
+# Characters of a stored result before it is truncated (result column size)
+MAX_RESULT_LENGTH = 255
+
+# Largest .npy header accepted (numpy's own default limit)
+MAX_NPY_HEADER = 10000
+
+
+def _limit_error(name: str, message: str) -> ValueError:
+    return ValueError(f"Operand {name}: {message}")
+
+
+def check_array(array: np.ndarray, name: str, max_dimensions: int = 2) -> np.ndarray:
+    """
+    Validate an operand and convert it to float64 or complex128.
+    
+    Args:
+        array (np.ndarray): Operand
+        name (str): Operand name used in error messages
+        max_dimensions (int): 1 for vectors, 2 for matrices
+        
+    Returns:
+        np.ndarray: C-contiguous float64 or complex128 array
+        
+    Raises:
+        ValueError: If the operand is not numeric, too large or not finite
+    """
+    if array.dtype.kind not in "biufc":
+        raise _limit_error(name, f"unsupported dtype {array.dtype}")
+    if not 1 <= array.ndim <= max_dimensions:
+        raise _limit_error(name, f"expected at most {max_dimensions} dimensions, got {array.ndim}")
+    if array.size == 0:
+        raise _limit_error(name, "is empty")
+    if max(array.shape) > settings.MATRIX_MAX_DIMENSION:
+        raise _limit_error(name, f"dimensions are limited to {settings.MATRIX_MAX_DIMENSION}")
+    
+    dtype = np.complex128 if array.dtype.kind == "c" else np.float64
+    array = np.ascontiguousarray(array, dtype=dtype)
+    if not np.isfinite(array).all():
+        raise _limit_error(name, "must contain finite numbers only")
+    return array
+
+
+def _square(array: np.ndarray, name: str) -> None:
+    if array.ndim != 2 or array.shape[0] != array.shape[1]:
+        raise _limit_error(name, f"must be a square matrix, got shape {array.shape}")
+
+
+def _shape_text(array: np.ndarray) -> str:
+    return "×".join(str(size) for size in array.shape)
+
+
+def evaluate_matrix(operation: str, a: np.ndarray,
+                    b: Optional[np.ndarray] = None) -> Tuple[Union[np.ndarray, float, complex], str]:
+    """
+    Run a matrix operation on validated operands.
+    
+    Args:
+        operation (str): One of ``MATRIX_OPERATIONS``
+        a (np.ndarray): Matrix A
+        b (Optional[np.ndarray]): Matrix or vector B for multiply and solve
+        
+    Returns:
+        Tuple[Union[np.ndarray, float, complex], str]: Result and expression
+        
+    Raises:
+        ValueError: If the operands do not fit the operation, the matrix is
+            singular or the result is not finite
+    """
+    if operation not in MATRIX_OPERATIONS:
+        raise ValueError(f"Unknown matrix operation: {operation}")
+    if a.ndim != 2:
+        raise _limit_error("a", "must be a matrix")
+    if operation in BINARY_MATRIX_OPERATIONS and b is None:
+        raise ValueError(f"Operation {operation} requires operand b")
+    
+    try:
+        if operation == "multiply":
+            if a.shape[1] != b.shape[0]:
+                raise ValueError(f"Cannot multiply shapes {a.shape} and {b.shape}")
+            result = a @ b
+            expression = f"A × B ({_shape_text(a)} · {_shape_text(b)})"
+        
+        elif operation == "inverse":
+            _square(a, "a")
+            result = np.linalg.inv(a)
+            expression = f"inv(A) ({_shape_text(a)})"
+        
+        elif operation == "determinant":
+            _square(a, "a")
+            result = np.linalg.det(a)[()]
+            expression = f"det(A) ({_shape_text(a)})"
+        
+        elif operation == "solve":
+            _square(a, "a")
+            if b.shape[0] != a.shape[0]:
+                raise ValueError(f"Cannot solve shapes {a.shape} and {b.shape}")
+            result = np.linalg.solve(a, b)
+            expression = f"solve(A, B) ({_shape_text(a)}, {_shape_text(b)})"
+        
+        else:
+            _square(a, "a")
+            # Hermitian matrices have real eigenvalues and a faster solver
+            if np.array_equal(a, a.conj().T):
+                result = np.linalg.eigvalsh(a)
+            else:
+                result = np.linalg.eigvals(a)
+            expression = f"eig(A) ({_shape_text(a)})"
+    
+    except np.linalg.LinAlgError as e:
+        raise ValueError(f"Matrix {operation} failed: {e}")
+    
+    if not np.isfinite(result).all():
+        raise ValueError("Result is not finite")
+    return result, expression
+
+
+def _complex_text(values: np.ndarray) -> str:
+    if values.size == 1:
+        return str(complex(values.reshape(-1)[0]))
+    return f"[{values.size} values]"
+
+
+def evaluate_complex(operation: str, z1: np.ndarray,
+                     z2: Optional[np.ndarray] = None) -> Tuple[np.ndarray, str]:
+    """
+    Run an element-wise complex operation.
+    
+    Args:
+        operation (str): Key of ``COMPLEX_BINARY`` or ``COMPLEX_UNARY``
+        z1 (np.ndarray): complex128 vector
+        z2 (Optional[np.ndarray]): complex128 vector of the same length (or
+            length 1) for binary operations
+            
+    Returns:
+        Tuple[np.ndarray, str]: Result vector and expression
+        
+    Raises:
+        ValueError: If the operands do not fit or the result is not finite
+    """
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        if operation in COMPLEX_BINARY:
+            if z2 is None:
+                raise ValueError(f"Operation {operation} requires z2")
+            if z1.size != z2.size and 1 not in (z1.size, z2.size):
+                raise ValueError(f"Cannot combine {z1.size} and {z2.size} values")
+            function, symbol = COMPLEX_BINARY[operation]
+            result = function(z1, z2)
+            expression = f"{_complex_text(z1)} {symbol} {_complex_text(z2)}"
+        elif operation in COMPLEX_UNARY:
+            function, template = COMPLEX_UNARY[operation]
+            result = function(z1)
+            expression = template.format(_complex_text(z1))
+        else:
+            raise ValueError(f"Unknown complex operation: {operation}")
+    
+    if not np.isfinite(result).all():
+        raise ValueError("Result is not finite (division by zero or overflow)")
+    return result, expression
+
+
+def to_json(value: Union[np.ndarray, float, complex]) -> Any:
+    """
+    Convert a kernel result to JSON-compatible values.
+    
+    Complex numbers become ``{"real": ..., "imag": ...}``; complex arrays
+    whose imaginary parts are all zero are returned as real arrays.
+    
+    Args:
+        value (Union[np.ndarray, float, complex]): Kernel result
+        
+    Returns:
+        Any: Float, dict, or (nested) lists of either
+    """
+    array = np.asarray(value)
+    if array.dtype.kind == "c":
+        if not array.imag.any():
+            array = array.real
+        else:
+            pairs = np.stack([array.real, array.imag], axis=-1).tolist()
+            
+            def to_dicts(item):
+                if item and isinstance(item[0], list):
+                    return [to_dicts(inner) for inner in item]
+                return {"real": item[0], "imag": item[1]}
+            
+            return to_dicts(pairs)
+    return array.tolist()
+
+
+def summarize(value: Union[np.ndarray, float, complex]) -> str:
+    """
+    Display text of a result for the history result column.
+    
+    Args:
+        value (Union[np.ndarray, float, complex]): Kernel result
+        
+    Returns:
+        str: Result text, elided to fit ``MAX_RESULT_LENGTH``
+    """
+    array = np.asarray(value)
+    if array.ndim == 0:
+        text = str(array[()].item())
+    else:
+        text = np.array2string(array, precision=6, threshold=64, max_line_width=MAX_RESULT_LENGTH * 4)
+        text = " ".join(text.split())
+    if len(text) > MAX_RESULT_LENGTH:
+        text = text[:MAX_RESULT_LENGTH - 1] + "…"
+    return text
+
+
+def encode_array(array: np.ndarray) -> Dict[str, Any]:
+    """
+    Compact JSON-serializable encoding of an operand for history.
+    
+    Args:
+        array (np.ndarray): Validated operand
+        
+    Returns:
+        Dict[str, Any]: ``shape``, ``dtype`` and either ``data`` (base64 of
+        the little-endian bytes) or, above MATRIX_HISTORY_MAX_BYTES,
+        ``sha256`` of those bytes
+    """
+    array = np.ascontiguousarray(array, dtype=array.dtype.newbyteorder("<"))
+    data = array.tobytes()
+    encoded = {"shape": list(array.shape), "dtype": array.dtype.str}
+    if len(data) > settings.MATRIX_HISTORY_MAX_BYTES:
+        encoded["sha256"] = hashlib.sha256(data).hexdigest()
+    else:
+        encoded["data"] = base64.b64encode(data).decode("ascii")
+    return encoded
+
+
+def decode_array(encoded: Dict[str, Any]) -> np.ndarray:
+    """
+    Decode an operand stored by ``encode_array``.
+    
+    Args:
+        encoded (Dict[str, Any]): Stored operand
+        
+    Returns:
+        np.ndarray: The operand
+        
+    Raises:
+        ValueError: If only a digest was stored
+    """
+    if "data" not in encoded:
+        raise ValueError("Operand was too large to be stored; only its digest is available")
+    data = base64.b64decode(encoded["data"])
+    return np.frombuffer(data, dtype=np.dtype(encoded["dtype"])).reshape(encoded["shape"])
+
+
+def load_npy(data: bytes, name: str, max_dimensions: int = 2) -> np.ndarray:
+    """
+    Load an uploaded ``.npy`` file (pickled object arrays are refused).
+    
+    The header is parsed and checked first (dtype, number of dimensions,
+    size limits, payload length), so a forged header can never make NumPy
+    allocate more than the upload itself.
+    
+    Args:
+        data (bytes): File content
+        name (str): Operand name used in error messages
+        max_dimensions (int): 1 for vectors, 2 for matrices
+        
+    Returns:
+        np.ndarray: Raw array (a view of ``data``), to be validated with
+        ``check_array``
+        
+    Raises:
+        ValueError: If the content is not a valid .npy array within limits
+    """
+    from numpy.lib import format as npy_format
+    
+    stream = io.BytesIO(data)
+    try:
+        version = npy_format.read_magic(stream)
+        if version == (1, 0):
+            shape, fortran_order, dtype = npy_format.read_array_header_1_0(stream, max_header_size=MAX_NPY_HEADER)
+        else:
+            shape, fortran_order, dtype = npy_format.read_array_header_2_0(stream, max_header_size=MAX_NPY_HEADER)
+    except (ValueError, OSError, EOFError) as e:
+        raise _limit_error(name, f"not a valid .npy file ({e})")
+    
+    if dtype.kind not in "biufc" or dtype.hasobject or dtype.fields is not None:
+        raise _limit_error(name, f"unsupported dtype {dtype}")
+    if not 1 <= len(shape) <= max_dimensions:
+        raise _limit_error(name, f"expected at most {max_dimensions} dimensions, got {len(shape)}")
+    if max(shape) > settings.MATRIX_MAX_DIMENSION:
+        raise _limit_error(name, f"dimensions are limited to {settings.MATRIX_MAX_DIMENSION}")
+    
+    payload = memoryview(data)[stream.tell():]
+    expected = dtype.itemsize
+    for size in shape:
+        expected *= size
+    if len(payload) != expected:
+        raise _limit_error(name, f"header shape {shape} needs {expected} data bytes, got {len(payload)}")
+    
+    return np.frombuffer(payload, dtype=dtype).reshape(shape, order="F" if fortran_order else "C")
+
+
+def dump_npy(value: Union[np.ndarray, float, complex]) -> bytes:
+    """
+    Serialize a result as ``.npy`` (scalars as 0-d arrays).
+    
+    Args:
+        value (Union[np.ndarray, float, complex]): Kernel result
+        
+    Returns:
+        bytes: .npy file content
+    """
+    buffer = io.BytesIO()
+    np.save(buffer, np.asarray(value), allow_pickle=False)
+    return buffer.getvalue()
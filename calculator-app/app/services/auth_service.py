@@ -3,22 +3,35 @@ Service layer for authentication and authorization.
 """
 
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
 import logging
 
-from jose import JWTError, jwt
-from passlib.context import CryptContext
-
 from app.config import settings
 from app.schemas.user import TokenData
 from app.repositories.user_repository import UserRepository
+from app.tracing import traced_methods
 
 logger = logging.getLogger(__name__)
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+@lru_cache(maxsize=1)
+def get_pwd_context():
+    """
+    Get the password hashing context.
+    
+    passlib/bcrypt are imported on first use rather than at module import,
+    keeping them off the cold-start path.
+    
+    Returns:
+        CryptContext: Password hashing context
+    """
+    from passlib.context import CryptContext
+    
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
+@traced_methods("service")
 class AuthService:
     """
     Service class for authentication operations.
@@ -53,7 +66,7 @@ class AuthService:
         Returns:
             bool: True if password matches, False otherwise
         """
-        return pwd_context.verify(plain_password, hashed_password)
+        return get_pwd_context().verify(plain_password, hashed_password)
     
     @staticmethod
     def get_password_hash(password: str) -> str:
@@ -66,7 +79,7 @@ class AuthService:
         Returns:
             str: Hashed password
         """
-        return pwd_context.hash(password)
+        return get_pwd_context().hash(password)
     
     @staticmethod
     def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -80,6 +93,8 @@ class AuthService:
         Returns:
             str: Encoded JWT token
         """
+        from jose import jwt
+        
         to_encode = data.copy()
         
         if expires_delta:
@@ -106,6 +121,8 @@ class AuthService:
         Returns:
             Optional[TokenData]: Decoded token data or None if invalid
         """
+        from jose import JWTError, jwt
+        
         try:
             payload = jwt.decode(
                 token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
@@ -3,17 +3,50 @@ Service layer for calculator operations.
 """
 
 import math
-from typing import Dict, Any
+from dataclasses import dataclass
+from typing import Dict, Any, Iterable, Optional, Tuple, TYPE_CHECKING
 import logging
 
+from app.config import settings
 from app.schemas.calculator import (
     BasicOperation, AdvancedOperation, ConversionRequest, 
-    FinanceRequest, OperationType, CalculatorResponse
+    FinanceRequest, OperationType,
+    MatrixOperation, ComplexOperation, StatisticsOptions
 )
+from app.services import function_tables
+from app.tracing import traced_methods
+
+if TYPE_CHECKING:
+    import numpy as np
 
 logger = logging.getLogger(__name__)
 
 
+# Not frozen: frozen dataclasses assign fields through object.__setattr__,
+# which makes construction several times slower
+@dataclass(slots=True)
+class CalculationResult:
+    """
+    Result of a scalar calculation, as returned by CalculatorService.
+    
+    Internal to the service layer: routes copy the fields into their
+    response dict, so Pydantic validates the request and the response at
+    the API boundary only, not once more per calculation.
+    
+    Attributes:
+        result (float): Calculation result
+        expression (str): Mathematical expression
+        operation_type (OperationType): Type of operation performed
+        error_bound (Optional[float]): Absolute error bound of a table-mode
+            result
+    """
+    result: float
+    expression: str
+    operation_type: OperationType
+    error_bound: Optional[float] = None
+
+
+@traced_methods("service")
 class CalculatorService:
     """
     Service class for calculator operations.
@@ -23,6 +56,11 @@ class CalculatorService:
         calculate_advanced: Perform advanced calculations
         convert_units: Convert between units
         calculate_finance: Perform financial calculations
+        matrix_operands: Validated NumPy operands of a JSON matrix operation
+        complex_operands: Validated NumPy operands of a complex operation
+        calculate_matrix: Perform matrix operations on NumPy operands
+        calculate_complex: Perform complex arithmetic on NumPy operands
+        calculate_statistics: Compute statistics over a stream of data chunks
         _create_expression_string: Create expression string for history
     """
     
@@ -47,7 +85,7 @@ class CalculatorService:
         }
     }
     
-    def calculate_basic(self, operation: BasicOperation) -> CalculatorResponse:
+    def calculate_basic(self, operation: BasicOperation) -> CalculationResult:
         """
         Perform basic mathematical operations.
         
@@ -55,7 +93,7 @@ class CalculatorService:
             operation (BasicOperation): Basic operation data
             
         Returns:
-            CalculatorResponse: Calculation result
+            CalculationResult: Calculation result
             
         Raises:
             ValueError: If operation is invalid
@@ -84,6 +122,8 @@ class CalculatorService:
             
             elif operation.operation == OperationType.POWER:
                 result = operation.num1 ** operation.num2
+                if isinstance(result, complex):
+                    raise ValueError("Fractional power of a negative number is not real")
                 expression = f"{operation.num1}^{operation.num2}"
             
             elif operation.operation == OperationType.PERCENTAGE:
@@ -93,7 +133,7 @@ class CalculatorService:
             else:
                 raise ValueError(f"Unsupported basic operation: {operation.operation}")
             
-            return CalculatorResponse(
+            return CalculationResult(
                 result=result,
                 expression=expression,
                 operation_type=operation.operation
@@ -103,7 +143,7 @@ class CalculatorService:
             logger.error(f"Basic calculation error: {str(e)}")
             raise
     
-    def calculate_advanced(self, operation: AdvancedOperation) -> CalculatorResponse:
+    def calculate_advanced(self, operation: AdvancedOperation) -> CalculationResult:
         """
         Perform advanced mathematical operations.
         
@@ -111,7 +151,7 @@ class CalculatorService:
             operation (AdvancedOperation): Advanced operation data
             
         Returns:
-            CalculatorResponse: Calculation result
+            CalculationResult: Calculation result
             
         Raises:
             ValueError: If operation is invalid
@@ -119,7 +159,17 @@ class CalculatorService:
         try:
             value = operation.value
             expression = ""
-            result = 0.0
+            result = None
+            error_bound = None
+            
+            # Table mode: degree trig and logarithms come from precomputed
+            # tables (exact at special angles), with an error bound
+            if operation.mode == "table":
+                if not function_tables.supports(operation.operation.value, operation.angle_unit):
+                    raise ValueError(
+                        "Table mode supports sin, cos and tan in degrees, log and ln only"
+                    )
+                result, error_bound = function_tables.evaluate(operation.operation.value, value)
             
             # Convert to radians if needed for trigonometric functions
             if operation.angle_unit == "degrees" and operation.operation in [
@@ -139,39 +189,45 @@ class CalculatorService:
                 expression = f"√{value}"
             
             elif operation.operation == OperationType.SIN:
-                result = math.sin(value)
+                if result is None:
+                    result = math.sin(value)
                 expression = f"sin({operation.value}{angle_suffix})"
             
             elif operation.operation == OperationType.COS:
-                result = math.cos(value)
+                if result is None:
+                    result = math.cos(value)
                 expression = f"cos({operation.value}{angle_suffix})"
             
             elif operation.operation == OperationType.TAN:
-                result = math.tan(value)
+                if result is None:
+                    result = math.tan(value)
                 expression = f"tan({operation.value}{angle_suffix})"
             
             elif operation.operation == OperationType.LOG:
-                result = math.log10(value)
+                if result is None:
+                    result = math.log10(value)
                 expression = f"log₁₀({value})"
             
             elif operation.operation == OperationType.LN:
-                result = math.log(value)
+                if result is None:
+                    result = math.log(value)
                 expression = f"ln({value})"
             
             else:
                 raise ValueError(f"Unsupported advanced operation: {operation.operation}")
             
-            return CalculatorResponse(
+            return CalculationResult(
                 result=result,
                 expression=expression,
-                operation_type=operation.operation
+                operation_type=operation.operation,
+                error_bound=error_bound
             )
             
         except Exception as e:
             logger.error(f"Advanced calculation error: {str(e)}")
             raise
     
-    def convert_units(self, conversion: ConversionRequest) -> CalculatorResponse:
+    def convert_units(self, conversion: ConversionRequest) -> CalculationResult:
         """
         Convert between different units.
         
@@ -179,34 +235,34 @@ class CalculatorService:
             conversion (ConversionRequest): Conversion data
             
         Returns:
-            CalculatorResponse: Conversion result
+            CalculationResult: Conversion result
             
         Raises:
             ValueError: If conversion type or units are invalid
         """
         try:
-            if conversion.conversion_type not in self.CONVERSION_FACTORS:
-                raise ValueError(f"Unsupported conversion type: {conversion.conversion_type}")
-            
-            factors = self.CONVERSION_FACTORS[conversion.conversion_type]
-            
-            if conversion.from_unit not in factors or conversion.to_unit not in factors:
-                raise ValueError(f"Invalid units for {conversion.conversion_type} conversion")
-            
-            # Convert to base unit first, then to target unit
-            value_in_base = conversion.value * factors[conversion.from_unit]
-            result = value_in_base / factors[conversion.to_unit]
-            
-            # Special handling for temperature
+            # Temperature scales are offset, not just scaled
             if conversion.conversion_type == "temperature":
                 result = self._convert_temperature(
                     conversion.value, conversion.from_unit, conversion.to_unit
                 )
                 expression = f"{conversion.value} {conversion.from_unit} → {conversion.to_unit}"
+            
             else:
+                if conversion.conversion_type not in self.CONVERSION_FACTORS:
+                    raise ValueError(f"Unsupported conversion type: {conversion.conversion_type}")
+                
+                factors = self.CONVERSION_FACTORS[conversion.conversion_type]
+                
+                if conversion.from_unit not in factors or conversion.to_unit not in factors:
+                    raise ValueError(f"Invalid units for {conversion.conversion_type} conversion")
+                
+                # Convert to base unit first, then to target unit
+                value_in_base = conversion.value * factors[conversion.from_unit]
+                result = value_in_base / factors[conversion.to_unit]
                 expression = f"{conversion.value} {conversion.from_unit} = ? {conversion.to_unit}"
             
-            return CalculatorResponse(
+            return CalculationResult(
                 result=result,
                 expression=expression,
                 operation_type=OperationType.CONVERSION
@@ -248,7 +304,7 @@ class CalculatorService:
         else:
             raise ValueError(f"Invalid temperature unit: {to_unit}")
     
-    def calculate_finance(self, finance: FinanceRequest) -> CalculatorResponse:
+    def calculate_finance(self, finance: FinanceRequest) -> CalculationResult:
         """
         Perform financial calculations.
         
@@ -256,7 +312,7 @@ class CalculatorService:
             finance (FinanceRequest): Financial calculation data
             
         Returns:
-            CalculatorResponse: Calculation result
+            CalculationResult: Calculation result
         """
         try:
             principal = finance.principal
@@ -288,7 +344,7 @@ class CalculatorService:
             else:
                 raise ValueError(f"Unsupported financial operation: {finance.operation}")
             
-            return CalculatorResponse(
+            return CalculationResult(
                 result=round(result, 2),
                 expression=expression,
                 operation_type=OperationType.FINANCE
@@ -296,4 +352,141 @@ class CalculatorService:
             
         except Exception as e:
             logger.error(f"Financial calculation error: {str(e)}")
+            raise
+    
+    # Matrix and complex operations run NumPy kernels; NumPy is imported on
+    # first use (array_kernels) so it does not slow down application startup
+    
+    def matrix_operands(self, operation: MatrixOperation) -> Tuple["np.ndarray", Optional["np.ndarray"]]:
+        """
+        Convert the JSON operands of a matrix operation to validated arrays.
+        
+        Args:
+            operation (MatrixOperation): Matrix operation data
+            
+        Returns:
+            Tuple[np.ndarray, Optional[np.ndarray]]: Operands A and B
+            
+        Raises:
+            ValueError: If an operand exceeds the size limits
+        """
+        from app.services import array_kernels
+        import numpy as np
+        
+        a = array_kernels.check_array(np.array(operation.a, dtype=np.float64), "a")
+        b = None
+        if operation.b is not None:
+            b = array_kernels.check_array(np.array(operation.b, dtype=np.float64), "b")
+        return a, b
+    
+    def complex_operands(self, operation: ComplexOperation) -> Tuple["np.ndarray", Optional["np.ndarray"]]:
+        """
+        Convert the operands of a complex operation to complex128 vectors.
+        
+        Args:
+            operation (ComplexOperation): Complex operation data
+            
+        Returns:
+            Tuple[np.ndarray, Optional[np.ndarray]]: Operands z1 and z2
+        """
+        from app.services import array_kernels
+        import numpy as np
+        
+        def to_array(operand, name):
+            if operand is None:
+                return None
+            numbers = operand if isinstance(operand, list) else [operand]
+            values = np.array([(number.real, number.imag) for number in numbers], dtype=np.float64)
+            return array_kernels.check_array(values.view(np.complex128).reshape(-1), name, max_dimensions=1)
+        
+        return to_array(operation.z1, "z1"), to_array(operation.z2, "z2")
+    
+    def calculate_matrix(self, operation: str, a: "np.ndarray",
+                         b: Optional["np.ndarray"] = None) -> Tuple[Any, str]:
+        """
+        Perform matrix operations.
+        
+        Args:
+            operation (str): multiply, inverse, determinant, solve or eigenvalues
+            a (np.ndarray): Matrix A, validated with array_kernels.check_array
+            b (Optional[np.ndarray]): Matrix or vector B (multiply, solve)
+            
+        Returns:
+            Tuple[Any, str]: Result (array or scalar) and expression
+            
+        Raises:
+            ValueError: If the operands do not fit the operation or the
+                matrix is singular
+        """
+        from app.services import array_kernels
+        
+        try:
+            return array_kernels.evaluate_matrix(operation, a, b)
+        except Exception as e:
+            logger.error(f"Matrix calculation error: {str(e)}")
+            raise
+    
+    def calculate_complex(self, operation: str, z1: "np.ndarray",
+                          z2: Optional["np.ndarray"] = None) -> Tuple[Any, str]:
+        """
+        Perform element-wise complex arithmetic.
+        
+        Args:
+            operation (str): Complex operation name
+            z1 (np.ndarray): First operand (complex128 vector)
+            z2 (Optional[np.ndarray]): Second operand of binary operations
+            
+        Returns:
+            Tuple[Any, str]: Result vector and expression
+            
+        Raises:
+            ValueError: On division by zero or overflow
+        """
+        from app.services import array_kernels
+        
+        try:
+            return array_kernels.evaluate_complex(operation, z1, z2)
+        except Exception as e:
+            logger.error(f"Complex calculation error: {str(e)}")
+            raise
+    
+    def calculate_statistics(self, options: StatisticsOptions,
+                             chunks: Iterable["np.ndarray"]) -> Tuple[Any, str, Dict[str, Any]]:
+        """
+        Compute descriptive statistics in a single pass over a dataset.
+        
+        The dataset is consumed chunk by chunk (see streaming_stats), so it
+        never has to fit in memory.
+        
+        Args:
+            options (StatisticsOptions): Operation and its options
+            chunks (Iterable[np.ndarray]): Dataset chunks from
+                streaming_stats.iter_*_chunks
+                
+        Returns:
+            Tuple[Any, str, Dict[str, Any]]: Result, expression and dataset
+            summary (count, mean, stdev, min, max, exact)
+            
+        Raises:
+            ValueError: If the dataset is empty, invalid or too small
+        """
+        from app.services import streaming_stats
+        
+        histogram_range = None
+        if options.histogram_min is not None:
+            histogram_range = (options.histogram_min, options.histogram_max)
+        
+        try:
+            return streaming_stats.evaluate(
+                options.operation,
+                chunks,
+                percentiles=options.percentiles,
+                bins=options.bins,
+                histogram_range=histogram_range,
+                population=options.population,
+                exact_limit=settings.STATISTICS_EXACT_LIMIT,
+                compression=settings.STATISTICS_TDIGEST_COMPRESSION
+            )
+        except Exception as e:
+            logger.error(f"Statistics calculation error: {str(e)}")
             raise
\ No newline at end of file
@@ -0,0 +1,310 @@
+"""
+Table-driven trigonometric and logarithm functions with error bounds.
+
+Used by ``CalculatorService.calculate_advanced`` in ``mode="table"``, which
+trades speed for exactness: a call costs over ten times a ``math`` call,
+but special angles come out exact and every result has an error bound.
+
+- Degree inputs on the 0.1° grid (at most one decimal digit, e.g. 30 or
+  12.5) are reduced modulo 360° as integer tenths of a degree, so the
+  reduction is exact for any magnitude, and looked up in tables of
+  correctly rounded values (error at most half an ulp). By Niven's theorem
+  the only rational sines and tangents of rational degrees are 0, ±1/2 and
+  ±1, all exactly representable, so they come out exact: sin(30°) is 0.5,
+  cos(90°) is 0.0 and tan(45°) is 1.0. tan(90°) is rejected as undefined.
+- Other degree inputs are interpolated between grid points with cubic
+  Hermite interpolation (the sine table also gives the derivative), with
+  an absolute error below ``INTERPOLATION_ERROR_BOUND``.
+- Logarithms reduce x to 2^e * m with m in [sqrt(2)/2, sqrt(2)), look up
+  ln(j/128) for the nearest j/128 and add a short series for the remainder
+  (Tang's method); log10 of exact powers of ten is exact.
+
+Tables are computed once, on first use, with ``decimal`` at 40 digits.
+Each function returns ``(value, error_bound)``, the bound being absolute.
+Accuracy against high-precision references is checked by
+``check_function_tables.py``.
+"""
+
+from decimal import Decimal, localcontext
+from fractions import Fraction
+from functools import lru_cache
+from typing import Optional, Tuple
+import math
+
+TENTHS_PER_QUARTER = 900
+TENTHS_PER_TURN = 3600
+STEP_RADIANS = math.pi / 1800
+# Hermite remainder h^4/384 * max|f''''| (= 1 for sin and cos) plus rounding
+INTERPOLATION_ERROR_BOUND = STEP_RADIANS ** 4 / 384 + 8 * 2.0 ** -53
+
+LOG_TABLE_SCALE = 128
+# j/128 for j in this range covers mantissas in [sqrt(2)/2, sqrt(2))
+LOG_TABLE_FIRST = 90
+LOG_TABLE_LAST = 182
+# ln(2) split so that e * LN2_HI is exact for any binary exponent e
+LN2_HI = 6.93147180369123816490e-01
+LN2_LO = 1.90821492927058770002e-10
+SQRT_HALF = 0.7071067811865476
+LOG10_E = 0.4342944819032518  # 1/ln(10), correctly rounded
+POWERS_OF_TEN = {10.0 ** k: k for k in range(23)}
+
+PRECISION = 40
+PI = Decimal("3.14159265358979323846264338327950288419716939937510582097494")
+EXACT_VALUES = (0.0, 0.5, 1.0)
+
+
+def _decimal_sin(x: Decimal) -> Decimal:
+    """Taylor series of sin for 0 <= x <= pi/2 at the current precision."""
+    term = total = x
+    x_squared = x * x
+    n = 1
+    while abs(term) > Decimal(10) ** -(PRECISION + 5):
+        term = -term * x_squared / ((n + 1) * (n + 2))
+        total += term
+        n += 2
+    return total
+
+
+@lru_cache(maxsize=None)
+def _trig_tables() -> Tuple[Tuple[float, ...], Tuple[Optional[float], ...]]:
+    """sin and tan of k tenths of a degree for k = 0..900, correctly rounded."""
+    with localcontext() as context:
+        context.prec = PRECISION
+        sines = [_decimal_sin(PI * k / 1800) for k in range(TENTHS_PER_QUARTER + 1)]
+        sin_table = tuple(float(value) for value in sines)
+        tan_table = tuple(
+            float(sines[k] / sines[TENTHS_PER_QUARTER - k]) if k < TENTHS_PER_QUARTER else None
+            for k in range(TENTHS_PER_QUARTER + 1)
+        )
+    return sin_table, tan_table
+
+
+@lru_cache(maxsize=None)
+def _log_table() -> Tuple[float, ...]:
+    """ln(j/128) for j = 0..182 (used from 90 on), correctly rounded."""
+    with localcontext() as context:
+        context.prec = PRECISION
+        return tuple(
+            float((Decimal(j) / LOG_TABLE_SCALE).ln()) if j >= LOG_TABLE_FIRST else math.nan
+            for j in range(LOG_TABLE_LAST + 1)
+        )
+
+
+def grid_tenths(degrees: float) -> Optional[int]:
+    """
+    Express an angle on the 0.1° grid as an integer number of tenths.
+    
+    Args:
+        degrees (float): Angle in degrees
+        
+    Returns:
+        Optional[int]: Tenths of a degree, or None if the angle is not the
+        closest float to a number with one decimal digit
+    """
+    if not math.isfinite(degrees):
+        raise ValueError("Angle must be finite")
+    if abs(degrees) < 2.0 ** 49:
+        # degrees * 10 is within an ulp of an integer on the grid
+        tenths = round(degrees * 10)
+        return tenths if tenths / 10 == degrees else None
+    # Floats this large are multiples of 1/8; use their exact value
+    tenths = Fraction(degrees) * 10
+    return int(tenths) if tenths.denominator == 1 else None
+
+
+def _sin_tenths(k: int) -> float:
+    """sin of k tenths of a degree, any integer k, using quadrant symmetry."""
+    sin_table = _trig_tables()[0]
+    k %= TENTHS_PER_TURN
+    if k <= 900:
+        return sin_table[k]
+    if k <= 1800:
+        return sin_table[1800 - k]
+    if k <= 2700:
+        return -sin_table[k - 1800]
+    return -sin_table[3600 - k]
+
+
+def _cos_tenths(k: int) -> float:
+    return _sin_tenths(k + TENTHS_PER_QUARTER)
+
+
+def _tan_tenths(k: int) -> float:
+    tan_table = _trig_tables()[1]
+    k %= 1800
+    if k == TENTHS_PER_QUARTER:
+        raise ValueError("Tangent is undefined at odd multiples of 90°")
+    return tan_table[k] if k < TENTHS_PER_QUARTER else -tan_table[1800 - k]
+
+
+def _grid_bound(value: float) -> float:
+    return 0.0 if abs(value) in EXACT_VALUES else math.ulp(value) / 2
+
+
+def _interpolate(degrees: float) -> Tuple[float, float]:
+    """Hermite-interpolated (sin, cos) of an off-grid angle."""
+    tenths = math.fmod(degrees, 360.0) * 10
+    k = math.floor(tenths)
+    t = tenths - k
+    sin0, sin1 = _sin_tenths(k), _sin_tenths(k + 1)
+    cos0, cos1 = _cos_tenths(k), _cos_tenths(k + 1)
+    
+    t2 = t * t
+    t3 = t2 * t
+    h00 = 2 * t3 - 3 * t2 + 1
+    h10 = (t3 - 2 * t2 + t) * STEP_RADIANS
+    h01 = 3 * t2 - 2 * t3
+    h11 = (t3 - t2) * STEP_RADIANS
+    sin_value = h00 * sin0 + h10 * cos0 + h01 * sin1 + h11 * cos1
+    cos_value = h00 * cos0 - h10 * sin0 + h01 * cos1 - h11 * sin1
+    return sin_value, cos_value
+
+
+def sin_degrees(degrees: float) -> Tuple[float, float]:
+    """
+    Sine of an angle in degrees.
+    
+    Args:
+        degrees (float): Angle in degrees
+        
+    Returns:
+        Tuple[float, float]: Value and absolute error bound
+    """
+    k = grid_tenths(degrees)
+    if k is not None:
+        value = _sin_tenths(k)
+        return value, _grid_bound(value)
+    return _interpolate(degrees)[0], INTERPOLATION_ERROR_BOUND
+
+
+def cos_degrees(degrees: float) -> Tuple[float, float]:
+    """
+    Cosine of an angle in degrees.
+    
+    Args:
+        degrees (float): Angle in degrees
+        
+    Returns:
+        Tuple[float, float]: Value and absolute error bound
+    """
+    k = grid_tenths(degrees)
+    if k is not None:
+        value = _cos_tenths(k)
+        return value, _grid_bound(value)
+    return _interpolate(degrees)[1], INTERPOLATION_ERROR_BOUND
+
+
+def tan_degrees(degrees: float) -> Tuple[float, float]:
+    """
+    Tangent of an angle in degrees.
+    
+    Args:
+        degrees (float): Angle in degrees
+        
+    Returns:
+        Tuple[float, float]: Value and absolute error bound
+        
+    Raises:
+        ValueError: At odd multiples of 90°, or off the grid so close to
+            them that the interpolated cosine cannot be told from zero
+    """
+    k = grid_tenths(degrees)
+    if k is not None:
+        value = _tan_tenths(k)
+        return value, _grid_bound(value)
+    
+    sin_value, cos_value = _interpolate(degrees)
+    if abs(cos_value) <= 2 * INTERPOLATION_ERROR_BOUND:
+        raise ValueError("Tangent is too close to 90° for table mode")
+    value = sin_value / cos_value
+    # Error of a quotient of two values each within INTERPOLATION_ERROR_BOUND
+    bound = (INTERPOLATION_ERROR_BOUND * (1 + abs(value)) / (abs(cos_value) - INTERPOLATION_ERROR_BOUND)
+             + math.ulp(value))
+    return value, bound
+
+
+def ln(x: float) -> Tuple[float, float]:
+    """
+    Natural logarithm.
+    
+    Args:
+        x (float): Positive finite value
+        
+    Returns:
+        Tuple[float, float]: Value and absolute error bound
+        
+    Raises:
+        ValueError: If x is not positive and finite
+    """
+    if not (x > 0 and math.isfinite(x)):
+        raise ValueError("Logarithm requires a positive finite value")
+    
+    mantissa, exponent = math.frexp(x)
+    if mantissa < SQRT_HALF:
+        mantissa, exponent = mantissa * 2, exponent - 1
+    j = round(mantissa * LOG_TABLE_SCALE)
+    center = j / LOG_TABLE_SCALE
+    # Exact (Sterbenz); |r| <= 1/180, so the series error is below r^9/9 < 1e-21
+    r = (mantissa - center) / center
+    series = r * (1 - r * (1 / 2 - r * (1 / 3 - r * (1 / 4 - r * (1 / 5 - r * (1 / 6 - r * (1 / 7 - r / 8)))))))
+    value = exponent * LN2_HI + (_log_table()[j] + (exponent * LN2_LO + series))
+    return value, 2 * math.ulp(value) + 2.0 ** -60
+
+
+def log10(x: float) -> Tuple[float, float]:
+    """
+    Base-10 logarithm, exact for powers of ten.
+    
+    Args:
+        x (float): Positive finite value
+        
+    Returns:
+        Tuple[float, float]: Value and absolute error bound
+    """
+    if x in POWERS_OF_TEN:
+        return float(POWERS_OF_TEN[x]), 0.0
+    value, bound = ln(x)
+    result = value * LOG10_E
+    return result, bound * LOG10_E + 2 * math.ulp(result)
+
+
+TABLE_FUNCTIONS = {
+    "sin": sin_degrees,
+    "cos": cos_degrees,
+    "tan": tan_degrees,
+    "log": log10,
+    "ln": ln,
+}
+
+
+def supports(operation: str, angle_unit: str) -> bool:
+    """
+    Check whether table mode applies to an operation.
+    
+    Trigonometric functions are tabulated in degrees only; radian inputs
+    and square roots have no table mode.
+    
+    Args:
+        operation (str): Advanced operation name
+        angle_unit (str): "degrees" or "radians"
+        
+    Returns:
+        bool: True if ``evaluate`` handles it
+    """
+    if operation in ("log", "ln"):
+        return True
+    return operation in TABLE_FUNCTIONS and angle_unit == "degrees"
+
+
+def evaluate(operation: str, value: float) -> Tuple[float, float]:
+    """
+    Evaluate a supported operation from the tables.
+    
+    Args:
+        operation (str): "sin", "cos", "tan" (degrees), "log" or "ln"
+        value (float): Input value
+        
+    Returns:
+        Tuple[float, float]: Value and absolute error bound
+    """
+    return TABLE_FUNCTIONS[operation](value)
@@ -0,0 +1,230 @@
+"""
+Typed, streaming history export formats (NDJSON, Parquet, Arrow IPC).
+
+Each writer consumes batches of history rows and yields encoded
+chunks, so exports of any size run in constant memory.
+"""
+
+from datetime import timezone
+from typing import Iterable, Iterator, List, Optional
+import json
+
+from app.schemas.calculator import OperationType
+from app.services.result_values import split_result
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+OPERATION_TYPES = [operation.value for operation in OperationType]
+_OPERATION_CODES = {name: code for code, name in enumerate(OPERATION_TYPES)}
+
+
+def parse_numeric_result(result: str) -> Optional[float]:
+    """
+    Extract the numeric value from a stored result string.
+    
+    Results are stored as text such as ``"188.71"`` or ``"12.3456 meter"``;
+    the leading token is parsed when it is a number.
+    
+    Args:
+        result (str): Stored result
+        
+    Returns:
+        Optional[float]: Numeric value, or None if not parseable
+    """
+    return split_result(result)[0]
+
+
+def _result_value(record) -> Optional[float]:
+    # Typed column; rows not yet backfilled fall back to parsing the text
+    if record.result_value is not None:
+        return record.result_value
+    return parse_numeric_result(record.result)
+
+
+def _utc(moment):
+    if moment is not None and moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment
+
+
+def response_rows(rows: Iterable) -> List[dict]:
+    """
+    Build JSON-ready dicts of history rows, shaped like HistoryResponse.
+    
+    Used by list endpoints instead of validating a HistoryResponse per row.
+    
+    Args:
+        rows (Iterable): History rows (HistoryRepository.HISTORY_COLUMNS)
+        
+    Returns:
+        List[dict]: One dict per row, created_at in ISO 8601
+    """
+    records = []
+    fields = None
+    for row in rows:
+        if fields is None:
+            fields = row._fields
+        record = dict(zip(fields, row))
+        if record["created_at"] is not None:
+            record["created_at"] = record["created_at"].isoformat()
+        records.append(record)
+    return records
+
+
+def ndjson_chunks(batches: Iterable[List]) -> Iterator[bytes]:
+    """
+    Encode history batches as newline-delimited JSON.
+    
+    Args:
+        batches (Iterable[List]): Batches of history rows
+        
+    Yields:
+        bytes: One chunk per batch
+    """
+    for batch in batches:
+        lines = []
+        for record in batch:
+            row = {
+                "id": record.id,
+                "operation_type": record.operation_type,
+                "expression": record.expression,
+                "result": record.result,
+                "result_value": _result_value(record),
+                "result_unit": record.result_unit,
+                "inputs": record.inputs,
+                "created_at": _utc(record.created_at).isoformat() if record.created_at else None,
+            }
+            if orjson is not None:
+                lines.append(orjson.dumps(row))
+            else:
+                lines.append(json.dumps(row, ensure_ascii=False).encode("utf-8"))
+        yield b"\n".join(lines) + b"\n"
+
+
+class _ChunkSink:
+    """
+    Write-only file object that hands out what was written since last drain.
+    
+    ``tell`` reports the total bytes written, which Parquet needs for its
+    column chunk offsets.
+    """
+    
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+        self.closed = False
+    
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+    
+    def tell(self) -> int:
+        return self._position
+    
+    def flush(self):
+        pass
+    
+    def close(self):
+        self.closed = True
+    
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def arrow_schema():
+    """
+    Get the typed Arrow schema for history exports.
+    
+    Returns:
+        pyarrow.Schema: Export schema
+    """
+    import pyarrow as pa
+    
+    return pa.schema([
+        pa.field("id", pa.int64(), nullable=False),
+        pa.field("operation_type", pa.dictionary(pa.int8(), pa.string()), nullable=False),
+        pa.field("expression", pa.string(), nullable=False),
+        pa.field("result", pa.string(), nullable=False),
+        pa.field("result_value", pa.float64()),
+        pa.field("result_unit", pa.string()),
+        pa.field("created_at", pa.timestamp("us", tz="UTC")),
+    ])
+
+
+def _record_batch(batch: List, schema):
+    import pyarrow as pa
+    
+    # Fixed dictionary so every batch shares the same enum encoding
+    operation_dictionary = pa.array(OPERATION_TYPES, type=pa.string())
+    operation_indices = pa.array(
+        [_OPERATION_CODES[record.operation_type] for record in batch],
+        type=pa.int8()
+    )
+    
+    return pa.RecordBatch.from_arrays(
+        [
+            pa.array([record.id for record in batch], type=pa.int64()),
+            pa.DictionaryArray.from_arrays(operation_indices, operation_dictionary),
+            pa.array([record.expression for record in batch], type=pa.string()),
+            pa.array([record.result for record in batch], type=pa.string()),
+            pa.array([_result_value(record) for record in batch], type=pa.float64()),
+            pa.array([record.result_unit for record in batch], type=pa.string()),
+            pa.array([_utc(record.created_at) for record in batch], type=pa.timestamp("us", tz="UTC")),
+        ],
+        schema=schema
+    )
+
+
+def parquet_chunks(batches: Iterable[List]) -> Iterator[bytes]:
+    """
+    Encode history batches as a Parquet file, one row group per batch.
+    
+    Args:
+        batches (Iterable[List]): Batches of CalculationHistory records
+        
+    Yields:
+        bytes: File chunks; the last one carries the Parquet footer
+    """
+    import pyarrow.parquet as pq
+    
+    schema = arrow_schema()
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        for batch in batches:
+            writer.write_batch(_record_batch(batch, schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def arrow_stream_chunks(batches: Iterable[List]) -> Iterator[bytes]:
+    """
+    Encode history batches in the Arrow IPC streaming format.
+    
+    Args:
+        batches (Iterable[List]): Batches of CalculationHistory records
+        
+    Yields:
+        bytes: Stream chunks, one per record batch
+    """
+    import pyarrow as pa
+    
+    schema = arrow_schema()
+    sink = _ChunkSink()
+    writer = pa.ipc.new_stream(sink, schema)
+    try:
+        for batch in batches:
+            writer.write_batch(_record_batch(batch, schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
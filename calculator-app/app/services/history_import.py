@@ -0,0 +1,167 @@
+"""
+Parsing and validation for bulk history imports (CSV / NDJSON).
+
+Accepts the files produced by our own exports as well as other systems,
+as long as they carry an operation type, expression and result column.
+"""
+
+from datetime import datetime, timezone
+from typing import IO, Iterator, Optional, Tuple
+import csv
+import json
+
+from app.schemas.calculator import OperationType
+from app.services.result_values import split_result
+
+# Accepted column names (lower-cased) for each field
+COLUMN_ALIASES = {
+    "operation_type": ("operation_type", "operation type", "type", "operation"),
+    "expression": ("expression",),
+    "result": ("result",),
+    "created_at": ("created_at", "timestamp", "date/time", "datetime"),
+}
+
+OPERATION_TYPES = {operation.value for operation in OperationType}
+
+# Matches the CalculationHistory.result column size
+MAX_RESULT_LENGTH = 255
+
+
+class ImportRowError(ValueError):
+    """Raised when a source row cannot be imported."""
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str] = None) -> str:
+    """
+    Guess the import format from the file name or content type.
+    
+    Args:
+        filename (Optional[str]): Uploaded file name
+        content_type (Optional[str]): Uploaded content type
+        
+    Returns:
+        str: "csv" or "ndjson"
+        
+    Raises:
+        ValueError: If the format cannot be determined
+    """
+    name = (filename or "").lower()
+    if name.endswith((".ndjson", ".jsonl")) or content_type in ("application/x-ndjson", "application/jsonl"):
+        return "ndjson"
+    if name.endswith(".csv") or content_type in ("text/csv", "application/csv"):
+        return "csv"
+    raise ValueError("Cannot detect import format; use a .csv or .ndjson file")
+
+
+def iter_source_rows(stream: IO[str], source_format: str) -> Iterator[Tuple[int, object]]:
+    """
+    Iterate over raw rows of a CSV or NDJSON text stream.
+    
+    Args:
+        stream (IO[str]): Text stream
+        source_format (str): "csv" or "ndjson"
+        
+    Yields:
+        Tuple[int, object]: Line number and the raw row (dict), or an
+            ImportRowError if the line could not be decoded
+    """
+    if source_format == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    elif source_format == "ndjson":
+        for line_number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, ImportRowError(f"Invalid JSON: {e.msg}")
+                continue
+            if not isinstance(row, dict):
+                yield line_number, ImportRowError("Expected a JSON object")
+                continue
+            yield line_number, row
+    else:
+        raise ValueError(f"Unsupported import format: {source_format}")
+
+
+def _field(row: dict, field: str):
+    for alias in COLUMN_ALIASES[field]:
+        if alias in row:
+            return row[alias]
+    return None
+
+
+def _parse_timestamp(value) -> Optional[datetime]:
+    if value in (None, ""):
+        return None
+    try:
+        moment = datetime.fromisoformat(str(value).strip())
+    except ValueError:
+        raise ImportRowError(f"Invalid timestamp: {value!r}")
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+
+def _parse_inputs(value) -> Optional[dict]:
+    if value in (None, ""):
+        return None
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except json.JSONDecodeError:
+            raise ImportRowError("Invalid inputs: expected a JSON object")
+    if not isinstance(value, dict):
+        raise ImportRowError("Invalid inputs: expected a JSON object")
+    return value
+
+
+def validate_row(row: dict) -> dict:
+    """
+    Validate a raw row and convert it into insert values.
+    
+    Args:
+        row (dict): Raw source row
+        
+    Returns:
+        dict: Values for CalculationHistory (without user_id)
+        
+    Raises:
+        ImportRowError: If the row is invalid
+    """
+    row = {str(key).strip().lower(): value for key, value in row.items()}
+    operation_type = _field(row, "operation_type")
+    expression = _field(row, "expression")
+    result = _field(row, "result")
+    
+    operation_type = str(operation_type).strip() if operation_type is not None else ""
+    if operation_type not in OPERATION_TYPES:
+        raise ImportRowError(f"Unknown operation type: {operation_type!r}")
+    
+    if expression in (None, ""):
+        raise ImportRowError("Missing expression")
+    
+    if result in (None, ""):
+        raise ImportRowError("Missing result")
+    result = str(result)
+    if len(result) > MAX_RESULT_LENGTH:
+        raise ImportRowError(f"Result longer than {MAX_RESULT_LENGTH} characters")
+    
+    result_value, result_unit = split_result(result)
+    
+    values = {
+        "operation_type": operation_type,
+        "expression": str(expression),
+        "result": result,
+        "result_value": result_value,
+        "result_unit": result_unit,
+        "inputs": _parse_inputs(row.get("inputs")),
+    }
+    
+    # Always set created_at so every row in a multi-row INSERT has the same keys
+    created_at = _parse_timestamp(_field(row, "created_at"))
+    values["created_at"] = created_at if created_at is not None else datetime.utcnow()
+    
+    return values
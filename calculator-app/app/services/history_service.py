@@ -2,18 +2,31 @@
 Service layer for calculation history operations.
 """
 
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional, Tuple
 import logging
-from datetime import datetime
+from datetime import date, datetime
 import csv
 import io
 
+from sqlalchemy.engine import Row
+
 from app.repositories.history_repository import HistoryRepository
-from app.schemas.history import HistoryResponse, HistoryFilter, HistoryDelete
+from app.schemas.history import (
+    HistoryResponse, HistoryFilter, HistoryDelete, HistoryExportFilter,
+    HistoryAggregateFilter, HistoryAggregate, HistoryBucketAggregate, HistoryAggregateResponse,
+    HistorySyncItem
+)
+from app.services import history_export
+from app.services.calculator_service import CalculatorService
+from app.services.history_import import ImportRowError, validate_row
+from app.services.history_sync import SyncItemError, calculation_values
+from app.services.result_values import split_result
+from app.tracing import traced_methods
 
 logger = logging.getLogger(__name__)
 
 
+@traced_methods("service")
 class HistoryService:
     """
     Service class for calculation history operations.
@@ -23,7 +36,14 @@ class HistoryService:
         get_user_history: Get user's calculation history
         delete_history: Delete history records
         export_to_csv: Export history to CSV format
+        export_to_ndjson: Stream history as NDJSON
+        export_to_parquet: Stream history as Parquet
+        export_to_arrow: Stream history as Arrow IPC
+        import_history: Bulk import history rows
+        sync_calculations: Add a batch of client calculations
         get_history_stats: Get statistics about user's history
+        aggregate_history: Get per-bucket/per-operation aggregates
+        get_history_version: Get version/last-modified of user's history
     """
     
     def __init__(self, history_repository: HistoryRepository):
@@ -36,25 +56,42 @@ class HistoryService:
         self.history_repository = history_repository
     
     def add_to_history(self, user_id: int, operation_type: str, 
-                      expression: str, result: str) -> HistoryResponse:
+                      expression: str, result: str,
+                      result_value: Optional[float] = None,
+                      result_unit: Optional[str] = None,
+                      inputs: Optional[dict] = None) -> HistoryResponse:
         """
         Add calculation to user's history.
         
+        The typed value and unit are parsed from the result text when not
+        given explicitly.
+        
         Args:
             user_id (int): User ID
             operation_type (str): Type of operation
             expression (str): Mathematical expression
             result (str): Calculation result
+            result_value (Optional[float]): Numeric result value
+            result_unit (Optional[str]): Result unit
+            inputs (Optional[dict]): Structured calculation inputs
             
         Returns:
             HistoryResponse: Created history record
         """
         try:
+            if result_value is None:
+                parsed_value, parsed_unit = split_result(str(result))
+                result_value = parsed_value
+                result_unit = result_unit or parsed_unit
+            
             history = self.history_repository.create_history(
                 user_id=user_id,
                 operation_type=operation_type,
                 expression=expression,
-                result=str(result)
+                result=str(result),
+                result_value=result_value,
+                result_unit=result_unit,
+                inputs=inputs
             )
             
             return HistoryResponse.from_orm(history)
@@ -63,24 +100,23 @@ class HistoryService:
             logger.error(f"Error adding to history for user {user_id}: {str(e)}")
             raise
     
-    def get_user_history(self, user_id: int, filters: HistoryFilter) -> List[HistoryResponse]:
+    def get_user_history(self, user_id: int, filters: HistoryFilter) -> List[Row]:
         """
         Get user's calculation history with filters.
         
+        Rows are column projections, read by attribute like entities but
+        without ORM hydration; ``history_export.response_rows`` turns them
+        into response dicts.
+        
         Args:
             user_id (int): User ID
             filters (HistoryFilter): Filter criteria
             
         Returns:
-            List[HistoryResponse]: List of history records
+            List[Row]: History rows (the fields of HistoryResponse)
         """
         try:
-            history_records = self.history_repository.get_user_history(user_id, filters)
-            
-            return [
-                HistoryResponse.from_orm(record) 
-                for record in history_records
-            ]
+            return self.history_repository.get_user_history(user_id, filters)
             
         except Exception as e:
             logger.error(f"Error getting history for user {user_id}: {str(e)}")
@@ -150,6 +186,163 @@ class HistoryService:
             logger.error(f"Error exporting history for user {user_id}: {str(e)}")
             raise
     
+    def export_to_ndjson(self, user_id: int, filters: HistoryExportFilter) -> Iterator[bytes]:
+        """
+        Stream user's history as newline-delimited JSON with typed fields.
+        
+        Args:
+            user_id (int): User ID
+            filters (HistoryExportFilter): Filter criteria
+            
+        Returns:
+            Iterator[bytes]: Encoded chunks
+        """
+        batches = self.history_repository.iter_user_history(user_id, filters)
+        return history_export.ndjson_chunks(batches)
+    
+    def export_to_parquet(self, user_id: int, filters: HistoryExportFilter) -> Iterator[bytes]:
+        """
+        Stream user's history as a Parquet file with typed columns.
+        
+        Args:
+            user_id (int): User ID
+            filters (HistoryExportFilter): Filter criteria
+            
+        Returns:
+            Iterator[bytes]: Encoded chunks
+        """
+        batches = self.history_repository.iter_user_history(user_id, filters)
+        return history_export.parquet_chunks(batches)
+    
+    def export_to_arrow(self, user_id: int, filters: HistoryExportFilter) -> Iterator[bytes]:
+        """
+        Stream user's history in the Arrow IPC streaming format.
+        
+        Args:
+            user_id (int): User ID
+            filters (HistoryExportFilter): Filter criteria
+            
+        Returns:
+            Iterator[bytes]: Encoded chunks
+        """
+        batches = self.history_repository.iter_user_history(user_id, filters)
+        return history_export.arrow_stream_chunks(batches)
+    
+    def import_history(self, user_id: int, source_rows: Iterable[Tuple[int, object]],
+                       resume_from_line: int = 0, chunk_size: int = 5000,
+                       max_errors: int = 100) -> dict:
+        """
+        Bulk import history rows in chunked transactions.
+        
+        Each chunk of valid rows is committed on its own, so a failure only
+        loses the chunk in flight. The result reports the last committed
+        source line; pass it back as ``resume_from_line`` to continue.
+        Invalid rows are skipped and reported individually.
+        
+        Args:
+            user_id (int): User ID
+            source_rows (Iterable[Tuple[int, object]]): (line number, raw row)
+                pairs, as produced by history_import.iter_source_rows
+            resume_from_line (int): Skip source lines up to and including this one
+            chunk_size (int): Rows per transaction
+            max_errors (int): Maximum number of row errors to report
+            
+        Returns:
+            dict: Import summary
+        """
+        imported = 0
+        failed = 0
+        errors = []
+        chunk = []
+        chunk_last_line = resume_from_line
+        committed_line = resume_from_line
+        
+        def record_error(line_number, message):
+            nonlocal failed
+            failed += 1
+            if len(errors) < max_errors:
+                errors.append({"line": line_number, "error": message})
+        
+        def flush():
+            nonlocal imported, committed_line, chunk
+            imported += self.history_repository.bulk_create_history(user_id, chunk)
+            committed_line = chunk_last_line
+            chunk = []
+        
+        try:
+            for line_number, row in source_rows:
+                if line_number <= resume_from_line:
+                    continue
+                
+                chunk_last_line = line_number
+                if isinstance(row, ImportRowError):
+                    record_error(line_number, str(row))
+                    continue
+                
+                try:
+                    chunk.append(validate_row(row))
+                except ImportRowError as e:
+                    record_error(line_number, str(e))
+                    continue
+                
+                if len(chunk) >= chunk_size:
+                    flush()
+            
+            flush()
+            committed_line = chunk_last_line
+            completed = True
+        
+        except Exception as e:
+            logger.error(f"Import aborted for user {user_id} after line {committed_line}: {str(e)}")
+            completed = False
+            errors.append({"line": None, "error": f"Import aborted: {str(e)}"})
+        
+        return {
+            "imported": imported,
+            "failed": failed,
+            "errors": errors,
+            "last_committed_line": committed_line,
+            "completed": completed
+        }
+    
+    def sync_calculations(self, user_id: int, items: List[HistorySyncItem]) -> dict:
+        """
+        Add a batch of calculations done on the client in one transaction.
+        
+        Each item is recomputed on the server; items that fail are skipped
+        and reported by their position in the batch.
+        
+        Args:
+            user_id (int): User ID
+            items (List[HistorySyncItem]): Client calculations
+            
+        Returns:
+            dict: Number of rows created and per-item errors
+        """
+        calculator_service = CalculatorService()
+        rows = []
+        errors = []
+        
+        for index, item in enumerate(items):
+            try:
+                rows.append(calculation_values(
+                    item.kind, item.inputs, item.created_at, calculator_service
+                ))
+            except SyncItemError as e:
+                errors.append({"index": index, "error": str(e)})
+        
+        try:
+            created = self.history_repository.bulk_create_history(user_id, rows)
+        except Exception as e:
+            logger.error(f"Error syncing calculations for user {user_id}: {str(e)}")
+            raise
+        
+        return {
+            "created": created,
+            "failed": len(errors),
+            "errors": errors
+        }
+    
     def get_history_stats(self, user_id: int) -> dict:
         """
         Get statistics about user's calculation history.
@@ -181,4 +374,92 @@ class HistoryService:
             
         except Exception as e:
             logger.error(f"Error getting stats for user {user_id}: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+    
+    def aggregate_history(self, user_id: int,
+                          filters: HistoryAggregateFilter) -> HistoryAggregateResponse:
+        """
+        Get counts, sums and averages of numeric results per time bucket
+        and operation type.
+        
+        Grouping runs in SQL; only the (small) grouped rows are combined
+        here into per-operation totals.
+        
+        Args:
+            user_id (int): User ID
+            filters (HistoryAggregateFilter): Bucket size and filter criteria
+            
+        Returns:
+            HistoryAggregateResponse: Aggregated history
+        """
+        try:
+            rows = self.history_repository.aggregate_user_history(user_id, filters)
+            
+            buckets = []
+            totals = {}
+            for bucket_start, operation_type, count, numeric_count, total, avg, low, high in rows:
+                buckets.append(HistoryBucketAggregate(
+                    bucket_start=_bucket_datetime(bucket_start),
+                    operation_type=operation_type,
+                    count=count,
+                    numeric_count=numeric_count,
+                    sum=total,
+                    avg=avg,
+                    min=low,
+                    max=high
+                ))
+                
+                entry = totals.setdefault(operation_type, {
+                    "count": 0, "numeric_count": 0, "sum": None, "min": None, "max": None
+                })
+                entry["count"] += count
+                entry["numeric_count"] += numeric_count
+                if numeric_count:
+                    entry["sum"] = (entry["sum"] or 0.0) + total
+                    entry["min"] = low if entry["min"] is None else min(entry["min"], low)
+                    entry["max"] = high if entry["max"] is None else max(entry["max"], high)
+            
+            by_operation = [
+                HistoryAggregate(
+                    operation_type=operation_type,
+                    avg=entry["sum"] / entry["numeric_count"] if entry["numeric_count"] else None,
+                    **entry
+                )
+                for operation_type, entry in sorted(totals.items())
+            ]
+            
+            return HistoryAggregateResponse(
+                bucket=filters.bucket,
+                total_calculations=sum(entry["count"] for entry in totals.values()),
+                by_operation=by_operation,
+                buckets=buckets
+            )
+        
+        except Exception as e:
+            logger.error(f"Error aggregating history for user {user_id}: {str(e)}")
+            raise
+    
+    def get_history_version(self, user_id: int) -> Tuple[int, Optional[datetime]]:
+        """
+        Get the version and last modification time of user's history.
+        
+        Args:
+            user_id (int): User ID
+            
+        Returns:
+            Tuple[int, Optional[datetime]]: Version (0 if never written) and
+                last modification time (None if never written)
+        """
+        record = self.history_repository.get_history_version(user_id)
+        if record is None:
+            return 0, None
+        return record.version, record.updated_at
+
+
+def _bucket_datetime(value) -> datetime:
+    """Normalize a bucket start from the database (string/date/datetime)."""
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    return datetime.fromisoformat(str(value))
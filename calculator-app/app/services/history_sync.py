@@ -0,0 +1,88 @@
+"""
+History rows for calculations evaluated on the client.
+
+The offline frontend evaluates operations locally and later sends their
+inputs in batches. Every item is recomputed here with CalculatorService, so
+history always holds server results, formatted as the calculator
+endpoints store them.
+"""
+
+from datetime import datetime, timezone
+from typing import Optional
+
+from pydantic import ValidationError
+
+from app.schemas.calculator import (
+    BasicOperation, AdvancedOperation, ConversionRequest, FinanceRequest
+)
+from app.services.calculator_service import CalculatorService
+from app.services.result_values import numeric_value
+
+# Request schema and CalculatorService method for each item kind
+CALCULATION_KINDS = {
+    "basic": (BasicOperation, "calculate_basic"),
+    "advanced": (AdvancedOperation, "calculate_advanced"),
+    "conversion": (ConversionRequest, "convert_units"),
+    "finance": (FinanceRequest, "calculate_finance"),
+}
+
+
+class SyncItemError(ValueError):
+    """Raised when a client calculation cannot be added to history."""
+
+
+def _sync_timestamp(created_at: Optional[datetime], now: datetime) -> datetime:
+    if created_at is None:
+        return now
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+    # Client clocks may run ahead; never store history in the future
+    return min(created_at, now)
+
+
+def calculation_values(kind: str, inputs: dict, created_at: Optional[datetime] = None,
+                       calculator_service: Optional[CalculatorService] = None) -> dict:
+    """
+    Recompute a client calculation and convert it into insert values.
+    
+    Args:
+        kind (str): "basic", "advanced", "conversion" or "finance"
+        inputs (dict): Request body of the matching calculator endpoint
+        created_at (Optional[datetime]): When the client did the calculation
+        calculator_service (Optional[CalculatorService]): Service to reuse
+        
+    Returns:
+        dict: Values for CalculationHistory (without user_id)
+        
+    Raises:
+        SyncItemError: If the inputs are invalid or the calculation fails
+    """
+    schema, method = CALCULATION_KINDS[kind]
+    calculator_service = calculator_service or CalculatorService()
+    
+    try:
+        request = schema.model_validate(inputs)
+        response = getattr(calculator_service, method)(request)
+    except ValidationError as e:
+        raise SyncItemError(f"Invalid inputs: {e.errors()[0]['msg']}")
+    except (ValueError, ArithmeticError, TypeError) as e:
+        raise SyncItemError(str(e))
+    
+    result_unit = None
+    if kind == "conversion":
+        result = f"{response.result:.4f} {request.to_unit}"
+        result_unit = request.to_unit
+    elif kind == "finance":
+        result = f"{response.result:.2f}"
+    else:
+        result = str(response.result)
+    
+    return {
+        "operation_type": response.operation_type.value,
+        "expression": response.expression,
+        "result": result,
+        "result_value": numeric_value(response.result),
+        "result_unit": result_unit,
+        "inputs": request.model_dump(mode="json"),
+        "created_at": _sync_timestamp(created_at, datetime.utcnow()),
+    }
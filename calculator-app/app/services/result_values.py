@@ -0,0 +1,60 @@
+"""
+Typed values extracted from stored calculation results.
+
+Results are stored as display text such as ``"188.71"`` or
+``"12.3456 meter"``; these helpers split them into the numeric value and
+unit kept in the typed history columns.
+"""
+
+from typing import Optional, Tuple
+import math
+
+# Matches the CalculationHistory.result_unit column size
+MAX_UNIT_LENGTH = 50
+
+
+def split_result(result: Optional[str]) -> Tuple[Optional[float], Optional[str]]:
+    """
+    Split a stored result string into its numeric value and unit.
+    
+    Args:
+        result (Optional[str]): Stored result, e.g. "12.3456 meter"
+        
+    Returns:
+        Tuple[Optional[float], Optional[str]]: Finite numeric value and unit;
+            (None, None) if the result does not start with a number
+    """
+    if not result:
+        return None, None
+    
+    parts = str(result).strip().split(None, 1)
+    if not parts:
+        return None, None
+    
+    try:
+        value = float(parts[0])
+    except ValueError:
+        return None, None
+    if not math.isfinite(value):
+        return None, None
+    
+    unit = parts[1].strip() if len(parts) > 1 else None
+    if unit is not None and len(unit) > MAX_UNIT_LENGTH:
+        unit = None
+    return value, unit or None
+
+
+def numeric_value(value) -> Optional[float]:
+    """
+    Convert a calculation result to a finite float, if it is numeric.
+    
+    Args:
+        value: Raw result (float, int, or anything else)
+        
+    Returns:
+        Optional[float]: Finite float, or None
+    """
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    value = float(value)
+    return value if math.isfinite(value) else None
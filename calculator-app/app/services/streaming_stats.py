@@ -0,0 +1,619 @@
+"""
+Single-pass descriptive statistics over datasets of any size.
+
+Datasets arrive as a JSON array, a CSV upload or a ``.npy`` upload and are
+consumed as a stream of NumPy chunks, so memory stays bounded however many
+values there are:
+
+- Count, mean, variance, min and max are kept with Welford's algorithm,
+  merged one chunk at a time (Chan et al.). There is no catastrophic
+  cancellation as with sum / sum of squares.
+- Regression keeps the co-moment of x and y the same way.
+- Quantiles (median, percentiles) and histograms are exact while the
+  dataset has at most ``exact_limit`` values, which are kept. Beyond that,
+  the values move into a t-digest, and quantiles are estimates (rank
+  error within a fraction of a percent, smallest at the tails).
+
+``evaluate`` returns the result, the expression and a small summary that is
+stored in history instead of the data.
+"""
+
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import csv
+import itertools
+import math
+
+import numpy as np
+
+CHUNK_SIZE = 65536
+# Largest .npy header we accept (numpy itself limits headers to 10000 bytes)
+MAX_NPY_HEADER = 10000
+
+STATISTICS_OPERATIONS = (
+    "summary", "mean", "median", "stdev", "variance", "percentiles", "histogram", "regression"
+)
+
+
+class TDigest:
+    """
+    Merging t-digest (Dunning) of a stream of values.
+    
+    Incoming values are buffered and merged with the centroids in one
+    vectorized pass: sorted by value, each point is assigned to a cluster
+    by the k1 scale function of its quantile, so clusters are small at the
+    tails and large around the median. About ``compression / 2`` centroids
+    are kept.
+    
+    Attributes:
+        compression (float): Accuracy parameter (delta)
+        count (int): Number of values added
+    """
+    
+    def __init__(self, compression: float = 500, buffer_size: Optional[int] = None):
+        self.compression = compression
+        self.buffer_size = buffer_size or int(50 * compression)
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._means = np.empty(0)
+        self._weights = np.empty(0)
+        self._buffer: List[np.ndarray] = []
+        self._buffered = 0
+    
+    def update(self, values: np.ndarray) -> None:
+        """
+        Add values to the digest.
+        
+        Args:
+            values (np.ndarray): 1-D float64 array
+        """
+        if values.size == 0:
+            return
+        self.count += values.size
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self._buffer.append(values)
+        self._buffered += values.size
+        if self._buffered >= self.buffer_size:
+            self._compress()
+    
+    def _compress(self) -> None:
+        if not self._buffer:
+            return
+        means = np.concatenate([self._means] + self._buffer)
+        weights = np.concatenate([self._weights, np.ones(self._buffered)])
+        self._buffer, self._buffered = [], 0
+        
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+        cumulative = np.cumsum(weights)
+        quantiles = (cumulative - weights / 2) / cumulative[-1]
+        k = self.compression / (2 * math.pi) * np.arcsin(2 * quantiles - 1)
+        # k is non-decreasing, so each cluster is a run of consecutive points
+        _, starts = np.unique(np.floor(k), return_index=True)
+        self._weights = np.add.reduceat(weights, starts)
+        self._means = np.add.reduceat(means * weights, starts) / self._weights
+    
+    def _positions(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Centroid means and cumulative weights at their centers, with min and max."""
+        self._compress()
+        centers = np.cumsum(self._weights) - self._weights / 2
+        positions = np.concatenate(([0.0], centers, [float(self.count)]))
+        values = np.concatenate(([self.min], self._means, [self.max]))
+        return positions, values
+    
+    def quantiles(self, fractions: Sequence[float]) -> np.ndarray:
+        """
+        Estimate quantiles.
+        
+        Args:
+            fractions (Sequence[float]): Quantiles in [0, 1]
+            
+        Returns:
+            np.ndarray: Estimated values
+        """
+        positions, values = self._positions()
+        return np.interp(np.asarray(fractions) * self.count, positions, values)
+    
+    def cdf(self, points: np.ndarray) -> np.ndarray:
+        """
+        Estimate the number of values below each point.
+        
+        Args:
+            points (np.ndarray): Values
+            
+        Returns:
+            np.ndarray: Estimated counts
+        """
+        positions, values = self._positions()
+        return np.interp(points, values, positions)
+    
+    def centroid_count(self) -> int:
+        """Number of centroids after merging the buffer."""
+        self._compress()
+        return int(self._means.size)
+
+
+class StreamingStatistics:
+    """
+    Moments, extrema and quantiles of a stream of values.
+    
+    Attributes:
+        count (int): Number of values
+        mean (float): Running mean
+        min (float): Smallest value
+        max (float): Largest value
+    """
+    
+    def __init__(self, exact_limit: int = 100000, compression: float = 500,
+                 histogram_edges: Optional[np.ndarray] = None, track_quantiles: bool = True):
+        self.exact_limit = exact_limit
+        self.compression = compression
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.histogram_edges = histogram_edges
+        self.histogram_counts = None if histogram_edges is None else np.zeros(len(histogram_edges) - 1, dtype=np.int64)
+        self.track_quantiles = track_quantiles
+        self._values: Optional[List[np.ndarray]] = []
+        self._digest: Optional[TDigest] = None
+    
+    @property
+    def exact(self) -> bool:
+        """True while every value is kept (quantiles are exact)."""
+        return self._digest is None
+    
+    def update(self, values: np.ndarray) -> None:
+        """
+        Add a chunk of values.
+        
+        Args:
+            values (np.ndarray): 1-D float64 array of finite values
+        """
+        n = values.size
+        if n == 0:
+            return
+        
+        chunk_mean = float(values.mean())
+        chunk_m2 = float(np.square(values - chunk_mean).sum())
+        total = self.count + n
+        delta = chunk_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += chunk_m2 + delta * delta * self.count * n / total
+        self.count = total
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        
+        if self.histogram_counts is not None:
+            self.histogram_counts += np.histogram(values, bins=self.histogram_edges)[0]
+        
+        if not self.track_quantiles:
+            return
+        if self._digest is None:
+            self._values.append(values)
+            if self.count > self.exact_limit:
+                self._digest = TDigest(self.compression)
+                for kept in self._values:
+                    self._digest.update(kept)
+                self._values = None
+        else:
+            self._digest.update(values)
+    
+    def variance(self, population: bool = False) -> float:
+        """
+        Variance of the values.
+        
+        Args:
+            population (bool): Population (n) instead of sample (n - 1)
+            
+        Returns:
+            float: Variance
+            
+        Raises:
+            ValueError: If there are too few values
+        """
+        ddof = 0 if population else 1
+        if self.count <= ddof:
+            raise ValueError("Sample variance requires at least two values")
+        return max(self.m2, 0.0) / (self.count - ddof)
+    
+    def quantiles(self, fractions: Sequence[float]) -> List[float]:
+        """
+        Quantiles of the values (linear interpolation between order
+        statistics when exact, like numpy.percentile).
+        
+        Args:
+            fractions (Sequence[float]): Quantiles in [0, 1]
+            
+        Returns:
+            List[float]: Quantile values
+        """
+        if self._digest is not None:
+            return self._digest.quantiles(fractions).tolist()
+        return np.quantile(np.concatenate(self._values), fractions).tolist()
+    
+    def histogram(self, bins: int) -> Tuple[List[float], List[int]]:
+        """
+        Histogram of the values.
+        
+        Counts are exact when the bin edges were given up front or all
+        values were kept; otherwise they are estimated from the t-digest.
+        
+        Args:
+            bins (int): Number of equal-width bins over [min, max]
+            
+        Returns:
+            Tuple[List[float], List[int]]: Bin edges and counts
+        """
+        if self.histogram_counts is not None:
+            return self.histogram_edges.tolist(), self.histogram_counts.tolist()
+        
+        edges = np.linspace(self.min, self.max, bins + 1)
+        if self._digest is None:
+            counts = np.histogram(np.concatenate(self._values), bins=edges)[0]
+            return edges.tolist(), counts.tolist()
+        
+        cumulative = self._digest.cdf(edges)
+        cumulative[0], cumulative[-1] = 0.0, float(self.count)
+        counts = np.diff(np.round(cumulative)).astype(np.int64)
+        return edges.tolist(), counts.tolist()
+    
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summary stored in history in place of the dataset.
+        
+        Returns:
+            Dict[str, Any]: count, mean, stdev (sample), min, max, exact
+        """
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "stdev": math.sqrt(self.variance()) if self.count > 1 else None,
+            "min": self.min,
+            "max": self.max,
+            "exact": self.exact,
+        }
+
+
+class StreamingRegression:
+    """
+    Least-squares line y = slope * x + intercept over a stream of pairs.
+    """
+    
+    def __init__(self):
+        self.x = StreamingStatistics(track_quantiles=False)
+        self.y = StreamingStatistics(track_quantiles=False)
+        self.comoment = 0.0
+    
+    def update(self, x: np.ndarray, y: np.ndarray) -> None:
+        """
+        Add a chunk of pairs.
+        
+        Args:
+            x (np.ndarray): x values
+            y (np.ndarray): y values, same length
+        """
+        n = x.size
+        if n == 0:
+            return
+        previous = self.x.count
+        delta_x = float(x.mean()) - self.x.mean
+        delta_y = float(y.mean()) - self.y.mean
+        self.comoment += (float(np.dot(x - x.mean(), y - y.mean()))
+                          + delta_x * delta_y * previous * n / (previous + n))
+        self.x.update(x)
+        self.y.update(y)
+    
+    def result(self) -> Dict[str, Any]:
+        """
+        Fitted line.
+        
+        Returns:
+            Dict[str, Any]: slope, intercept, r, r_squared and count;
+            r and r_squared are None when every y is equal (the correlation
+            is undefined, though the flat line fits exactly)
+            
+        Raises:
+            ValueError: With fewer than two pairs or constant x
+        """
+        if self.x.count < 2:
+            raise ValueError("Regression requires at least two points")
+        if self.x.m2 == 0:
+            raise ValueError("Regression requires at least two distinct x values")
+        slope = self.comoment / self.x.m2
+        intercept = self.y.mean - slope * self.x.mean
+        r = None
+        if self.y.m2 > 0:
+            r = max(-1.0, min(1.0, self.comoment / math.sqrt(self.x.m2 * self.y.m2)))
+        return {
+            "slope": slope,
+            "intercept": intercept,
+            "r": r,
+            "r_squared": r * r if r is not None else None,
+            "count": self.x.count,
+        }
+
+
+def _finite(chunk: np.ndarray) -> np.ndarray:
+    if not np.isfinite(chunk).all():
+        raise ValueError("Dataset must contain finite numbers only")
+    return chunk
+
+
+def iter_array_chunks(values: Sequence[float], x: Optional[Sequence[float]] = None,
+                      paired: bool = False) -> Iterator[np.ndarray]:
+    """
+    Chunks of a dataset given as JSON arrays.
+    
+    Args:
+        values (Sequence[float]): Values (y for regression)
+        x (Optional[Sequence[float]]): x values for regression
+        paired (bool): Yield (n, 2) [x, y] chunks (x defaults to 0, 1, 2...)
+        
+    Yields:
+        np.ndarray: 1-D chunks, or (n, 2) chunks when paired
+    """
+    y = np.asarray(values, dtype=np.float64)
+    if paired:
+        x = np.arange(y.size, dtype=np.float64) if x is None else np.asarray(x, dtype=np.float64)
+        if x.size != y.size:
+            raise ValueError("x and values must have the same length")
+        data = np.column_stack((x, y))
+    else:
+        data = y
+    for start in range(0, len(data), CHUNK_SIZE):
+        yield _finite(data[start:start + CHUNK_SIZE])
+
+
+def _resolve_column(column: Optional[str], header: Optional[List[str]], default: int) -> int:
+    if column is None or column == "":
+        return default
+    if column.isdigit():
+        return int(column)
+    if header is not None:
+        names = [name.strip().lower() for name in header]
+        if column.strip().lower() in names:
+            return names.index(column.strip().lower())
+    raise ValueError(f"Unknown CSV column: {column}")
+
+
+def iter_csv_chunks(stream: IO[str], column: Optional[str] = None, x_column: Optional[str] = None,
+                    paired: bool = False) -> Iterator[np.ndarray]:
+    """
+    Chunks of a numeric column (or x/y columns) of a CSV text stream.
+    
+    A first row that is not numeric is taken as the header. Rows with an
+    empty value are skipped; other non-numeric values are an error.
+    
+    Args:
+        stream (IO[str]): CSV text
+        column (Optional[str]): Value (y) column name or 0-based index;
+            defaults to the first column, or the second for paired data
+            with at least two columns
+        x_column (Optional[str]): x column for regression; defaults to the
+            first column when there are two or more, else the row number
+        paired (bool): Yield (n, 2) [x, y] chunks
+        
+    Yields:
+        np.ndarray: 1-D chunks, or (n, 2) chunks when paired
+        
+    Raises:
+        ValueError: On a non-numeric value, with its line number
+    """
+    reader = csv.reader(stream)
+    first = next(reader, None)
+    if first is None:
+        return
+    
+    header = None
+    try:
+        [float(cell) for cell in first if cell.strip()]
+    except ValueError:
+        header = first
+    
+    width = len(first)
+    y_index = _resolve_column(column, header, 1 if paired and width >= 2 else 0)
+    x_index = None
+    if paired and x_column:
+        x_index = _resolve_column(x_column, header, 0)
+    elif paired and width >= 2 and y_index != 0:
+        x_index = 0
+    
+    chunk = []
+    kept = 0
+    rows = reader if header is not None else itertools.chain([first], reader)
+    for line, row in enumerate(rows, start=2 if header is not None else 1):
+        try:
+            y_cell = row[y_index].strip()
+            x_cell = row[x_index].strip() if x_index is not None else kept
+        except IndexError:
+            continue
+        if y_cell == "" or x_cell == "":
+            continue
+        try:
+            chunk.append((float(x_cell), float(y_cell)) if paired else float(y_cell))
+        except ValueError:
+            raise ValueError(f"Line {line}: non-numeric value in {row!r}")
+        kept += 1
+        
+        if len(chunk) >= CHUNK_SIZE:
+            yield _finite(np.array(chunk, dtype=np.float64))
+            chunk = []
+    if chunk:
+        yield _finite(np.array(chunk, dtype=np.float64))
+
+
+def iter_npy_chunks(stream: IO[bytes], paired: bool = False) -> Iterator[np.ndarray]:
+    """
+    Chunks of a ``.npy`` file read straight from its binary stream.
+    
+    Only the header is parsed; the data is read ``CHUNK_SIZE`` rows at a
+    time with ``numpy.frombuffer``, so the file is never loaded whole.
+    
+    Args:
+        stream (IO[bytes]): .npy file
+        paired (bool): Expect (n, 2) [x, y] rows; a 1-D array gets x = 0, 1, 2...
+        
+    Yields:
+        np.ndarray: 1-D chunks, or (n, 2) chunks when paired
+        
+    Raises:
+        ValueError: If the file is not a numeric 1-D (or (n, 2)) array
+    """
+    from numpy.lib import format as npy_format
+    
+    try:
+        version = npy_format.read_magic(stream)
+        if version == (1, 0):
+            shape, fortran_order, dtype = npy_format.read_array_header_1_0(stream, max_header_size=MAX_NPY_HEADER)
+        else:
+            shape, fortran_order, dtype = npy_format.read_array_header_2_0(stream, max_header_size=MAX_NPY_HEADER)
+    except (ValueError, OSError, EOFError) as e:
+        raise ValueError(f"Not a valid .npy file ({e})")
+    
+    if dtype.kind not in "biuf" or dtype.hasobject:
+        raise ValueError(f"Unsupported .npy dtype {dtype}")
+    columns = 1 if len(shape) == 1 else (shape[1] if len(shape) == 2 else 0)
+    if len(shape) == 2 and (fortran_order or columns not in (1, 2)):
+        raise ValueError("Expected a 1-D array, or C-ordered (n, 2) for x/y pairs")
+    if columns == 0 or (columns == 2 and not paired):
+        raise ValueError("Expected a 1-D array of values")
+    
+    rows = shape[0]
+    row_bytes = dtype.itemsize * columns
+    offset = 0
+    while offset < rows:
+        count = min(CHUNK_SIZE, rows - offset)
+        data = stream.read(count * row_bytes)
+        if len(data) < count * row_bytes:
+            raise ValueError("Truncated .npy file")
+        chunk = np.frombuffer(data, dtype=dtype).astype(np.float64)
+        if columns == 2:
+            chunk = chunk.reshape(count, 2)
+        elif paired:
+            chunk = np.column_stack((np.arange(offset, offset + count, dtype=np.float64), chunk))
+        yield _finite(chunk)
+        offset += count
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str] = None) -> str:
+    """
+    Guess the dataset format from the file name or content type.
+    
+    Args:
+        filename (Optional[str]): Uploaded file name
+        content_type (Optional[str]): Uploaded content type
+        
+    Returns:
+        str: "csv" or "npy"
+        
+    Raises:
+        ValueError: If the format cannot be determined
+    """
+    name = (filename or "").lower()
+    if name.endswith(".npy") or content_type == "application/x-npy":
+        return "npy"
+    if name.endswith((".csv", ".txt")) or content_type in ("text/csv", "application/csv", "text/plain"):
+        return "csv"
+    raise ValueError("Cannot detect dataset format; use a .csv or .npy file")
+
+
+def result_text(result: Any, limit: int = 255) -> str:
+    """
+    Display text of a result for the history result column.
+    
+    Args:
+        result (Any): Float or dict result
+        limit (int): Maximum length
+        
+    Returns:
+        str: Result text, elided to ``limit`` characters
+    """
+    if isinstance(result, dict):
+        text = ", ".join(
+            f"{key}={value:.6g}" if isinstance(value, float) else f"{key}={value}"
+            for key, value in result.items()
+        )
+    else:
+        text = str(result)
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+def evaluate(operation: str, chunks: Iterable[np.ndarray], percentiles: Sequence[float] = (25, 50, 75),
+             bins: int = 10, histogram_range: Optional[Tuple[float, float]] = None,
+             population: bool = False, exact_limit: int = 100000,
+             compression: float = 500) -> Tuple[Any, str, Dict[str, Any]]:
+    """
+    Compute a statistics operation over a stream of chunks.
+    
+    Args:
+        operation (str): summary, mean, median, stdev, variance,
+            percentiles, histogram or regression
+        chunks (Iterable[np.ndarray]): 1-D chunks, or (n, 2) [x, y] chunks
+            for regression
+        percentiles (Sequence[float]): Percentiles (0-100) to report
+        bins (int): Histogram bins
+        histogram_range (Optional[Tuple[float, float]]): Fixed histogram
+            range; counted exactly while streaming
+        population (bool): Population instead of sample stdev/variance
+        exact_limit (int): Values kept for exact quantiles
+        compression (float): t-digest compression beyond exact_limit
+        
+    Returns:
+        Tuple[Any, str, Dict[str, Any]]: Result, expression and summary;
+        ``summary["exact"]`` tells whether the result is exact
+        
+    Raises:
+        ValueError: If the dataset is empty or too small for the operation
+    """
+    if operation == "regression":
+        regression = StreamingRegression()
+        for chunk in chunks:
+            regression.update(chunk[:, 0], chunk[:, 1])
+        result = regression.result()
+        summary = {"count": result["count"], "x_mean": regression.x.mean, "y_mean": regression.y.mean, "exact": True}
+        return result, f"regression(n={result['count']})", summary
+    
+    edges = None
+    if histogram_range is not None:
+        edges = np.linspace(histogram_range[0], histogram_range[1], bins + 1)
+    # Values are only kept (or digested) for operations that need quantiles;
+    # a histogram over a fixed range is counted while streaming
+    track_quantiles = operation in ("median", "percentiles", "summary") or (
+        operation == "histogram" and edges is None
+    )
+    stats = StreamingStatistics(exact_limit, compression, histogram_edges=edges,
+                                track_quantiles=track_quantiles)
+    for chunk in chunks:
+        stats.update(chunk)
+    if stats.count == 0:
+        raise ValueError("Dataset is empty")
+    
+    expression = f"{operation}(n={stats.count})"
+    if operation == "mean":
+        result = stats.mean
+    elif operation == "median":
+        result = stats.quantiles([0.5])[0]
+    elif operation == "variance":
+        result = stats.variance(population)
+    elif operation == "stdev":
+        result = math.sqrt(stats.variance(population))
+    elif operation == "percentiles":
+        values = stats.quantiles([p / 100 for p in percentiles])
+        result = {f"p{p:g}": value for p, value in zip(percentiles, values)}
+    elif operation == "histogram":
+        edges, counts = stats.histogram(bins)
+        result = {"edges": edges, "counts": counts, "exact": stats.exact or histogram_range is not None}
+    elif operation == "summary":
+        q1, median, q3 = stats.quantiles([0.25, 0.5, 0.75])
+        result = dict(stats.summary(), median=median, p25=q1, p75=q3)
+    else:
+        raise ValueError(f"Unknown statistics operation: {operation}")
+    
+    # Moments are exact at any size; quantiles only while all values are kept
+    exact = stats.exact or operation in ("mean", "stdev", "variance") or (
+        operation == "histogram" and histogram_range is not None
+    )
+    return result, expression, dict(stats.summary(), exact=exact)
@@ -0,0 +1,504 @@
+"""
+Lightweight request tracing.
+
+Spans follow the OpenTelemetry data model (trace/span/parent IDs, start and
+end times in Unix nanoseconds, attributes, status) and the W3C
+``traceparent`` header, without requiring the OpenTelemetry SDK or a
+collector. Each HTTP request starts a trace in TracingMiddleware; route
+handlers, auth dependencies, service and repository methods and SQL
+statements add child spans. Finished traces go to a local exporter:
+
+- ``file``: one JSON object per trace appended to TRACE_FILE by a
+  background thread (view with ``python show_traces.py``)
+- ``memory``: ring buffer of the last TRACE_BUFFER_SIZE traces, read
+  in-process through ``exporter.traces()``
+
+When TRACING_ENABLED is off the decorators return the original functions
+and no listeners are registered, so tracing costs nothing.
+"""
+
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+import atexit
+import functools
+import inspect
+import json
+import os
+import queue
+import random
+import re
+import threading
+import time
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.config import settings
+
+# Span that new spans in the current task/thread become children of
+current_span_var: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+MAX_STATEMENT_LENGTH = 1000
+
+
+class Trace:
+    """Spans of one request, exported together when the root span ends."""
+    
+    __slots__ = ("trace_id", "spans")
+    
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.spans: List["Span"] = []
+
+
+class Span:
+    """
+    One timed operation within a trace.
+    
+    Attributes:
+        name (str): Operation name, e.g. ``HistoryService.add_to_history``
+        span_id (str): 16 hex digits
+        parent_id (Optional[str]): Parent span ID, None for the root span
+        attributes (Dict[str, Any]): Key/value details of the operation
+        status (str): ``ok`` or ``error``
+    """
+    
+    __slots__ = ("trace", "name", "span_id", "parent_id", "attributes", "status",
+                 "start_ns", "end_ns", "_started", "_root")
+    
+    def __init__(self, trace: Trace, name: str, parent_id: Optional[str] = None,
+                 attributes: Optional[Dict[str, Any]] = None, root: bool = False):
+        self.trace = trace
+        self.name = name
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.attributes = dict(attributes) if attributes else {}
+        self.status = "ok"
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self._started = time.perf_counter_ns()
+        self._root = root
+    
+    @property
+    def traceparent(self) -> str:
+        """W3C traceparent header value pointing at this span."""
+        return f"00-{self.trace.trace_id}-{self.span_id}-01"
+    
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+    
+    def record_exception(self, exc: BaseException) -> None:
+        self.status = "error"
+        self.attributes["exception.type"] = type(exc).__name__
+        self.attributes["exception.message"] = str(exc)
+    
+    def child(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> "Span":
+        return Span(self.trace, name, self.span_id, attributes)
+    
+    def end(self) -> None:
+        """Finish the span; finishing the root span exports the trace."""
+        self.end_ns = self.start_ns + (time.perf_counter_ns() - self._started)
+        self.trace.spans.append(self)
+        if self._root and exporter is not None:
+            exporter.export(self.trace)
+    
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_id,
+            "name": self.name,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+            "status": self.status,
+        }
+
+
+class FileExporter:
+    """
+    Append each finished trace to a JSON-lines file.
+    
+    ``export`` only queues the trace; a background thread serializes and
+    writes it, so a request never waits for file I/O. When the bounded
+    queue is full the trace is dropped and counted in ``dropped``. While
+    the writer is stopped, traces are written synchronously instead.
+    
+    Attributes:
+        path (str): File the traces are appended to
+        dropped (int): Traces dropped because the queue was full
+    """
+    
+    _STOP = object()
+    
+    def __init__(self, path: str, queue_size: int = 1000):
+        self.path = path
+        self.queue_size = queue_size
+        self.dropped = 0
+        self._queue: Optional[queue.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.start()
+    
+    def start(self) -> None:
+        """Start the writer thread, unless it is running."""
+        if self._thread is not None:
+            return
+        self._queue = queue.Queue(maxsize=self.queue_size)
+        self._thread = threading.Thread(
+            target=self._write, args=(self._queue,), name="trace-writer", daemon=True
+        )
+        self._thread.start()
+    
+    def stop(self) -> None:
+        """Write the queued traces and stop the writer thread."""
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(self._STOP)
+            thread.join()
+    
+    def restart_in_child(self) -> None:
+        """Start a new writer after fork; the parent's thread is not copied."""
+        self._lock = threading.Lock()
+        if self._thread is not None:
+            self._thread = None
+            self.start()
+    
+    def export(self, trace: Trace) -> None:
+        if self._thread is None:
+            with self._lock, open(self.path, "a", encoding="utf-8") as trace_file:
+                trace_file.write(self._line(trace))
+            return
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            self.dropped += 1
+    
+    @staticmethod
+    def _line(trace: Trace) -> str:
+        return json.dumps({
+            "trace_id": trace.trace_id,
+            "spans": [span.to_dict() for span in trace.spans]
+        }, default=str) + "\n"
+    
+    def _write(self, traces: queue.Queue) -> None:
+        with open(self.path, "a", encoding="utf-8") as trace_file:
+            while True:
+                trace = traces.get()
+                if trace is self._STOP:
+                    break
+                with self._lock:
+                    trace_file.write(self._line(trace))
+                    trace_file.flush()
+
+
+class MemoryExporter:
+    """Keep the most recent traces in memory (an in-process collector)."""
+    
+    def __init__(self, max_traces: int):
+        self._traces = deque(maxlen=max_traces)
+    
+    def export(self, trace: Trace) -> None:
+        self._traces.append(trace)
+    
+    def traces(self) -> List[dict]:
+        """Return the buffered traces, oldest first."""
+        return [
+            {"trace_id": trace.trace_id, "spans": [span.to_dict() for span in trace.spans]}
+            for trace in list(self._traces)
+        ]
+
+
+def create_exporter():
+    """
+    Create the exporter selected by TRACE_EXPORTER.
+    
+    Returns:
+        FileExporter or MemoryExporter
+        
+    Raises:
+        ValueError: If TRACE_EXPORTER is not ``file`` or ``memory``
+    """
+    if settings.TRACE_EXPORTER == "file":
+        return FileExporter(settings.TRACE_FILE, settings.TRACE_QUEUE_SIZE)
+    if settings.TRACE_EXPORTER == "memory":
+        return MemoryExporter(settings.TRACE_BUFFER_SIZE)
+    raise ValueError(f"Unknown TRACE_EXPORTER: {settings.TRACE_EXPORTER!r} (expected file or memory)")
+
+
+exporter = create_exporter() if settings.TRACING_ENABLED else None
+
+
+def start_exporter() -> None:
+    """Start the file exporter's writer thread after ``stop_exporter``."""
+    if isinstance(exporter, FileExporter):
+        exporter.start()
+
+
+def stop_exporter() -> None:
+    """Write the traces still queued for the file exporter and stop its writer."""
+    if isinstance(exporter, FileExporter):
+        exporter.stop()
+
+
+if isinstance(exporter, FileExporter):
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=exporter.restart_in_child)
+    atexit.register(stop_exporter)
+
+
+@contextmanager
+def start_trace(name: str, traceparent: Optional[str] = None,
+                attributes: Optional[Dict[str, Any]] = None) -> Iterator[Optional[Span]]:
+    """
+    Start the root span of a request.
+    
+    An incoming W3C ``traceparent`` continues the caller's trace. Yields
+    None when tracing is disabled or the trace is not sampled.
+    
+    Args:
+        name (str): Root span name
+        traceparent (Optional[str]): Incoming traceparent header
+        attributes (Optional[Dict[str, Any]]): Initial span attributes
+    """
+    if exporter is None or random.random() >= settings.TRACE_SAMPLE_RATE:
+        yield None
+        return
+    
+    match = TRACEPARENT.match(traceparent or "")
+    trace_id, parent_id = match.groups() if match else (os.urandom(16).hex(), None)
+    span = Span(Trace(trace_id), name, parent_id, attributes, root=True)
+    token = current_span_var.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.record_exception(e)
+        raise
+    finally:
+        current_span_var.reset(token)
+        span.end()
+
+
+@contextmanager
+def start_span(name: str, attributes: Optional[Dict[str, Any]] = None) -> Iterator[Optional[Span]]:
+    """
+    Run a block in a child span of the current span.
+    
+    Outside a traced request this yields None and records nothing.
+    
+    Args:
+        name (str): Span name
+        attributes (Optional[Dict[str, Any]]): Initial span attributes
+    """
+    parent = current_span_var.get()
+    if parent is None:
+        yield None
+        return
+    
+    span = parent.child(name, attributes)
+    token = current_span_var.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.record_exception(e)
+        raise
+    finally:
+        current_span_var.reset(token)
+        span.end()
+
+
+def _traced_generator(span: Span, generator):
+    """
+    Iterate a generator inside ``span`` and end the span when it finishes.
+    
+    The span is made current only while the generator runs (one step at a
+    time), so it works when steps run in different threads or contexts,
+    e.g. a StreamingResponse iterating in the threadpool.
+    """
+    try:
+        while True:
+            token = current_span_var.set(span)
+            try:
+                item = next(generator)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                current_span_var.reset(token)
+            yield item
+    except GeneratorExit:
+        raise
+    except BaseException as e:
+        span.record_exception(e)
+        raise
+    finally:
+        generator.close()
+        span.end()
+
+
+def traced(name: Optional[str] = None, layer: Optional[str] = None):
+    """
+    Decorator running each call of a function in a span.
+    
+    When the call returns a generator (generator functions, or functions
+    returning a lazy export stream), the span stays open until the
+    generator is exhausted or closed, so the work done while it is
+    iterated is attributed to it. Functions that are already traced are
+    not wrapped again.
+    
+    Args:
+        name (Optional[str]): Span name, defaults to the qualified name
+        layer (Optional[str]): Value of the ``code.layer`` attribute
+    """
+    def decorate(func):
+        if not settings.TRACING_ENABLED or getattr(func, "_traced", False):
+            return func
+        
+        span_name = name or func.__qualname__
+        attributes = {"code.layer": layer} if layer else None
+        
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with start_span(span_name, attributes):
+                    return await func(*args, **kwargs)
+            async_wrapper._traced = True
+            return async_wrapper
+        
+        if inspect.isgeneratorfunction(func):
+            # Still a generator function (callers such as FastAPI check);
+            # the span starts when iteration does
+            @functools.wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                parent = current_span_var.get()
+                if parent is None:
+                    return (yield from func(*args, **kwargs))
+                span = parent.child(span_name, attributes)
+                return (yield from _traced_generator(span, func(*args, **kwargs)))
+            generator_wrapper._traced = True
+            return generator_wrapper
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            parent = current_span_var.get()
+            if parent is None:
+                return func(*args, **kwargs)
+            
+            span = parent.child(span_name, attributes)
+            token = current_span_var.set(span)
+            try:
+                result = func(*args, **kwargs)
+            except BaseException as e:
+                span.record_exception(e)
+                span.end()
+                raise
+            finally:
+                current_span_var.reset(token)
+            
+            if inspect.isgenerator(result):
+                return _traced_generator(span, result)
+            span.end()
+            return result
+        wrapper._traced = True
+        return wrapper
+    
+    return decorate
+
+
+def traced_methods(layer: str):
+    """
+    Class decorator tracing every public method defined on the class.
+    
+    Args:
+        layer (str): Value of the ``code.layer`` attribute (``service``,
+            ``repository``)
+    """
+    def decorate(cls):
+        if not settings.TRACING_ENABLED:
+            return cls
+        
+        for attr, value in list(vars(cls).items()):
+            if attr.startswith("_"):
+                continue
+            span_name = f"{cls.__name__}.{attr}"
+            if isinstance(value, (staticmethod, classmethod)):
+                setattr(cls, attr, type(value)(traced(span_name, layer)(value.__func__)))
+            elif inspect.isfunction(value):
+                setattr(cls, attr, traced(span_name, layer)(value))
+        return cls
+    
+    return decorate
+
+
+class TracedRoute(APIRoute):
+    """APIRoute whose endpoint runs in a span (separate from its dependencies)."""
+    
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, traced(f"route {endpoint.__name__}", "api")(endpoint), **kwargs)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    parent = current_span_var.get()
+    if parent is None:
+        return
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "SQL"
+    span = parent.child(f"db {operation}", {
+        "db.system": conn.dialect.name,
+        "db.statement": statement[:MAX_STATEMENT_LENGTH],
+        "db.executemany": executemany,
+    })
+    conn.info.setdefault("trace_spans", []).append(span)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    spans = conn.info.get("trace_spans")
+    if spans:
+        span = spans.pop()
+        if cursor is not None and cursor.rowcount >= 0:
+            span.set_attribute("db.rowcount", cursor.rowcount)
+        span.end()
+
+
+def _handle_error(exception_context):
+    connection = exception_context.connection
+    spans = connection.info.get("trace_spans") if connection is not None else None
+    if spans:
+        span = spans.pop()
+        span.record_exception(exception_context.original_exception)
+        span.end()
+
+
+def _before_commit(session):
+    parent = current_span_var.get()
+    if parent is not None:
+        # Covers the final flush (its statements are sibling spans) and COMMIT
+        session.info["trace_commit_span"] = parent.child("db commit")
+
+
+def _after_commit(session):
+    span = session.info.pop("trace_commit_span", None)
+    if span is not None:
+        span.end()
+
+
+def _after_rollback(session):
+    span = session.info.pop("trace_commit_span", None)
+    if span is not None:
+        span.status = "error"
+        span.end()
+
+
+def instrument_sqlalchemy() -> None:
+    """Record a span for every SQL statement and commit inside a traced request."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
+        event.listen(Session, "before_commit", _before_commit)
+        event.listen(Session, "after_commit", _after_commit)
+        event.listen(Session, "after_rollback", _after_rollback)
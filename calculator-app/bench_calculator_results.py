@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of CalculatorService results: slotted dataclass vs Pydantic.
+
+CalculatorService returns ``CalculationResult`` (a slotted dataclass). Before,
+it built a Pydantic ``CalculatorResponse`` per call, which the route then
+unpacked into its response dict. This script runs a mix of basic, advanced,
+conversion and finance requests through the service and the route's dict
+building, both ways:
+
+- model: the service result is also validated into a CalculatorResponse
+  (the extra work the service used to do)
+- slots: the CalculationResult is used directly (what it does now)
+
+It reports the median CPU time per request and the memory held per result
+(tracemalloc, with a batch of results kept alive, as history sync does).
+Request parsing and the database are left out: they are the same for both.
+
+Usage:
+    python bench_calculator_results.py
+    python bench_calculator_results.py --requests 20000 --repeat 7
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import tracemalloc
+
+from app.schemas.calculator import (
+    AdvancedOperation, BasicOperation, CalculatorResponse, ConversionRequest, FinanceRequest
+)
+from app.services.calculator_service import CalculatorService
+
+SERVICE = CalculatorService()
+
+REQUESTS = [
+    (SERVICE.calculate_basic, BasicOperation(num1=12.5, num2=3, operation="multiplication")),
+    (SERVICE.calculate_basic, BasicOperation(num1=7, num2=2, operation="division")),
+    (SERVICE.calculate_advanced, AdvancedOperation(value=30, operation="sin", angle_unit="degrees")),
+    (SERVICE.calculate_advanced, AdvancedOperation(value=100, operation="log", mode="table")),
+    (SERVICE.convert_units, ConversionRequest(value=12, from_unit="meter", to_unit="foot",
+                                              conversion_type="length")),
+    (SERVICE.calculate_finance, FinanceRequest(principal=10000, rate=5, time=5, operation="loan_payment")),
+]
+
+
+def as_model(result) -> CalculatorResponse:
+    return CalculatorResponse(
+        result=result.result,
+        expression=result.expression,
+        operation_type=result.operation_type,
+        error_bound=result.error_bound
+    )
+
+
+def route_dict(result) -> dict:
+    """The response dict the calculator routes build from a result."""
+    response = {
+        "result": result.result,
+        "expression": result.expression,
+        "operation": result.operation_type.value,
+        "history_id": 1
+    }
+    if result.error_bound is not None:
+        response["error_bound"] = result.error_bound
+    return response
+
+
+def request_model(method, request):
+    return route_dict(as_model(method(request)))
+
+
+def request_slots(method, request):
+    return route_dict(method(request))
+
+
+def measure(handle, requests: int, repeat: int) -> float:
+    """Median seconds per request over ``repeat`` runs."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for i in range(requests):
+            method, request = REQUESTS[i % len(REQUESTS)]
+            handle(method, request)
+        timings.append((time.perf_counter() - started) / requests)
+    return statistics.median(timings)
+
+
+def held_memory(build, count: int) -> float:
+    """Bytes allocated per result while ``count`` results are kept alive."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        results = [build(*REQUESTS[i % len(REQUESTS)]) for i in range(count)]
+        held = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del results
+    return held / count
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark calculator service results")
+    parser.add_argument("--requests", type=int, default=10000, help="Requests per timed run")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per variant")
+    args = parser.parse_args()
+
+    same = all(request_model(*item) == request_slots(*item) for item in REQUESTS)
+
+    results = {}
+    for name, handle, build in (
+        ("model", request_model, lambda method, request: as_model(method(request))),
+        ("slots", request_slots, lambda method, request: method(request)),
+    ):
+        handle(*REQUESTS[0])  # warm up
+        results[name] = (measure(handle, args.requests, args.repeat), held_memory(build, args.requests))
+
+    print("=" * 60)
+    print(f"CALCULATOR RESULT BENCHMARK ({args.requests} requests, median of {args.repeat})")
+    print("=" * 60)
+    print(f"{'':8} {'per request':>14} {'held per result':>18}")
+    for name, (per_request, per_result) in results.items():
+        print(f"{name:8} {per_request * 1e6:11.2f} µs {per_result:15.0f} B")
+
+    old, new = results["model"], results["slots"]
+    print(f"\nslots vs model: {old[0] / new[0]:.1f}x faster per request "
+          f"({(old[0] - new[0]) * 1e6:.2f} µs saved), {old[1] / new[1]:.1f}x less memory per result")
+    print(f"{'✅' if same else '❌'} both variants build the same response")
+    print("=" * 60)
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of a history list page: ORM entities vs column projection.
+
+Builds a scratch SQLite database with the application's schema, fills it
+with history rows, and serves the same page (default 1000 rows) two ways:
+
+- entities: ``query(CalculationHistory)`` (ORM hydration and identity map),
+  then ``HistoryResponse.from_orm`` per row and FastAPI's response_model
+  serialization (what ``GET /api/history`` used to do)
+- projection: ``HistoryRepository.get_user_history`` row tuples, encoded
+  with ``history_export.response_rows`` and FastJSONResponse (what it does
+  now)
+
+For each, it reports the median time of the query alone and of the whole
+page, and the peak memory allocated while building the page (tracemalloc).
+It also checks that both produce the same JSON.
+
+Usage:
+    python bench_history_list.py              # 1000-row page
+    python bench_history_list.py --rows 100 --repeat 50
+"""
+
+from datetime import datetime, timedelta
+from typing import List
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from sqlalchemy import create_engine, desc
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base, RoutingSession, load_json_column
+from app.migrations import upgrade_schema
+from app.models import calculation, history_version, user  # noqa: F401
+from app.models.calculation import CalculationHistory
+from app.repositories.history_repository import HistoryRepository
+from app.responses import FastJSONResponse
+from app.schemas.history import HistoryFilter, HistoryResponse
+from app.services import history_export
+
+OPERATIONS = ["addition", "multiplication", "sin", "conversion", "finance"]
+
+
+def create_scratch_database(rows: int):
+    """Create an in-memory database with one user's history."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+        json_deserializer=load_json_column
+    )
+    Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
+
+    db = RoutingSession(bind=engine)
+    db.add(user.User(username="bench", email="bench@example.com", password_hash="x"))
+    db.commit()
+
+    start = datetime(2024, 1, 1)
+    HistoryRepository(db).bulk_create_history(1, [
+        {
+            "operation_type": OPERATIONS[i % len(OPERATIONS)],
+            "expression": f"{i * 1.5} × {i % 97}",
+            "result": f"{i * 1.5 * (i % 97)}",
+            "result_value": i * 1.5 * (i % 97),
+            "result_unit": "meter" if i % 5 == 3 else None,
+            "inputs": {"num1": i * 1.5, "num2": i % 97, "operation": OPERATIONS[i % len(OPERATIONS)]},
+            "created_at": start + timedelta(minutes=i),
+        }
+        for i in range(rows)
+    ])
+    db.close()
+    return engine
+
+
+RESPONSE_FIELD = create_response_field(name="Response_get_history", type_=List[HistoryResponse])
+
+
+def query_entities(db, filters):
+    repository = HistoryRepository(db)
+    return repository._filtered_query(1, filters).order_by(
+        desc(CalculationHistory.created_at)
+    ).limit(filters.limit).all()
+
+
+def page_entities(db, filters) -> bytes:
+    models = [HistoryResponse.from_orm(record) for record in query_entities(db, filters)]
+    content = asyncio.run(serialize_response(field=RESPONSE_FIELD, response_content=models))
+    return FastJSONResponse(content=content).body
+
+
+def query_projection(db, filters):
+    return HistoryRepository(db).get_user_history(1, filters)
+
+
+def page_projection(db, filters) -> bytes:
+    rows = query_projection(db, filters)
+    return FastJSONResponse(content=history_export.response_rows(rows)).body
+
+
+def measure(engine, function, filters, repeat: int):
+    """Median seconds per call, each call with a fresh session."""
+    timings = []
+    for _ in range(repeat):
+        db = RoutingSession(bind=engine)
+        started = time.perf_counter()
+        function(db, filters)
+        timings.append(time.perf_counter() - started)
+        db.close()
+    return statistics.median(timings)
+
+
+def peak_memory(engine, function, filters) -> int:
+    """Peak bytes allocated while one page is built and still referenced."""
+    db = RoutingSession(bind=engine)
+    function(db, filters)  # warm up caches (compiled SQL, validators)
+    db.close()
+
+    db = RoutingSession(bind=engine)
+    tracemalloc.start()
+    try:
+        result = function(db, filters)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    del result
+    db.close()
+    return peak
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark history list pages")
+    parser.add_argument("--rows", type=int, default=1000, help="Rows per page (max 1000)")
+    parser.add_argument("--repeat", type=int, default=30, help="Timed runs per variant")
+    args = parser.parse_args()
+
+    engine = create_scratch_database(max(args.rows, 1000))
+    filters = HistoryFilter(limit=args.rows)
+
+    db = RoutingSession(bind=engine)
+    same = json.loads(page_entities(db, filters)) == json.loads(page_projection(db, filters))
+    db.close()
+
+    results = {}
+    for name, query, page in (
+        ("entities", query_entities, page_entities),
+        ("projection", query_projection, page_projection),
+    ):
+        results[name] = (
+            measure(engine, query, filters, args.repeat),
+            measure(engine, page, filters, args.repeat),
+            peak_memory(engine, page, filters),
+        )
+
+    print("=" * 60)
+    print(f"HISTORY LIST PAGE BENCHMARK ({args.rows} rows, median of {args.repeat})")
+    print("=" * 60)
+    print(f"{'':12} {'query':>10} {'page':>10} {'peak memory':>14}")
+    for name, (query_time, page_time, peak) in results.items():
+        print(f"{name:12} {query_time * 1000:8.2f}ms {page_time * 1000:8.2f}ms {peak / 1024:11.0f} KiB")
+
+    old, new = results["entities"], results["projection"]
+    print(f"\nprojection vs entities: query {old[0] / new[0]:.1f}x faster, "
+          f"page {old[1] / new[1]:.1f}x faster, {old[2] / new[2]:.1f}x less peak memory")
+    print(f"{'✅' if same else '❌'} both variants return the same JSON")
+    print("=" * 60)
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Conformance check between CalculatorService and the frontend engine.
+
+The offline frontend evaluates operations with frontend/js/engine.js and
+only syncs the inputs later, so both must agree. The shared vectors in
+frontend/js/engine-vectors.json hold inputs with the server's expected
+result, expression and history text (or an error). This script checks the
+server against them and, when Node.js is installed, the JS engine too.
+
+Usage:
+    python check_engine_conformance.py            # check, exit 1 on mismatch
+    python check_engine_conformance.py --update   # regenerate the vectors
+"""
+
+from pathlib import Path
+import json
+import logging
+import math
+import shutil
+import subprocess
+import sys
+
+from app.services.history_sync import CALCULATION_KINDS, SyncItemError, calculation_values
+from app.services.calculator_service import CalculatorService
+
+VECTORS_PATH = Path(__file__).parent / "frontend" / "js" / "engine-vectors.json"
+ENGINE_PATH = Path(__file__).parent / "frontend" / "js" / "engine.js"
+
+# Results may differ in the last bits between libm and V8 (trig, log, pow)
+RELATIVE_TOLERANCE = 1e-12
+
+
+def basic(num1, num2, operation):
+    return ("basic", {"num1": num1, "num2": num2, "operation": operation})
+
+
+def advanced(value, operation, angle_unit="radians"):
+    return ("advanced", {"value": value, "operation": operation, "angle_unit": angle_unit})
+
+
+def conversion(value, from_unit, to_unit, conversion_type):
+    return ("conversion", {
+        "value": value, "from_unit": from_unit, "to_unit": to_unit,
+        "conversion_type": conversion_type
+    })
+
+
+def finance(principal, rate, time, operation):
+    return ("finance", {"principal": principal, "rate": rate, "time": time, "operation": operation})
+
+
+CASES = [
+    basic(2, 2, "addition"),
+    basic(0.1, 0.2, "addition"),
+    basic(-5.5, 3, "subtraction"),
+    basic(1e8, 1e8, "multiplication"),
+    basic(1e-3, 1e-3, "multiplication"),
+    basic(1e300, 1e10, "multiplication"),
+    basic(10, 4, "division"),
+    basic(1, 3, "division"),
+    basic(1, 0, "division"),
+    basic(2, 10, "power"),
+    basic(2, 0.5, "power"),
+    basic(2, -2, "power"),
+    basic(-8, 1 / 3, "power"),
+    basic(0, -1, "power"),
+    basic(10, 400, "power"),
+    basic(12345678, 12345678, "power"),
+    basic(50, 200, "percentage"),
+    basic(12.5, 8, "percentage"),
+    basic(1, None, "addition"),
+    basic(1, 2, "sin"),
+    advanced(16, "square_root"),
+    advanced(2, "square_root"),
+    advanced(-1, "square_root"),
+    advanced(30, "sin", "degrees"),
+    advanced(180, "sin", "degrees"),
+    advanced(math.pi, "sin"),
+    advanced(60, "cos", "degrees"),
+    advanced(90, "cos", "degrees"),
+    advanced(45, "tan", "degrees"),
+    advanced(90, "tan", "degrees"),
+    advanced(1, "tan"),
+    advanced(1000, "log"),
+    advanced(2, "log"),
+    advanced(0, "log"),
+    advanced(-1, "ln"),
+    advanced(math.e, "ln"),
+    advanced(1, "ln"),
+    advanced(1, "addition"),
+    advanced(1, "sin", "gradians"),
+    ("advanced", {"value": 1, "operation": "sin", "angle_unit": "degrees", "mode": "fast"}),
+    conversion(1500, "meter", "kilometer", "length"),
+    conversion(1, "mile", "kilometer", "length"),
+    conversion(12, "inch", "foot", "length"),
+    conversion(10, "pound", "kilogram", "weight"),
+    conversion(0.03125, "kilogram", "kilogram", "weight"),
+    conversion(100, "celsius", "fahrenheit", "temperature"),
+    conversion(-40, "fahrenheit", "celsius", "temperature"),
+    conversion(0, "kelvin", "celsius", "temperature"),
+    conversion(300, "kelvin", "fahrenheit", "temperature"),
+    conversion(1, "meter", "pound", "length"),
+    conversion(1, "liter", "milliliter", "volume"),
+    finance(1000, 5, 2, "simple_interest"),
+    finance(12.5, 1, 1, "simple_interest"),
+    finance(1000, 5, 10, "compound_interest"),
+    finance(250000, 6.5, 30, "loan_payment"),
+    finance(12000, 0, 1, "loan_payment"),
+    finance(0, 5, 1, "simple_interest"),
+    finance(100, 5, 1, "annuity"),
+]
+
+
+def server_outcome(kind, inputs):
+    """Evaluate one vector with CalculatorService, as the bulk endpoint does."""
+    schema, method = CALCULATION_KINDS[kind]
+    try:
+        values = calculation_values(kind, inputs)
+        response = getattr(CalculatorService(), method)(schema.model_validate(inputs))
+    except SyncItemError as e:
+        return {"error": str(e)}
+    return {
+        "result": repr(float(response.result)),
+        "expression": response.expression,
+        "history": values["result"],
+    }
+
+
+def engine_outcomes(vectors):
+    """Evaluate all vectors with the JS engine under Node.js."""
+    script = (
+        "const { CalcEngine } = require(process.argv[1]);"
+        "const vectors = JSON.parse(require('fs').readFileSync(0, 'utf8'));"
+        "console.log(JSON.stringify(vectors.map(({ kind, inputs }) => {"
+        "  try {"
+        "    const c = CalcEngine.evaluate(kind, inputs);"
+        "    return { result: CalcEngine.pyRepr(c.result), expression: c.expression,"
+        "             history: c.history_result };"
+        "  } catch (e) { return { error: e.message }; }"
+        "})));"
+    )
+    completed = subprocess.run(
+        ["node", "-e", script, str(ENGINE_PATH)],
+        input=json.dumps(vectors), capture_output=True, text=True, check=True
+    )
+    return json.loads(completed.stdout)
+
+
+def same_number_text(expected, actual):
+    """Compare two formatted numbers exactly, or as floats within tolerance."""
+    if expected == actual:
+        return True
+    try:
+        expected_value, actual_value = float(expected), float(actual)
+    except ValueError:
+        return False
+    return math.isclose(expected_value, actual_value, rel_tol=RELATIVE_TOLERANCE)
+
+
+def compare(expected, actual):
+    """Return a description of how an outcome differs, or None."""
+    if "error" in expected or "error" in actual:
+        if ("error" in expected) != ("error" in actual):
+            return f"expected {expected}, got {actual}"
+        return None
+    if expected["expression"] != actual["expression"]:
+        return f"expression {actual['expression']!r} != {expected['expression']!r}"
+    if not same_number_text(expected["result"], actual["result"]):
+        return f"result {actual['result']} != {expected['result']}"
+    if not same_number_text(expected["history"], actual["history"]):
+        return f"history {actual['history']!r} != {expected['history']!r}"
+    return None
+
+
+def main():
+    # Error vectors are expected; keep the service's error logs out of the report
+    logging.getLogger("app.services.calculator_service").disabled = True
+
+    if "--update" in sys.argv[1:]:
+        vectors = [
+            {"kind": kind, "inputs": inputs, "expected": server_outcome(kind, inputs)}
+            for kind, inputs in CASES
+        ]
+        VECTORS_PATH.write_text(json.dumps(vectors, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"Wrote {len(vectors)} vectors to {VECTORS_PATH}")
+        return 0
+
+    vectors = json.loads(VECTORS_PATH.read_text(encoding="utf-8"))
+    implementations = [("server", [server_outcome(v["kind"], v["inputs"]) for v in vectors])]
+    if shutil.which("node"):
+        implementations.append(("engine.js", engine_outcomes(vectors)))
+    else:
+        print("Node.js not found; checking the server only")
+
+    failures = 0
+    print("=" * 60)
+    print("ENGINE CONFORMANCE REPORT")
+    print("=" * 60)
+
+    for name, outcomes in implementations:
+        mismatches = []
+        for vector, outcome in zip(vectors, outcomes):
+            problem = compare(vector["expected"], outcome)
+            if problem:
+                mismatches.append(f"{vector['kind']} {json.dumps(vector['inputs'])}: {problem}")
+
+        marker = "❌" if mismatches else "✅"
+        print(f"{marker} {name}: {len(vectors) - len(mismatches)}/{len(vectors)} vectors match")
+        for mismatch in mismatches:
+            print(f"     {mismatch}")
+        failures += len(mismatches)
+
+    print("=" * 60)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Accuracy check of the table-driven functions (advanced operations, mode="table").
+
+Compares app/services/function_tables.py with references computed at 60
+significant digits using ``decimal`` and exact ``fractions`` arithmetic
+(pi from Machin's formula, angles reduced exactly), and checks that:
+
+- every grid angle (0.1° steps) is correctly rounded,
+- special angles are exact and tan(90°) is rejected,
+- interpolated angles and logarithms stay within the reported error bound.
+
+Usage:
+    python check_function_tables.py            # exit 1 on any failure
+    python check_function_tables.py --samples 100000
+"""
+
+from decimal import Decimal, localcontext
+from fractions import Fraction
+import argparse
+import math
+import random
+import sys
+import time
+
+from app.schemas.calculator import AdvancedOperation
+from app.services import function_tables
+from app.services.calculator_service import CalculatorService
+
+PRECISION = 60
+
+
+def machin_pi() -> Decimal:
+    """pi = 16 atan(1/5) - 4 atan(1/239), at the current precision."""
+    def atan_inverse(n):
+        total = term = Decimal(1) / n
+        n_squared = n * n
+        k = 1
+        while term != 0:
+            term /= -n_squared
+            k += 2
+            total += term / k
+        return total
+    return 16 * atan_inverse(5) - 4 * atan_inverse(239)
+
+
+def reference_sin_cos(degrees: Fraction):
+    """sin and cos of an exact angle in degrees."""
+    with localcontext() as context:
+        context.prec = PRECISION
+        reduced = degrees % 360
+        x = Decimal(reduced.numerator) / Decimal(reduced.denominator) * PI / 180
+        # Taylor series of sin(x) and cos(x) for 0 <= x < 2*pi
+        sin_term, cos_term = x, Decimal(1)
+        sin_total, cos_total = sin_term, cos_term
+        n = 1
+        while abs(sin_term) > Decimal(10) ** -(PRECISION + 5) or abs(cos_term) > Decimal(10) ** -(PRECISION + 5):
+            sin_term = -sin_term * x * x / ((n + 1) * (n + 2))
+            cos_term = -cos_term * x * x / (n * (n + 1))
+            sin_total += sin_term
+            cos_total += cos_term
+            n += 2
+        return sin_total, cos_total
+
+
+def reference(name: str, degrees: Fraction) -> Decimal:
+    sin_value, cos_value = reference_sin_cos(degrees)
+    if name == "sin":
+        return sin_value
+    if name == "cos":
+        return cos_value
+    with localcontext() as context:
+        context.prec = PRECISION
+        return sin_value / cos_value
+
+
+def reference_log(name: str, x: float) -> Decimal:
+    with localcontext() as context:
+        context.prec = PRECISION
+        return Decimal(x).ln() if name == "ln" else Decimal(x).log10()
+
+
+with localcontext() as _context:
+    _context.prec = PRECISION + 5
+    PI = machin_pi()
+
+TABLE_TRIG = {
+    "sin": function_tables.sin_degrees,
+    "cos": function_tables.cos_degrees,
+    "tan": function_tables.tan_degrees,
+}
+TABLE_LOG = {"ln": function_tables.ln, "log": function_tables.log10}
+DIRECT_TRIG = {"sin": math.sin, "cos": math.cos, "tan": math.tan}
+
+SPECIAL_ANGLES = [
+    ("sin", 0, 0.0), ("sin", 30, 0.5), ("sin", 90, 1.0), ("sin", 150, 0.5),
+    ("sin", 180, 0.0), ("sin", 210, -0.5), ("sin", 270, -1.0), ("sin", 360, 0.0),
+    ("sin", -30, -0.5), ("sin", 390, 0.5), ("sin", 45 * 2.0 ** 60, 0.0), ("sin", 360 * 2 ** 40 + 30, 0.5),
+    ("cos", 0, 1.0), ("cos", 60, 0.5), ("cos", 90, 0.0), ("cos", 120, -0.5),
+    ("cos", 180, -1.0), ("cos", 270, 0.0), ("cos", -60, 0.5),
+    ("tan", 0, 0.0), ("tan", 45, 1.0), ("tan", 135, -1.0), ("tan", 180, 0.0),
+    ("tan", 225, 1.0), ("tan", -45, -1.0),
+]
+
+
+def report(ok: bool, message: str) -> int:
+    print(f"{'✅' if ok else '❌'} {message}")
+    return 0 if ok else 1
+
+
+def check_grid() -> int:
+    failures = 0
+    angles = [k / 10 for k in range(-3600, 7201)] + [123456789.5, -98765.4, 2.0 ** 60, 1e22]
+    for name, function in TABLE_TRIG.items():
+        mismatches = []
+        for angle in angles:
+            exact = Fraction(Decimal(repr(angle))) if abs(angle) < 2 ** 49 else Fraction(angle)
+            if name == "tan" and exact % 180 == 90:
+                continue
+            value, bound = function(angle)
+            # The reference series leaves ~1e-60 where the exact value is 0
+            exact_value = reference(name, exact)
+            expected = float(exact_value) if abs(exact_value) > Decimal(10) ** -50 else 0.0
+            if value != expected:
+                mismatches.append(f"{name}({angle}°) = {value!r}, expected {expected!r}")
+        failures += report(not mismatches, f"{name}: {len(angles)} grid angles correctly rounded")
+        for mismatch in mismatches[:5]:
+            print(f"     {mismatch}")
+    return failures
+
+
+def check_special_angles() -> int:
+    problems = []
+    for name, angle, expected in SPECIAL_ANGLES:
+        value, bound = TABLE_TRIG[name](angle)
+        if value != expected or bound != 0.0:
+            problems.append(f"{name}({angle}°) = {value!r} (bound {bound}), expected exactly {expected!r}")
+    for angle in (90, 270, -90, 450.0):
+        try:
+            function_tables.tan_degrees(angle)
+            problems.append(f"tan({angle}°) did not raise")
+        except ValueError:
+            pass
+
+    service = CalculatorService()
+    response = service.calculate_advanced(
+        AdvancedOperation(value=30, operation="sin", angle_unit="degrees", mode="table")
+    )
+    if response.result != 0.5 or response.error_bound != 0.0:
+        problems.append(f"CalculatorService table mode sin(30°) = {response.result!r}")
+    for operation, unit in (("sin", "radians"), ("square_root", "degrees")):
+        try:
+            service.calculate_advanced(AdvancedOperation(value=1, operation=operation, angle_unit=unit, mode="table"))
+            problems.append(f"table mode {operation} in {unit} did not raise")
+        except ValueError:
+            pass
+
+    failures = report(
+        not problems,
+        f"{len(SPECIAL_ANGLES)} special angles exact, tan(90°) and unsupported table inputs rejected"
+    )
+    for problem in problems:
+        print(f"     {problem}")
+    return failures
+
+
+def check_interpolation(samples: int) -> int:
+    failures = 0
+    rng = random.Random(20240601)
+    angles = [round(rng.uniform(-720, 720), rng.randint(2, 9)) for _ in range(samples)]
+    angles += [89.95, 89.999999, 0.05, 1e-9, 123456789.123, -359.99]
+    for name, function in TABLE_TRIG.items():
+        worst_ratio = worst_error = direct_error = 0.0
+        checked = 0
+        for angle in angles:
+            if function_tables.grid_tenths(angle) is not None:
+                continue
+            try:
+                value, bound = function(angle)
+            except ValueError:
+                continue
+            expected = reference(name, Fraction(angle))
+            error = float(abs(Decimal(value) - expected))
+            worst_error = max(worst_error, error / max(1.0, abs(value)))
+            worst_ratio = max(worst_ratio, error / bound)
+            direct = DIRECT_TRIG[name](math.radians(angle))
+            direct_error = max(direct_error, float(abs(Decimal(direct) - expected)) / max(1.0, abs(direct)))
+            checked += 1
+        failures += report(
+            worst_ratio <= 1.0,
+            f"{name}: {checked} interpolated angles within bound "
+            f"(worst error/bound {worst_ratio:.3f}, max rel error {worst_error:.2e}, math {direct_error:.2e})"
+        )
+    return failures
+
+
+def check_logarithms(samples: int) -> int:
+    failures = 0
+    rng = random.Random(7)
+    values = [math.ldexp(rng.uniform(1, 2), rng.randint(-1000, 1000)) for _ in range(samples)]
+    values += [1 + rng.uniform(-1e-3, 1e-3) for _ in range(samples // 10)]
+    values += [1.0, 2.0, 0.1, 1e-300, 1.7976931348623157e308, 5e-324, math.e]
+    for name, function in TABLE_LOG.items():
+        worst_ratio = 0.0
+        worst_ulps = 0.0
+        for x in values:
+            value, bound = function(x)
+            expected = reference_log(name, x)
+            error = float(abs(Decimal(value) - expected))
+            worst_ratio = max(worst_ratio, error / bound if bound else (math.inf if error else 0.0))
+            worst_ulps = max(worst_ulps, error / math.ulp(float(expected)) if expected else 0.0)
+        failures += report(
+            worst_ratio <= 1.0,
+            f"{name}: {len(values)} values within bound (worst error/bound {worst_ratio:.3f}, "
+            f"max error {worst_ulps:.2f} ulp)"
+        )
+
+    inexact = [k for k in range(23) if function_tables.log10(10.0 ** k) != (float(k), 0.0)]
+    failures += report(not inexact, "log10 exact for powers of ten 1e0..1e22")
+    return failures
+
+
+def check_speed() -> None:
+    angles = [k / 10 for k in range(3600)]
+    started = time.perf_counter()
+    for angle in angles:
+        function_tables.sin_degrees(angle)
+    table_time = time.perf_counter() - started
+    started = time.perf_counter()
+    for angle in angles:
+        math.sin(math.radians(angle))
+    direct_time = time.perf_counter() - started
+    # Table mode is for exactness, not speed: report what it costs per call
+    print(f"ℹ️  grid sin: {table_time / len(angles) * 1e6:.2f} µs/call (table), "
+          f"{direct_time / len(angles) * 1e6:.2f} µs/call (math), "
+          f"{table_time / direct_time:.1f}x the cost of math")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check table-driven function accuracy")
+    parser.add_argument("--samples", type=int, default=5000, help="Random inputs per function")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("FUNCTION TABLE ACCURACY REPORT")
+    print("=" * 60)
+    failures = check_grid()
+    failures += check_special_angles()
+    failures += check_interpolation(args.samples)
+    failures += check_logarithms(args.samples)
+    check_speed()
+    print("=" * 60)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Query-plan regression check for HistoryRepository.
+
+Builds a scratch SQLite database with the application's schema and indexes,
+runs every history repository query, and inspects ``EXPLAIN QUERY PLAN`` for
+each SQL statement it issued. Fails if a query scans calculation_history
+instead of searching an index, or sorts with a temporary B-tree for
+ORDER BY (a filesort).
+
+Usage:
+    python check_query_plans.py            # report, exit 1 on regressions
+    python check_query_plans.py -v         # also print every plan
+"""
+
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+import re
+import sys
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base, RoutingSession
+from app.migrations import upgrade_schema
+from app.models import calculation, history_version, user  # noqa: F401
+from app.repositories.history_repository import HistoryRepository
+from app.schemas.history import (
+    HistoryFilter, HistoryExportFilter, HistoryAggregateFilter, TimeBucket
+)
+
+TABLE = "calculation_history"
+
+# Plan details that mean a regression, unless the check allows them
+# (a full table scan, or a full scan of one of its indexes, or a filesort)
+FULL_SCAN = re.compile(rf"^SCAN {TABLE}\b")
+FILESORT = "USE TEMP B-TREE FOR ORDER BY"
+
+
+def create_scratch_session():
+    """Create an in-memory database with the full schema and a little data."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
+
+    db = RoutingSession(bind=engine)
+    repository = HistoryRepository(db)
+    db.add(user.User(username="planner", email="planner@example.com", password_hash="x"))
+    db.commit()
+
+    start = datetime(2024, 1, 1)
+    repository.bulk_create_history(1, [
+        {
+            "operation_type": "addition" if i % 2 else "finance",
+            "expression": f"Loan: P={i * 1000}",
+            "result": f"{i}.5",
+            "result_value": i + 0.5,
+            "result_unit": None,
+            "inputs": None,
+            "created_at": start + timedelta(hours=i),
+        }
+        for i in range(10)
+    ])
+    return engine, db, repository
+
+
+@contextmanager
+def capture_statements(engine):
+    """Collect (statement, parameters) of SELECTs run inside the block."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def query_plan(engine, statement, parameters):
+    """Return the EXPLAIN QUERY PLAN detail lines of a statement."""
+    with engine.connect() as connection:
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    return [row[-1] for row in rows]
+
+
+def main():
+    verbose = "-v" in sys.argv[1:]
+    engine, db, repository = create_scratch_session()
+    since = datetime(2024, 1, 1, 3)
+    until = datetime(2024, 1, 1, 8)
+
+    # (name, call, allowed plan details)
+    checks = [
+        ("get_user_history", lambda: repository.get_user_history(1, HistoryFilter()), ()),
+        ("get_user_history [operation]",
+         lambda: repository.get_user_history(1, HistoryFilter(operation_type="finance")), ()),
+        ("get_user_history [date range]",
+         lambda: repository.get_user_history(1, HistoryFilter(start_date=since, end_date=until)), ()),
+        ("get_user_history [operation + date range]",
+         lambda: repository.get_user_history(
+             1, HistoryFilter(operation_type="addition", start_date=since, end_date=until)
+         ), ()),
+        ("get_user_history [search]",
+         lambda: repository.get_user_history(1, HistoryFilter(search="loan")), ()),
+        ("iter_user_history",
+         lambda: [batch for batch in repository.iter_user_history(1, HistoryExportFilter(), batch_size=4)],
+         ()),
+        ("iter_user_history [operation]",
+         lambda: [batch for batch in repository.iter_user_history(
+             1, HistoryExportFilter(operation_type="finance"), batch_size=2
+         )], ()),
+        ("get_user_history_count", lambda: repository.get_user_history_count(1), ()),
+        ("get_history_by_id", lambda: repository.get_history_by_id(3), ()),
+        ("get_history_version", lambda: repository.get_history_version(1), ()),
+        # Grouping by a computed bucket needs a temporary B-tree; only the
+        # grouped rows are sorted afterwards
+        ("aggregate_user_history",
+         lambda: repository.aggregate_user_history(
+             1, HistoryAggregateFilter(bucket=TimeBucket.DAY, start_date=since)
+         ), ("USE TEMP B-TREE FOR GROUP BY", FILESORT)),
+    ]
+
+    failures = 0
+    print("=" * 60)
+    print(f"QUERY-PLAN REPORT: HistoryRepository ({engine.dialect.name})")
+    print("=" * 60)
+
+    for name, call, allowed in checks:
+        with capture_statements(engine) as statements:
+            call()
+        db.expunge_all()
+
+        problems = []
+        plans = []
+        for statement, parameters in statements:
+            plan = query_plan(engine, statement, parameters)
+            plans.append(plan)
+            for detail in plan:
+                if any(detail.startswith(ok) for ok in allowed):
+                    continue
+                if FULL_SCAN.match(detail) or detail.startswith(FILESORT):
+                    problems.append(detail)
+
+        marker = "❌" if problems else "✅"
+        print(f"{marker} {name}")
+        for detail in problems:
+            print(f"     {detail}")
+        if verbose:
+            for plan in plans:
+                for detail in plan:
+                    print(f"       | {detail}")
+        failures += bool(problems)
+
+    print("=" * 60)
+    print(f"{len(checks) - failures}/{len(checks)} queries use indexes without filesort")
+    db.close()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
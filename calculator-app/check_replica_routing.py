@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Read-replica routing check for RoutingSession and HistoryRepository.
+
+Points the application at a primary and two replica SQLite files in a
+temporary directory (``DATABASE_URL`` / ``DATABASE_REPLICA_URLS``), records
+which engine runs every SQL statement, and checks that:
+
+- reads wrapped in ``use_replica()`` (history list, version) hit a replica,
+- flushes inside a replica block and the INSERT and ``refresh`` of
+  ``create_history`` hit the primary only,
+- a session keeps one replica for all its reads, while new sessions
+  rotate through the replicas.
+
+Usage:
+    python check_replica_routing.py            # exit 1 on any failure
+"""
+
+from contextlib import contextmanager
+import os
+import sys
+import tempfile
+
+TEMP_DIR = tempfile.TemporaryDirectory()
+DATABASES = {name: os.path.join(TEMP_DIR.name, f"{name}.db") for name in ("primary", "replica1", "replica2")}
+# Settings are read on import, so the URLs must be set before importing app
+os.environ["DATABASE_URL"] = f"sqlite:///{DATABASES['primary']}"
+os.environ["DATABASE_REPLICA_URLS"] = ",".join(
+    f"sqlite:///{DATABASES[name]}" for name in ("replica1", "replica2")
+)
+os.environ.setdefault("DEBUG", "False")  # no SQL echo
+
+from sqlalchemy import event  # noqa: E402
+
+from app import database  # noqa: E402
+from app.database import Base, SessionLocal, init_db  # noqa: E402
+from app.models import calculation, history_version, user  # noqa: E402, F401
+from app.repositories.history_repository import HistoryRepository  # noqa: E402
+from app.schemas.history import HistoryFilter  # noqa: E402
+from app.services.history_service import HistoryService  # noqa: E402
+
+ENGINE_NAMES = {database.engine: "primary"}
+ENGINE_NAMES.update(zip(database.replica_engines, ("replica1", "replica2")))
+
+
+class StatementLog:
+    """(engine name, first SQL keyword) of every statement executed."""
+
+    def __init__(self):
+        self.statements = []
+        for engine, name in ENGINE_NAMES.items():
+            event.listen(engine, "before_cursor_execute", self._listener(name))
+
+    def _listener(self, name):
+        def record(conn, cursor, statement, parameters, context, executemany):
+            self.statements.append((name, statement.lstrip().split(None, 1)[0].upper()))
+        return record
+
+    @contextmanager
+    def capture(self):
+        """Collect the statements run inside the block."""
+        start = len(self.statements)
+        captured = []
+        yield captured
+        captured.extend(self.statements[start:])
+
+
+def report(ok: bool, message: str, statements=None) -> int:
+    print(f"{'✅' if ok else '❌'} {message}")
+    if not ok and statements is not None:
+        print(f"     statements: {statements}")
+    return 0 if ok else 1
+
+
+def engines_of(statements, keyword=None):
+    return {name for name, kind in statements if keyword is None or kind == keyword}
+
+
+def create_schema() -> None:
+    init_db()
+    for replica in database.replica_engines:
+        Base.metadata.create_all(bind=replica)
+
+    db = SessionLocal()
+    db.add(user.User(username="router", email="router@example.com", password_hash="x"))
+    db.commit()
+    db.close()
+
+
+def check_reads(log: StatementLog) -> int:
+    failures = 0
+    db = SessionLocal()
+    service = HistoryService(HistoryRepository(db))
+    with log.capture() as statements:
+        service.get_history_version(1)
+        service.get_user_history(1, HistoryFilter())
+    used = engines_of(statements)
+    failures += report(
+        len(used) == 1 and next(iter(used)).startswith("replica"),
+        f"history version and list read from one replica ({', '.join(sorted(used)) or 'none'})",
+        statements
+    )
+
+    with log.capture() as statements:
+        with db.use_replica():
+            db.add(calculation.CalculationHistory(
+                user_id=1, operation_type="addition", expression="1 + 1", result="2"
+            ))
+            db.flush()
+    db.rollback()
+    failures += report(
+        engines_of(statements, "INSERT") == {"primary"},
+        "flush inside use_replica() writes to the primary",
+        statements
+    )
+    db.close()
+    return failures
+
+
+def check_create_history(log: StatementLog) -> int:
+    db = SessionLocal()
+    with log.capture() as statements:
+        record = HistoryRepository(db).create_history(1, "addition", "2 + 2", "4")
+    db.close()
+    return report(
+        engines_of(statements) == {"primary"} and {"INSERT", "SELECT"} <= {kind for _, kind in statements}
+        and record.id is not None,
+        "create_history INSERT and refresh run on the primary only",
+        statements
+    )
+
+
+def check_rotation(log: StatementLog) -> int:
+    used = []
+    for _ in range(4):
+        db = SessionLocal()
+        with log.capture() as statements:
+            HistoryRepository(db).get_user_history(1, HistoryFilter())
+            HistoryRepository(db).get_user_history(1, HistoryFilter(limit=5))
+        db.close()
+        used.append(engines_of(statements))
+    pinned = all(len(names) == 1 for names in used)
+    rotated = {name for names in used for name in names} == {"replica1", "replica2"}
+    return report(
+        pinned and rotated,
+        f"each session pinned to one replica, sessions rotate ({[sorted(names) for names in used]})"
+    )
+
+
+def main() -> int:
+    print("=" * 60)
+    print("READ REPLICA ROUTING REPORT")
+    print("=" * 60)
+    create_schema()
+    log = StatementLog()
+    failures = check_reads(log)
+    failures += check_create_history(log)
+    failures += check_rotation(log)
+    print("=" * 60)
+
+    database.dispose_engines()
+    TEMP_DIR.cleanup()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Import-time report for the FastAPI application.
+
+Runs ``python -X importtime -c "import app.main"`` in a fresh interpreter and
+prints the total cold-start import time, the slowest modules, and whether any
+heavyweight optional dependencies were loaded eagerly.
+
+Usage:
+    python check_startup.py            # top 15 modules
+    python check_startup.py 30         # top 30 modules
+"""
+
+import subprocess
+import sys
+import time
+
+TARGET = "app.main"
+
+# Modules that should only be imported on first use
+LAZY_MODULES = ["jose", "passlib", "bcrypt", "reportlab", "uvicorn", "numpy"]
+
+
+def run_importtime(target):
+    """Import target in a subprocess and return (wall_seconds, parsed rows)."""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        capture_output=True,
+        text=True
+    )
+    wall = time.perf_counter() - start
+
+    if proc.returncode != 0:
+        print(proc.stderr)
+        sys.exit(proc.returncode)
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|", 2)
+        rows.append((name.rstrip(), int(self_us), int(cumulative_us)))
+    return wall, rows
+
+
+def main():
+    top_n = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+    wall, rows = run_importtime(TARGET)
+
+    total_us = sum(self_us for _, self_us, _ in rows)
+    loaded = {name.strip().split(".")[0] for name, _, _ in rows}
+
+    print("=" * 60)
+    print(f"IMPORT-TIME REPORT: {TARGET}")
+    print("=" * 60)
+    print(f"Interpreter wall time : {wall * 1000:.1f} ms")
+    print(f"Total import time     : {total_us / 1000:.1f} ms ({len(rows)} modules)")
+
+    print(f"\nTop {top_n} modules by cumulative time:")
+    for name, self_us, cumulative_us in sorted(rows, key=lambda r: r[2], reverse=True)[:top_n]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  (self {self_us / 1000:6.1f} ms)  {name.strip()}")
+
+    print("\nLazy dependencies:")
+    eager = [module for module in LAZY_MODULES if module in loaded]
+    for module in LAZY_MODULES:
+        marker = "❌ imported eagerly" if module in eager else "✅ deferred"
+        print(f"  - {module}: {marker}")
+
+    print("=" * 60)
+    return 1 if eager else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
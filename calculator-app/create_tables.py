@@ -1,4 +1,4 @@
-from app.database import engine, Base
+from app.database import engine, Base, init_db
 from app.models.user import User
 from app.models.calculation import CalculationHistory
 
@@ -6,7 +6,7 @@ print("Creating tables...")
 print(f"Engine: {engine}")
 print(f"Base metadata tables: {Base.metadata.tables.keys()}")
 
-Base.metadata.create_all(engine)
+init_db()
 
 print("✅ Tables created!")
 
@@ -24,13 +24,28 @@ CREATE TABLE IF NOT EXISTS calculation_history (
     operation_type VARCHAR(50) NOT NULL,
     expression TEXT NOT NULL,
     result VARCHAR(255) NOT NULL,
+    result_value DOUBLE NULL,
+    result_unit VARCHAR(50) NULL,
+    inputs JSON NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
     
-    INDEX idx_user_id (user_id),
+    INDEX idx_user_created (user_id, created_at),
+    INDEX idx_user_operation_created (user_id, operation_type, created_at),
     INDEX idx_operation_type (operation_type),
-    INDEX idx_created_at (created_at)
+    INDEX idx_created_at (created_at),
+    INDEX idx_user_result_value (user_id, result_value),
+    FULLTEXT INDEX ft_history_search (expression, result)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Per-user history version (bumped on every history write; used for ETags)
+CREATE TABLE IF NOT EXISTS history_versions (
+    user_id INT PRIMARY KEY,
+    version INT NOT NULL DEFAULT 1,
+    updated_at DATETIME NOT NULL,
+    
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- Insert sample data (optional)
@@ -39,15 +54,15 @@ INSERT INTO users (username, email, password_hash) VALUES
 ('jane_smith', 'jane@example.com', '$2b$12$EixZaYVK1fsbw1ZfbX3OXePaWxn96p36WQoeG6Lruj3vjPGga31lW'),
 ('test_user', 'test@example.com', '$2b$12$EixZaYVK1fsbw1ZfbX3OXePaWxn96p36WQoeG6Lruj3vjPGga31lW');
 
-INSERT INTO calculation_history (user_id, operation_type, expression, result) VALUES
-(1, 'addition', '10 + 5', '15'),
-(1, 'multiplication', '12 × 3', '36'),
-(1, 'division', '100 ÷ 4', '25'),
-(2, 'subtraction', '50 - 23', '27'),
-(2, 'square_root', '√144', '12'),
-(3, 'sin', 'sin(30°)', '0.5'),
-(3, 'conversion', '100 km = ? miles', '62.1371'),
-(1, 'finance', 'Loan: P=10000, R=5% p.a., T=5 years', '188.71');
+INSERT INTO calculation_history (user_id, operation_type, expression, result, result_value) VALUES
+(1, 'addition', '10 + 5', '15', 15),
+(1, 'multiplication', '12 × 3', '36', 36),
+(1, 'division', '100 ÷ 4', '25', 25),
+(2, 'subtraction', '50 - 23', '27', 27),
+(2, 'square_root', '√144', '12', 12),
+(3, 'sin', 'sin(30°)', '0.5', 0.5),
+(3, 'conversion', '100 km = ? miles', '62.1371', 62.1371),
+(1, 'finance', 'Loan: P=10000, R=5% p.a., T=5 years', '188.71', 188.71);
 
 -- Create views for reporting
 CREATE VIEW user_calculation_stats AS
@@ -238,7 +238,15 @@ class AuthManager {
     return errors;
   }
 
-  logout() {
+  async logout() {
+    // Send this user's queued calculations while the token is still valid;
+    // anything left stays queued under the user's ID for their next login
+    if (window.syncQueue) {
+      await Promise.race([
+        window.syncQueue.flush(),
+        new Promise((resolve) => setTimeout(resolve, 3000)),
+      ]);
+    }
     this.clearAuthData();
     window.location.href = "auth.html";
   }
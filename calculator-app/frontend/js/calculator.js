@@ -597,32 +597,16 @@ class Calculator {
     }
 
     try {
-      this.showLoading(true);
-
-      const response = await this.authManager.fetchWithAuth(
-        "/calculator/basic",
-        {
-          method: "POST",
-          body: JSON.stringify({
-            num1,
-            num2: operation.inputs === 2 ? num2 : 0,
-            operation: this.currentBasicOp,
-          }),
-        },
-      );
-
-      const data = await response.json();
-
-      if (!response.ok) {
-        throw new Error(data.detail || "Calculation failed");
-      }
+      const data = await this.evaluateAndQueue("basic", {
+        num1,
+        num2: operation.inputs === 2 ? num2 : 0,
+        operation: this.currentBasicOp,
+      });
 
       this.displayResult(data);
       this.authManager.showAlert("Calculation saved to history", "success");
     } catch (error) {
       this.authManager.showAlert(error.message, "error");
-    } finally {
-      this.showLoading(false);
     }
   }
 
@@ -640,32 +624,16 @@ class Calculator {
     }
 
     try {
-      this.showLoading(true);
-
-      const response = await this.authManager.fetchWithAuth(
-        "/calculator/advanced",
-        {
-          method: "POST",
-          body: JSON.stringify({
-            value,
-            operation: this.currentAdvancedOp,
-            angle_unit: this.angleUnit,
-          }),
-        },
-      );
-
-      const data = await response.json();
-
-      if (!response.ok) {
-        throw new Error(data.detail || "Calculation failed");
-      }
+      const data = await this.evaluateAndQueue("advanced", {
+        value,
+        operation: this.currentAdvancedOp,
+        angle_unit: this.angleUnit,
+      });
 
       this.displayResult(data);
       this.authManager.showAlert("Calculation saved to history", "success");
     } catch (error) {
       this.authManager.showAlert(error.message, "error");
-    } finally {
-      this.showLoading(false);
     }
   }
 
@@ -690,37 +658,21 @@ class Calculator {
     }
 
     try {
-      this.showLoading(true);
-
-      const response = await this.authManager.fetchWithAuth(
-        "/calculator/convert",
-        {
-          method: "POST",
-          body: JSON.stringify({
-            value,
-            from_unit: fromUnit,
-            to_unit: toUnit,
-            conversion_type: conversionType,
-          }),
-        },
-      );
-
-      const data = await response.json();
-
-      if (!response.ok) {
-        throw new Error(data.detail || "Conversion failed");
-      }
+      const data = await this.evaluateAndQueue("conversion", {
+        value,
+        from_unit: fromUnit,
+        to_unit: toUnit,
+        conversion_type: conversionType,
+      });
 
       this.displayResult({
-        result: data.converted_value,
-        expression: `${value} ${fromUnit} = ${data.converted_value}`,
+        result: data.history_result,
+        expression: `${value} ${fromUnit} = ${data.history_result}`,
       });
 
       this.authManager.showAlert("Conversion saved to history", "success");
     } catch (error) {
       this.authManager.showAlert(error.message, "error");
-    } finally {
-      this.showLoading(false);
     }
   }
 
@@ -749,36 +701,32 @@ class Calculator {
     }
 
     try {
-      this.showLoading(true);
-
-      const response = await this.authManager.fetchWithAuth(
-        "/calculator/finance",
-        {
-          method: "POST",
-          body: JSON.stringify({
-            principal,
-            rate,
-            time,
-            operation,
-          }),
-        },
-      );
-
-      const data = await response.json();
-
-      if (!response.ok) {
-        throw new Error(data.detail || "Financial calculation failed");
-      }
+      const data = await this.evaluateAndQueue("finance", {
+        principal,
+        rate,
+        time,
+        operation,
+      });
 
       this.displayResult(data);
       this.authManager.showAlert("Calculation saved to history", "success");
     } catch (error) {
       this.authManager.showAlert(error.message, "error");
-    } finally {
-      this.showLoading(false);
     }
   }
 
+  /**
+   * Evaluate locally (same rules as the server) and queue the inputs for
+   * the history; the sync queue sends them in batches.
+   */
+  async evaluateAndQueue(kind, inputs) {
+    const data = CalcEngine.evaluate(kind, inputs);
+    if (window.syncQueue) {
+      await window.syncQueue.enqueue(kind, inputs);
+    }
+    return data;
+  }
+
   displayResult(data) {
     const resultContainer = document.getElementById("resultContainer");
     const resultExpression = document.getElementById("resultExpression");
@@ -786,7 +734,7 @@ class Calculator {
 
     if (resultContainer && resultExpression && resultValue) {
       resultExpression.textContent = data.expression || "Result";
-      resultValue.textContent = data.result || data.converted_value || "N/A";
+      resultValue.textContent = data.result ?? data.converted_value ?? "N/A";
       resultContainer.style.display = "block";
     }
   }
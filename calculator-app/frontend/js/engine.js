@@ -0,0 +1,380 @@
+/**
+ * Client-side evaluation engine for MathHub Calculator
+ * Mirrors app/services/calculator_service.py so results show instantly and
+ * work offline. Results, expressions and history text must match the
+ * server; check_engine_conformance.py runs both against the shared vectors
+ * in js/engine-vectors.json.
+ */
+
+class CalcError extends Error {
+  constructor(message) {
+    super(message);
+    this.name = "CalcError";
+  }
+}
+
+// ===== Python float formatting =====
+
+// Exact value of a double as sign, integer mantissa and power of two
+function decomposeFloat(x) {
+  const view = new DataView(new ArrayBuffer(8));
+  view.setFloat64(0, x);
+  const hi = view.getUint32(0);
+  const lo = view.getUint32(4);
+  const biased = (hi >>> 20) & 0x7ff;
+  let mantissa = (BigInt(hi & 0xfffff) << 32n) | BigInt(lo);
+  let exponent = -1074;
+  if (biased !== 0) {
+    mantissa |= 1n << 52n;
+    exponent = biased - 1075;
+  }
+  return { negative: hi >>> 31 === 1, mantissa, exponent };
+}
+
+// str(x) / f"{x}" for a Python float (shortest repr)
+function pyRepr(x) {
+  if (Number.isNaN(x)) return "nan";
+  if (!Number.isFinite(x)) return x > 0 ? "inf" : "-inf";
+  if (x === 0) return Object.is(x, -0) ? "-0.0" : "0.0";
+
+  const sign = x < 0 ? "-" : "";
+  const [mantissa, exponentText] = Math.abs(x).toExponential().split("e");
+  const digits = mantissa.replace(".", "");
+  const exponent = parseInt(exponentText, 10);
+
+  if (exponent < -4 || exponent >= 16) {
+    const rest = digits.length > 1 ? "." + digits.slice(1) : "";
+    const exponentSign = exponent < 0 ? "-" : "+";
+    return `${sign}${digits[0]}${rest}e${exponentSign}${String(Math.abs(exponent)).padStart(2, "0")}`;
+  }
+  if (exponent < 0) {
+    return `${sign}0.${"0".repeat(-exponent - 1)}${digits}`;
+  }
+  if (digits.length <= exponent + 1) {
+    return `${sign}${digits}${"0".repeat(exponent + 1 - digits.length)}.0`;
+  }
+  return `${sign}${digits.slice(0, exponent + 1)}.${digits.slice(exponent + 1)}`;
+}
+
+// f"{x:.{places}f}": exact value rounded half to even (toFixed rounds ties up)
+function pyFixed(x, places) {
+  if (Number.isNaN(x)) return "nan";
+  if (!Number.isFinite(x)) return x > 0 ? "inf" : "-inf";
+
+  const { negative, mantissa, exponent } = decomposeFloat(x);
+  const scale = 10n ** BigInt(places);
+  let scaled;
+  if (exponent >= 0) {
+    scaled = (mantissa << BigInt(exponent)) * scale;
+  } else {
+    const numerator = mantissa * scale;
+    const denominator = 1n << BigInt(-exponent);
+    scaled = numerator / denominator;
+    const twice = (numerator % denominator) * 2n;
+    if (twice > denominator || (twice === denominator && scaled % 2n === 1n)) {
+      scaled += 1n;
+    }
+  }
+
+  let text = scaled.toString().padStart(places + 1, "0");
+  if (places > 0) {
+    text = `${text.slice(0, -places)}.${text.slice(-places)}`;
+  }
+  return (negative ? "-" : "") + text;
+}
+
+// round(x, places) for a Python float
+function pyRound(x, places) {
+  if (!Number.isFinite(x)) {
+    throw new CalcError("cannot convert float infinity to integer");
+  }
+  return Number(pyFixed(x, places));
+}
+
+// ===== Input validation (pydantic schemas) =====
+
+function toFloat(value, field) {
+  if (typeof value === "number") return value;
+  if (typeof value === "string" && value.trim() !== "" && !isNaN(Number(value))) {
+    return Number(value);
+  }
+  throw new CalcError(`Invalid inputs: ${field} must be a number`);
+}
+
+function checkResult(result, ...inputs) {
+  // Python raises (domain/overflow) where JavaScript returns NaN/Infinity
+  if (Number.isNaN(result) || (!Number.isFinite(result) && inputs.every(Number.isFinite))) {
+    throw new CalcError("math domain error");
+  }
+  return result;
+}
+
+// ===== Operations =====
+
+const CONVERSION_FACTORS = {
+  length: {
+    meter: 1,
+    kilometer: 1000,
+    centimeter: 0.01,
+    millimeter: 0.001,
+    mile: 1609.34,
+    yard: 0.9144,
+    foot: 0.3048,
+    inch: 0.0254,
+  },
+  weight: {
+    kilogram: 1,
+    gram: 0.001,
+    pound: 0.453592,
+    ounce: 0.0283495,
+    ton: 1000,
+  },
+};
+const TEMPERATURE_UNITS = ["celsius", "fahrenheit", "kelvin"];
+const DEGREES_TO_RADIANS = Math.PI / 180;
+
+function calculateBasic(inputs) {
+  const num1 = toFloat(inputs.num1, "num1");
+  if (inputs.num2 === undefined || inputs.num2 === null) {
+    throw new CalcError("Second number is required");
+  }
+  const num2 = toFloat(inputs.num2, "num2");
+  const a = pyRepr(num1);
+  const b = pyRepr(num2);
+  let result;
+  let expression;
+
+  switch (inputs.operation) {
+    case "addition":
+      result = num1 + num2;
+      expression = `${a} + ${b}`;
+      break;
+    case "subtraction":
+      result = num1 - num2;
+      expression = `${a} - ${b}`;
+      break;
+    case "multiplication":
+      result = num1 * num2;
+      expression = `${a} × ${b}`;
+      break;
+    case "division":
+      if (num2 === 0) throw new CalcError("Division by zero");
+      result = num1 / num2;
+      expression = `${a} ÷ ${b}`;
+      break;
+    case "power":
+      if (num1 === 0 && num2 < 0) {
+        throw new CalcError("0.0 cannot be raised to a negative power");
+      }
+      // A negative base with a fractional exponent is complex in Python
+      result = checkResult(Math.pow(num1, num2), num1, num2);
+      expression = `${a}^${b}`;
+      break;
+    case "percentage":
+      result = (num1 * num2) / 100;
+      expression = `${a}% of ${b}`;
+      break;
+    default:
+      throw new CalcError(`Unsupported basic operation: ${inputs.operation}`);
+  }
+
+  return { result, expression, operation_type: inputs.operation };
+}
+
+function calculateAdvanced(inputs) {
+  const original = toFloat(inputs.value, "value");
+  const angleUnit = inputs.angle_unit === undefined ? "radians" : inputs.angle_unit;
+  if (angleUnit !== "radians" && angleUnit !== "degrees") {
+    throw new CalcError('Angle unit must be either "radians" or "degrees"');
+  }
+  const mode = inputs.mode === undefined ? "direct" : inputs.mode;
+  if (mode !== "direct" && mode !== "table") {
+    throw new CalcError('Mode must be either "direct" or "table"');
+  }
+  if (mode === "table") {
+    // The precomputed tables live on the server (app/services/function_tables.py)
+    throw new CalcError("Table mode is only evaluated by the server");
+  }
+
+  const isTrig = ["sin", "cos", "tan"].includes(inputs.operation);
+  let value = original;
+  let angleSuffix = "";
+  if (isTrig) {
+    if (angleUnit === "degrees") {
+      value = original * DEGREES_TO_RADIANS;
+      angleSuffix = "°";
+    } else {
+      angleSuffix = " rad";
+    }
+  }
+
+  let result;
+  let expression;
+  switch (inputs.operation) {
+    case "square_root":
+      if (value < 0) throw new CalcError("Square root of negative number");
+      result = Math.sqrt(value);
+      expression = `√${pyRepr(value)}`;
+      break;
+    case "sin":
+      result = checkResult(Math.sin(value), value);
+      expression = `sin(${pyRepr(original)}${angleSuffix})`;
+      break;
+    case "cos":
+      result = checkResult(Math.cos(value), value);
+      expression = `cos(${pyRepr(original)}${angleSuffix})`;
+      break;
+    case "tan":
+      result = checkResult(Math.tan(value), value);
+      expression = `tan(${pyRepr(original)}${angleSuffix})`;
+      break;
+    case "log":
+      result = checkResult(Math.log10(value), value);
+      expression = `log₁₀(${pyRepr(value)})`;
+      break;
+    case "ln":
+      result = checkResult(Math.log(value), value);
+      expression = `ln(${pyRepr(value)})`;
+      break;
+    default:
+      throw new CalcError(`Unsupported advanced operation: ${inputs.operation}`);
+  }
+
+  return { result, expression, operation_type: inputs.operation };
+}
+
+function convertTemperature(value, fromUnit, toUnit) {
+  let celsius;
+  if (fromUnit === "celsius") celsius = value;
+  else if (fromUnit === "fahrenheit") celsius = ((value - 32) * 5) / 9;
+  else if (fromUnit === "kelvin") celsius = value - 273.15;
+  else throw new CalcError(`Invalid temperature unit: ${fromUnit}`);
+
+  if (toUnit === "celsius") return celsius;
+  if (toUnit === "fahrenheit") return (celsius * 9) / 5 + 32;
+  if (toUnit === "kelvin") return celsius + 273.15;
+  throw new CalcError(`Invalid temperature unit: ${toUnit}`);
+}
+
+function convertUnits(inputs) {
+  const value = toFloat(inputs.value, "value");
+  const { from_unit: fromUnit, to_unit: toUnit, conversion_type: type } = inputs;
+  const original = pyRepr(value);
+  let result;
+  let expression;
+
+  if (type === "temperature") {
+    result = convertTemperature(value, fromUnit, toUnit);
+    expression = `${original} ${fromUnit} → ${toUnit}`;
+  } else {
+    const factors = CONVERSION_FACTORS[type];
+    if (!factors) throw new CalcError(`Unsupported conversion type: ${type}`);
+    if (!(fromUnit in factors) || !(toUnit in factors)) {
+      throw new CalcError(`Invalid units for ${type} conversion`);
+    }
+    result = (value * factors[fromUnit]) / factors[toUnit];
+    expression = `${original} ${fromUnit} = ? ${toUnit}`;
+  }
+
+  return { result, expression, operation_type: "conversion" };
+}
+
+function calculateFinance(inputs) {
+  const principal = toFloat(inputs.principal, "principal");
+  const ratePercent = toFloat(inputs.rate, "rate");
+  const time = toFloat(inputs.time, "time");
+  if (!(principal > 0)) throw new CalcError("Invalid inputs: principal must be greater than 0");
+  if (!(ratePercent >= 0)) throw new CalcError("Invalid inputs: rate must be at least 0");
+  if (!(time > 0)) throw new CalcError("Invalid inputs: time must be greater than 0");
+
+  const rate = ratePercent / 100;
+  const p = pyRepr(principal);
+  const r = pyRepr(ratePercent);
+  const t = pyRepr(time);
+  let result;
+  let expression;
+
+  switch (inputs.operation) {
+    case "simple_interest":
+      result = principal * rate * time;
+      expression = `SI: P=${p}, R=${r}%, T=${t}`;
+      break;
+    case "compound_interest":
+      result = principal * (checkResult(Math.pow(1 + rate, time), rate, time) - 1);
+      expression = `CI: P=${p}, R=${r}%, T=${t}`;
+      break;
+    case "loan_payment": {
+      const monthlyRate = rate / 12;
+      const payments = time * 12;
+      if (monthlyRate === 0) {
+        result = principal / payments;
+      } else {
+        const growth = checkResult(Math.pow(1 + monthlyRate, payments), monthlyRate, payments);
+        if (growth - 1 === 0) throw new CalcError("float division by zero");
+        result = (principal * (monthlyRate * growth)) / (growth - 1);
+      }
+      expression = `Loan: P=${p}, R=${r}% p.a., T=${t} years`;
+      break;
+    }
+    default:
+      throw new CalcError(`Unsupported financial operation: ${inputs.operation}`);
+  }
+
+  return { result: pyRound(result, 2), expression, operation_type: "finance" };
+}
+
+const CalcEngine = {
+  CONVERSION_FACTORS,
+  TEMPERATURE_UNITS,
+
+  /**
+   * Evaluate an operation exactly as the calculator endpoint would.
+   * @param {string} kind - "basic", "advanced", "conversion" or "finance"
+   * @param {object} inputs - Request body of that endpoint
+   * @returns {{result: number, expression: string, operation_type: string,
+   *            history_result: string}} Result and its history text
+   * @throws {CalcError} If the server would reject the operation
+   */
+  evaluate(kind, inputs) {
+    let calculation;
+    let historyResult;
+    if (kind === "basic") {
+      calculation = calculateBasic(inputs);
+      historyResult = pyRepr(calculation.result);
+    } else if (kind === "advanced") {
+      calculation = calculateAdvanced(inputs);
+      historyResult = pyRepr(calculation.result);
+    } else if (kind === "conversion") {
+      calculation = convertUnits(inputs);
+      historyResult = `${pyFixed(calculation.result, 4)} ${inputs.to_unit}`;
+    } else if (kind === "finance") {
+      calculation = calculateFinance(inputs);
+      historyResult = pyFixed(calculation.result, 2);
+    } else {
+      throw new CalcError(`Unknown calculation kind: ${kind}`);
+    }
+    return { ...calculation, history_result: historyResult };
+  },
+
+  /** Whether the server supports converting between these units. */
+  supportsConversion(type, fromUnit, toUnit) {
+    if (type === "temperature") {
+      return TEMPERATURE_UNITS.includes(fromUnit) && TEMPERATURE_UNITS.includes(toUnit);
+    }
+    const factors = CONVERSION_FACTORS[type];
+    return Boolean(factors && fromUnit in factors && toUnit in factors);
+  },
+
+  pyRepr,
+  pyFixed,
+  pyRound,
+};
+
+// Export to global scope (and to Node for the conformance check)
+if (typeof window !== "undefined") {
+  window.CalcEngine = CalcEngine;
+  window.CalcError = CalcError;
+}
+if (typeof module !== "undefined" && module.exports) {
+  module.exports = { CalcEngine, CalcError };
+}
@@ -12,6 +12,8 @@ class HistoryManager {
             end_date: '',
             limit: 50
         };
+        // url -> { etag, data } for conditional GETs (server answers 304 if unchanged)
+        this.etagCache = new Map();
         this.init();
     }
 
@@ -75,10 +77,9 @@ class HistoryManager {
             }
             queryParams.append('limit', this.currentFilters.limit);
             
-            const response = await this.authManager.fetchWithAuth(`/history/?${queryParams.toString()}`);
-            const history = await response.json();
+            const { ok, data: history } = await this.fetchWithETag(`/history/?${queryParams.toString()}`);
 
-            if (!response.ok) {
+            if (!ok) {
                 throw new Error('Failed to load history');
             }
 
@@ -93,10 +94,9 @@ class HistoryManager {
 
     async loadStats() {
         try {
-            const response = await this.authManager.fetchWithAuth('/history/stats');
-            const stats = await response.json();
+            const { ok, data: stats } = await this.fetchWithETag('/history/stats');
 
-            if (!response.ok) {
+            if (!ok) {
                 throw new Error('Failed to load statistics');
             }
 
@@ -107,6 +107,27 @@ class HistoryManager {
         }
     }
 
+    async fetchWithETag(url) {
+        // Revalidate with the last ETag; reuse the cached body on 304
+        const cached = this.etagCache.get(url);
+        const response = await this.authManager.fetchWithAuth(url, {
+            cache: 'no-store',
+            headers: cached ? { 'If-None-Match': cached.etag } : {}
+        });
+
+        if (response.status === 304 && cached) {
+            return { ok: true, data: cached.data };
+        }
+
+        const data = await response.json();
+        const etag = response.headers.get('ETag');
+        if (response.ok && etag) {
+            this.etagCache.set(url, { etag, data });
+        }
+
+        return { ok: response.ok, data };
+    }
+
     displayHistory(history) {
         const historyList = document.getElementById('historyList');
         if (!historyList) return;
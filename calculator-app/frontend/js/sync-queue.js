@@ -0,0 +1,220 @@
+/**
+ * History sync queue for MathHub Calculator
+ * Calculations evaluated in the browser are queued in IndexedDB and sent to
+ * POST /api/history/bulk in batches, so the page works offline and the
+ * server sees periodic batched writes instead of one request per result.
+ *
+ * The browser may be shared, so every item records the user who queued it
+ * and only the signed-in user's items are sent, with that user's token.
+ */
+
+const SYNC_DB_NAME = "mathhub";
+const SYNC_STORE = "pendingCalculations";
+
+class SyncQueue {
+  constructor(authManager, { batchSize = 100, interval = 15000 } = {}) {
+    this.authManager = authManager;
+    this.batchSize = batchSize;
+    this.interval = interval;
+    this.flushing = false;
+    this.retryAt = 0;
+    this.memoryQueue = []; // Used when IndexedDB is unavailable
+    this.memoryId = 0;
+    this.dbPromise = this.openDatabase();
+  }
+
+  openDatabase() {
+    if (!window.indexedDB) return Promise.resolve(null);
+
+    return new Promise((resolve) => {
+      const request = indexedDB.open(SYNC_DB_NAME, 2);
+      request.onupgradeneeded = (event) => {
+        let store;
+        if (event.oldVersion < 1) {
+          store = request.result.createObjectStore(SYNC_STORE, {
+            keyPath: "id",
+            autoIncrement: true,
+          });
+        } else {
+          // Items queued before owners were recorded cannot be attributed
+          store = request.transaction.objectStore(SYNC_STORE);
+          store.clear();
+        }
+        store.createIndex("user_id", "user_id");
+      };
+      request.onsuccess = () => resolve(request.result);
+      request.onerror = () => {
+        console.warn("IndexedDB unavailable, queue kept in memory:", request.error);
+        resolve(null);
+      };
+    });
+  }
+
+  async transaction(mode, callback) {
+    const db = await this.dbPromise;
+    return new Promise((resolve, reject) => {
+      const tx = db.transaction(SYNC_STORE, mode);
+      const result = callback(tx.objectStore(SYNC_STORE));
+      tx.oncomplete = () => resolve(result && "result" in result ? result.result : result);
+      tx.onerror = () => reject(tx.error);
+    });
+  }
+
+  /** ID of the signed-in user, or null. */
+  currentUserId() {
+    const user = this.authManager.getUser();
+    return user && user.id != null ? user.id : null;
+  }
+
+  /** Queued items of one user. */
+  async userItems(userId) {
+    if (!(await this.dbPromise)) {
+      return this.memoryQueue.filter((item) => item.user_id === userId);
+    }
+    return this.transaction("readonly", (store) =>
+      store.index("user_id").getAll(userId)
+    );
+  }
+
+  start() {
+    this.timer = setInterval(() => this.flush(), this.interval);
+    window.addEventListener("online", () => this.flush());
+    document.addEventListener("visibilitychange", () => {
+      if (document.visibilityState === "hidden") this.flush();
+    });
+    this.flush();
+  }
+
+  /**
+   * Queue a calculation for the history.
+   * @param {string} kind - "basic", "advanced", "conversion" or "finance"
+   * @param {object} inputs - Request body of the calculator endpoint
+   */
+  async enqueue(kind, inputs) {
+    const userId = this.currentUserId();
+    if (userId === null) return;
+
+    const item = {
+      user_id: userId,
+      kind,
+      inputs,
+      created_at: new Date().toISOString(),
+      batch: null,
+    };
+
+    if (await this.dbPromise) {
+      await this.transaction("readwrite", (store) => store.add(item));
+    } else {
+      this.memoryQueue.push({ ...item, id: ++this.memoryId });
+    }
+
+    if ((await this.size(userId)) >= this.batchSize) this.flush();
+  }
+
+  async size(userId) {
+    if (!(await this.dbPromise)) {
+      return this.memoryQueue.filter((item) => item.user_id === userId).length;
+    }
+    return this.transaction("readonly", (store) =>
+      store.index("user_id").count(userId)
+    );
+  }
+
+  /**
+   * Next batch to send. A batch keeps its key until the server accepts it,
+   * so a retry after a lost response is replayed instead of stored twice.
+   */
+  async nextBatch(userId) {
+    const items = await this.userItems(userId);
+
+    const pending = items.filter((item) => item.batch !== null);
+    if (pending.length > 0) {
+      return { key: pending[0].batch, items: pending };
+    }
+
+    const batch = items.slice(0, this.batchSize);
+    if (batch.length === 0) return null;
+
+    const key = crypto.randomUUID
+      ? crypto.randomUUID()
+      : `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+    batch.forEach((item) => {
+      item.batch = key;
+    });
+    if (await this.dbPromise) {
+      await this.transaction("readwrite", (store) => {
+        batch.forEach((item) => store.put(item));
+      });
+    }
+    return { key, items: batch };
+  }
+
+  async remove(items) {
+    const ids = new Set(items.map((item) => item.id));
+    if (await this.dbPromise) {
+      await this.transaction("readwrite", (store) => {
+        ids.forEach((id) => store.delete(id));
+      });
+    } else {
+      this.memoryQueue = this.memoryQueue.filter((item) => !ids.has(item.id));
+    }
+  }
+
+  /**
+   * Send the signed-in user's queued calculations until they are all sent
+   * or sending fails. Other users' items stay queued for their next login.
+   */
+  async flush() {
+    if (this.flushing || !navigator.onLine || Date.now() < this.retryAt) return;
+    const userId = this.currentUserId();
+    if (!this.authManager.getToken() || userId === null) return;
+    // Taken once, so a login in another tab cannot mix users mid-flush
+    const headers = this.authManager.getAuthHeaders();
+
+    this.flushing = true;
+    try {
+      let batch;
+      while ((batch = await this.nextBatch(userId))) {
+        const response = await fetch(`${this.authManager.baseUrl}/history/bulk`, {
+          method: "POST",
+          headers: {
+            ...headers,
+            "Idempotency-Key": batch.key,
+          },
+          body: JSON.stringify({
+            items: batch.items.map(({ kind, inputs, created_at }) => ({
+              kind,
+              inputs,
+              created_at,
+            })),
+          }),
+        });
+
+        if (response.ok) {
+          const data = await response.json();
+          if (data.failed) console.warn("Some calculations were rejected:", data.errors);
+          await this.remove(batch.items);
+          console.log(`✓ Synced ${data.created} calculations`);
+        } else if (response.status === 422) {
+          // The batch itself is malformed; retrying cannot help
+          console.error("Dropping invalid sync batch:", await response.text());
+          await this.remove(batch.items);
+        } else {
+          // Unauthorized, rate limited or server error: retry later
+          const retryAfter = parseInt(response.headers.get("Retry-After"), 10);
+          this.retryAt = Date.now() + (retryAfter > 0 ? retryAfter * 1000 : this.interval);
+          console.warn("History sync postponed:", response.status);
+          break;
+        }
+      }
+    } catch (error) {
+      // Offline or server unreachable; the batch stays queued
+      console.warn("History sync failed, will retry:", error.message);
+    } finally {
+      this.flushing = false;
+    }
+  }
+}
+
+// Export to global scope for easy access
+window.SyncQueue = SyncQueue;
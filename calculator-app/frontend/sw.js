@@ -0,0 +1,62 @@
+/**
+ * Service worker for MathHub Calculator
+ * Caches the static app shell so the calculator opens and works offline.
+ * API requests (another origin) are never intercepted; calculations made
+ * offline wait in the IndexedDB sync queue.
+ */
+
+const CACHE_NAME = "mathhub-shell-v1";
+const APP_SHELL = [
+  "index.html",
+  "calc.html",
+  "history.html",
+  "auth.html",
+  "css/style.css",
+  "js/auth.js",
+  "js/engine.js",
+  "js/sync-queue.js",
+  "js/calculator.js",
+  "js/history.js",
+];
+
+self.addEventListener("install", (event) => {
+  event.waitUntil(
+    caches.open(CACHE_NAME).then((cache) => cache.addAll(APP_SHELL)),
+  );
+  self.skipWaiting();
+});
+
+self.addEventListener("activate", (event) => {
+  event.waitUntil(
+    caches
+      .keys()
+      .then((keys) =>
+        Promise.all(
+          keys.filter((key) => key !== CACHE_NAME).map((key) => caches.delete(key)),
+        ),
+      ),
+  );
+  self.clients.claim();
+});
+
+// Network first so updates show up at once; the cache is the offline fallback
+self.addEventListener("fetch", (event) => {
+  const url = new URL(event.request.url);
+  if (event.request.method !== "GET" || url.origin !== self.location.origin) return;
+
+  event.respondWith(
+    fetch(event.request)
+      .then((response) => {
+        if (response.ok) {
+          const copy = response.clone();
+          caches.open(CACHE_NAME).then((cache) => cache.put(event.request, copy));
+        }
+        return response;
+      })
+      .catch(() =>
+        caches
+          .match(event.request, { ignoreSearch: true })
+          .then((cached) => cached || caches.match("index.html")),
+      ),
+  );
+});
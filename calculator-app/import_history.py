@@ -0,0 +1,70 @@
+"""
+Bulk import calculation history from a CSV or NDJSON file.
+
+Usage:
+    python import_history.py --user alice history.csv
+    python import_history.py --user alice history.ndjson --resume-from 120000
+"""
+
+import argparse
+import sys
+
+from app.config import settings
+from app.database import SessionLocal, init_db
+from app.repositories.history_repository import HistoryRepository
+from app.repositories.user_repository import UserRepository
+from app.services.history_import import detect_format, iter_source_rows
+from app.services.history_service import HistoryService
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Bulk import calculation history")
+    parser.add_argument("path", help="CSV or NDJSON file")
+    parser.add_argument("--user", required=True, help="Username that will own the records")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="Detected from the file name by default")
+    parser.add_argument("--resume-from", type=int, default=0, metavar="LINE",
+                        help="Skip source lines up to and including LINE")
+    parser.add_argument("--chunk-size", type=int, default=settings.IMPORT_CHUNK_SIZE,
+                        help="Rows committed per transaction")
+    args = parser.parse_args()
+    
+    try:
+        source_format = args.format or detect_format(args.path)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 2
+    
+    init_db()
+    db = SessionLocal()
+    try:
+        user = UserRepository(db).get_user_by_username(args.user)
+        if not user:
+            print(f"❌ User not found: {args.user}")
+            return 2
+        
+        history_service = HistoryService(HistoryRepository(db))
+        with open(args.path, encoding="utf-8-sig", newline="") as stream:
+            summary = history_service.import_history(
+                user.id,
+                iter_source_rows(stream, source_format),
+                resume_from_line=args.resume_from,
+                chunk_size=args.chunk_size
+            )
+    finally:
+        db.close()
+    
+    print(f"Imported: {summary['imported']}")
+    print(f"Failed:   {summary['failed']}")
+    for error in summary["errors"]:
+        print(f"  line {error['line']}: {error['error']}")
+    
+    if not summary["completed"]:
+        print(f"⚠️  Import stopped. Resume with --resume-from {summary['last_committed_line']}")
+        return 1
+    
+    print("✅ Import complete")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""
+Maintain monthly partitions and retention of calculation history.
+
+Usage:
+    python manage_partitions.py status
+    python manage_partitions.py init        # MySQL: partition the table (rebuilds it)
+    python manage_partitions.py maintain    # create future partitions + apply retention
+
+Run ``maintain`` daily (e.g. from cron). Retention is controlled by
+HISTORY_RETENTION_MONTHS, future partitions by HISTORY_PARTITION_MONTHS_AHEAD.
+"""
+
+import argparse
+import sys
+
+from app.config import settings
+from app.database import SessionLocal, engine, init_db
+from app.models import calculation, history_version, user  # noqa: F401
+from app.partitioning import (
+    apply_retention, ensure_future_partitions, list_partitions, partition_table
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Manage calculation history partitions")
+    parser.add_argument("command", choices=["status", "init", "maintain"])
+    parser.add_argument("--months-ahead", type=int, default=settings.HISTORY_PARTITION_MONTHS_AHEAD,
+                        help="Future months to keep partitions for")
+    parser.add_argument("--retention-months", type=int, default=settings.HISTORY_RETENTION_MONTHS,
+                        help="Months of history to keep (0 = keep forever)")
+    args = parser.parse_args()
+    
+    if args.command == "status":
+        partitions = list_partitions(engine)
+        print(f"Database: {engine.dialect.name}")
+        if partitions:
+            print(f"Partitions ({len(partitions)}): {', '.join(partitions)}")
+        else:
+            print("calculation_history is not partitioned")
+        return 0
+    
+    if args.command == "init":
+        if not settings.HISTORY_PARTITIONING:
+            print("❌ Set HISTORY_PARTITIONING=True first (history search then uses LIKE instead of FULLTEXT)")
+            return 2
+        try:
+            init_db()
+            partition_table(engine, months_ahead=args.months_ahead)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return 2
+        print(f"✅ Partitions: {', '.join(list_partitions(engine))}")
+        return 0
+    
+    created = ensure_future_partitions(engine, months_ahead=args.months_ahead)
+    print(f"Created partitions: {', '.join(created) or 'none'}")
+    
+    db = SessionLocal()
+    try:
+        removed = apply_retention(engine, db, args.retention_months)
+    finally:
+        db.close()
+    
+    if list_partitions(engine):
+        print(f"Dropped partitions: {removed}")
+    else:
+        print(f"Deleted history records: {removed}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
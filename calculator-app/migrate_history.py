@@ -0,0 +1,33 @@
+"""
+Add the typed history columns and backfill them for existing records.
+
+Usage:
+    python migrate_history.py [--batch-size 1000]
+"""
+
+import argparse
+
+from app.database import SessionLocal, init_db
+from app.migrations import backfill_history_values
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate calculation history to typed columns")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows updated per transaction")
+    args = parser.parse_args()
+    
+    print("Upgrading schema...")
+    init_db()
+    
+    print("Backfilling result_value / result_unit...")
+    db = SessionLocal()
+    try:
+        updated = backfill_history_values(db, batch_size=args.batch_size)
+    finally:
+        db.close()
+    
+    print(f"✅ Backfilled {updated} history records")
+
+
+if __name__ == "__main__":
+    main()
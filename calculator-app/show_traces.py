@@ -0,0 +1,86 @@
+"""
+Show traces written by the file trace exporter as span trees.
+
+Usage:
+    python show_traces.py                  # last 10 traces from TRACE_FILE
+    python show_traces.py --last 50
+    python show_traces.py --trace-id <id>  # one trace (e.g. from a traceparent header)
+    python show_traces.py --slowest 5      # slowest traces in the file
+
+Enable tracing with TRACING_ENABLED=True (and TRACE_EXPORTER=file).
+"""
+
+from collections import defaultdict
+import argparse
+import json
+import sys
+
+from app.config import settings
+
+
+def load_traces(path: str):
+    with open(path, encoding="utf-8") as trace_file:
+        return [json.loads(line) for line in trace_file if line.strip()]
+
+
+def root_duration(trace: dict) -> float:
+    return max(span["duration_ms"] for span in trace["spans"])
+
+
+def print_trace(trace: dict) -> None:
+    spans = trace["spans"]
+    span_ids = {span["span_id"] for span in spans}
+    children = defaultdict(list)
+    for span in spans:
+        parent = span["parent_span_id"] if span["parent_span_id"] in span_ids else None
+        children[parent].append(span)
+
+    roots = children[None]
+    trace_start = min(span["start_time_unix_nano"] for span in spans)
+    print(f"trace {trace['trace_id']}  ({root_duration(trace):.2f} ms, {len(spans)} spans)")
+
+    def show(span, depth):
+        offset = (span["start_time_unix_nano"] - trace_start) / 1e6
+        marker = " ❌" if span["status"] == "error" else ""
+        detail = span["attributes"].get("db.statement") or span["attributes"].get("http.status_code", "")
+        detail = " ".join(str(detail).split())[:80]
+        print(f"  {offset:8.2f} ms  {span['duration_ms']:8.2f} ms  {'  ' * depth}{span['name']}{marker}  {detail}")
+        for child in sorted(children[span["span_id"]], key=lambda s: s["start_time_unix_nano"]):
+            show(child, depth + 1)
+
+    for root in roots:
+        show(root, 0)
+    print()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Show recorded request traces")
+    parser.add_argument("--file", default=settings.TRACE_FILE, help="Trace file (JSON lines)")
+    parser.add_argument("--last", type=int, default=10, help="Number of recent traces to show")
+    parser.add_argument("--trace-id", help="Show only this trace")
+    parser.add_argument("--slowest", type=int, help="Show the N slowest traces")
+    args = parser.parse_args()
+
+    try:
+        traces = load_traces(args.file)
+    except FileNotFoundError:
+        print(f"❌ {args.file} not found; run the API with TRACING_ENABLED=True first")
+        return 1
+
+    if args.trace_id:
+        traces = [trace for trace in traces if trace["trace_id"] == args.trace_id]
+        if not traces:
+            print(f"❌ Trace {args.trace_id} not found")
+            return 1
+    elif args.slowest:
+        traces = sorted(traces, key=root_duration, reverse=True)[:args.slowest]
+    else:
+        traces = traces[-args.last:]
+
+    for trace in traces:
+        print_trace(trace)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())